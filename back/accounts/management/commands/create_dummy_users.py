@@ -3,6 +3,7 @@ from django.core.management.base import BaseCommand
 from django.contrib.auth.hashers import make_password
 from accounts.models import User
 from deposits.models import DepositProduct, SavingProduct, DepositSubscription, SavingSubscription
+from deposits.subscriptions import SUBSCRIPTION_MODELS, reconcile_subscriber_counts
 
 class Command(BaseCommand):
     help = '1,000명의 더미 사용자 데이터를 생성합니다'
@@ -134,6 +135,10 @@ class Command(BaseCommand):
 
             self.stdout.write(f'배치 {batch + 1}/10 완료: {len(created_users)}명 생성')
 
+        # 가입 내역을 직접 만들고 지웠으므로 상품별 가입자 수를 다시 맞춤
+        for product_type in SUBSCRIPTION_MODELS:
+            reconcile_subscriber_counts(product_type)
+
         self.stdout.write(
             self.style.SUCCESS(f'총 {users_created}명의 더미 사용자가 생성되었습니다.')
         )
\ No newline at end of file
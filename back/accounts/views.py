@@ -9,7 +9,7 @@ from django.db.models import Count
 import pandas as pd
 import numpy as np
 from deposits.models import DepositProduct, SavingProduct, DepositSubscription, SavingSubscription
-import json
+from deposits.serializers import DepositOptionSerializer, SavingOptionSerializer
 
 # 기존 함수들을 모두 유지하고 누락된 함수들만 추가
 
@@ -386,19 +386,10 @@ def get_product_recommendations(request):
         if top_deposit_ids:
             deposit_products = DepositProduct.objects.filter(
                 fin_prdt_cd__in=top_deposit_ids
-            ).select_related('bank')
+            ).select_related('bank').prefetch_related('deposit_options')
             
             for product in deposit_products:
-                # options 데이터 파싱
-                options_data = []
-                if product.options:
-                    if isinstance(product.options, str):
-                        try:
-                            options_data = json.loads(product.options)
-                        except json.JSONDecodeError:
-                            options_data = []
-                    elif isinstance(product.options, list):
-                        options_data = product.options
+                options_data = DepositOptionSerializer(product.deposit_options.all(), many=True).data
                 
                 product_data = {
                     'product': {
@@ -419,19 +410,10 @@ def get_product_recommendations(request):
         if top_saving_ids:
             saving_products = SavingProduct.objects.filter(
                 fin_prdt_cd__in=top_saving_ids
-            ).select_related('bank')
+            ).select_related('bank').prefetch_related('saving_options')
             
             for product in saving_products:
-                # options 데이터 파싱
-                options_data = []
-                if product.options:
-                    if isinstance(product.options, str):
-                        try:
-                            options_data = json.loads(product.options)
-                        except json.JSONDecodeError:
-                            options_data = []
-                    elif isinstance(product.options, list):
-                        options_data = product.options
+                options_data = SavingOptionSerializer(product.saving_options.all(), many=True).data
                 
                 product_data = {
                     'product': {
@@ -170,6 +170,15 @@ ACCOUNT_EMAIL_VERIFICATION = 'none'
 
 load_dotenv()  # .env 파일 로드
 FINLIFE_API_KEY = os.environ.get('FINLIFE_API_KEY', 'eb9f3d19062bbbc32015258aabea7ed3')
+# 금융감독원 API 주소 (로컬 스텁 서버로 바꿔 오프라인에서 테스트할 수 있음)
+FINLIFE_BASE_URL = config('FINLIFE_BASE_URL', default='https://finlife.fss.or.kr/finlifeapi/')
+# 수집 모드 (live: API 호출, record: 호출하며 응답 저장, replay: 저장한 응답으로 수집)
+FINLIFE_MODE = config('FINLIFE_MODE', default='live')
+FINLIFE_RECORDINGS_DIR = config('FINLIFE_RECORDINGS_DIR', default=str(BASE_DIR / 'finlife_recordings'))
+
+# 금융상품 갱신 작업을 웹 프로세스의 백그라운드 스레드에서 실행할지 여부
+# (False면 `python manage.py refresh_catalog --worker`가 대기 작업을 처리)
+CATALOG_REFRESH_IN_PROCESS = config('CATALOG_REFRESH_IN_PROCESS', default=True, cast=bool)
 
 # 기본 인증 백엔드 설정
 AUTHENTICATION_BACKENDS = [
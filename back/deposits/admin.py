@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Bank, DepositProduct
+from .models import Bank, DepositProduct, CatalogRefreshJob
 
 admin.site.register(Bank)
-admin.site.register(DepositProduct)
\ No newline at end of file
+admin.site.register(DepositProduct)
+admin.site.register(CatalogRefreshJob)
\ No newline at end of file
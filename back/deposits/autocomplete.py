@@ -0,0 +1,193 @@
+import re
+import threading
+import time
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .catalog_cache import current_version
+from .models import DepositProduct, SavingProduct
+
+# 노드마다 미리 골라 두는 추천 수 (한 번에 돌려줄 수 있는 최대 개수)
+MAX_SUGGESTIONS = 10
+
+SUGGESTION_TYPES = ('bank', 'deposit', 'saving')
+
+# 가입/해지로 바뀐 인기순을 반영하려고 트리를 다시 만드는 주기(초, 가입은 카탈로그 버전을 올리지 않음)
+RANKING_REFRESH_SECONDS = 10 * 60
+
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+HANGUL_START, HANGUL_END = 0xAC00, 0xD7A3
+
+_word_start = re.compile(r'[0-9a-zA-Z가-힣ㄱ-ㅎ]+')
+_non_key = re.compile(r'[^0-9a-z가-힣ㄱ-ㅎ]+')
+
+_index_lock = threading.Lock()
+_index = {}
+
+
+def normalize(text):
+    """소문자로 바꾸고 한글/영문/숫자/자음이 아닌 문자(공백 포함)를 제거"""
+    return _non_key.sub('', (text or '').lower())
+
+
+def choseong(text):
+    """한글 음절을 초성으로 바꾼 문자열 (다른 문자는 그대로)"""
+    return ''.join(
+        CHOSEONG[(ord(char) - HANGUL_START) // 588] if HANGUL_START <= ord(char) <= HANGUL_END else char
+        for char in text
+    )
+
+
+def _open_syllables(char):
+    """받침 없는 음절이면 같은 초성+중성으로 시작하는 음절 범위 (입력 중인 글자 대응)"""
+    code = ord(char) - HANGUL_START
+    if 0 <= code <= HANGUL_END - HANGUL_START and code % 28 == 0:
+        return char, chr(ord(char) + 27)
+    return None
+
+
+class _Node:
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.top = []
+
+
+class SuggestionTrie:
+    """
+    이름의 단어 시작 위치마다 정규화한 키와 초성 키를 넣은 접두사 트리
+
+    항목을 인기순으로 넣으면서 노드마다 상위 MAX_SUGGESTIONS개를 저장해 두므로,
+    조회는 검색어 길이만큼 노드를 따라가는 것으로 끝난다.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.root = _Node()
+        self.choseong_root = _Node()
+        for position, entry in enumerate(entries):
+            for key in self.keys(entry['name']):
+                self._insert(self.root, key, position)
+                self._insert(self.choseong_root, choseong(key), position)
+
+    @staticmethod
+    def keys(name):
+        """이름 전체와 각 단어부터 시작하는 나머지 부분의 정규화 키"""
+        keys = []
+        for match in _word_start.finditer(name or ''):
+            key = normalize(name[match.start():])
+            if key and key not in keys:
+                keys.append(key)
+        return keys
+
+    @staticmethod
+    def _insert(root, key, position):
+        node = root
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+            if len(node.top) < MAX_SUGGESTIONS and position not in node.top:
+                node.top.append(position)
+
+    @staticmethod
+    def _find(root, key):
+        node = root
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def search(self, query, limit=MAX_SUGGESTIONS):
+        """검색어로 시작하는 항목을 인기순으로 최대 limit개 (항목 순번 목록)"""
+        key = normalize(query)
+        if not key:
+            return []
+        # 자음만 입력했거나 섞어 입력하면 초성 키로 찾음
+        if any(char in CHOSEONG for char in key):
+            node = self._find(self.choseong_root, choseong(key))
+            return node.top[:limit] if node else []
+
+        node = self._find(self.root, key)
+        positions = list(node.top) if node else []
+        # 마지막 글자가 받침 없이 입력 중이면 받침이 붙은 음절도 포함 ('국미' -> '국민')
+        syllables = _open_syllables(key[-1])
+        parent = self._find(self.root, key[:-1]) if syllables else None
+        if parent:
+            for char, child in parent.children.items():
+                if syllables[0] < char <= syllables[1]:
+                    positions.extend(child.top)
+            positions = sorted(set(positions))
+        return positions[:limit]
+
+
+def _load_entries():
+    """판매 중인 예금/적금 상품과 그 금융회사를 가입자 수 순서로 읽어옴"""
+    today = timezone.localdate().strftime('%Y%m%d')
+    on_sale = Q(dcls_end_day__isnull=True) | Q(dcls_end_day__gt=today)
+    entries = {product_type: [] for product_type in SUGGESTION_TYPES}
+    banks = {}
+    for product_type, model in (('deposit', DepositProduct), ('saving', SavingProduct)):
+        rows = model.objects.filter(on_sale).values_list(
+            'fin_prdt_cd', 'fin_prdt_nm', 'bank_id', 'bank__kor_co_nm', 'subscriber_count'
+        )
+        for code, name, bank_code, bank_name, popularity in rows:
+            entries[product_type].append({
+                'type': product_type,
+                'id': code,
+                'name': name,
+                'kor_co_nm': bank_name,
+                'popularity': popularity,
+            })
+            bank = banks.setdefault(bank_code, {
+                'type': 'bank', 'id': bank_code, 'name': bank_name, 'kor_co_nm': bank_name, 'popularity': 0,
+            })
+            bank['popularity'] += popularity
+    entries['bank'] = list(banks.values())
+    return {
+        suggestion_type: sorted(items, key=lambda entry: (-entry['popularity'], entry['name'], entry['id']))
+        for suggestion_type, items in entries.items()
+    }
+
+
+def get_tries():
+    """
+    유형별 추천 트리를 카탈로그 버전별로 프로세스 메모리에 캐시해 반환
+
+    예금/적금 중 하나라도 새 버전이 발행되거나 날짜가 바뀌면 다시 만든다.
+    가입자 수는 버전과 무관하게 바뀌므로 RANKING_REFRESH_SECONDS가 지나도 다시 만든다.
+    """
+    key = (current_version('deposit'), current_version('saving'), timezone.localdate())
+    cached = _index.get('tries')
+    if _is_fresh(cached, key):
+        return cached[2]
+    with _index_lock:
+        cached = _index.get('tries')
+        if not _is_fresh(cached, key):
+            entries = _load_entries()
+            cached = (key, time.monotonic(), {
+                suggestion_type: SuggestionTrie(entries[suggestion_type]) for suggestion_type in SUGGESTION_TYPES
+            })
+            _index['tries'] = cached
+        return cached[2]
+
+
+def _is_fresh(cached, key):
+    return bool(cached) and cached[0] == key and time.monotonic() - cached[1] < RANKING_REFRESH_SECONDS
+
+
+def clear_cached_tries():
+    with _index_lock:
+        _index.clear()
+
+
+def suggest(query, suggestion_types=SUGGESTION_TYPES, limit=MAX_SUGGESTIONS):
+    """검색어로 시작하는 금융회사/상품 이름을 유형을 섞어 인기순으로 최대 limit개"""
+    tries = get_tries()
+    matches = []
+    for suggestion_type in suggestion_types:
+        trie = tries[suggestion_type]
+        matches.extend(trie.entries[position] for position in trie.search(query, limit))
+    matches.sort(key=lambda entry: (-entry['popularity'], entry['name'], entry['id']))
+    return matches[:limit]
@@ -0,0 +1,378 @@
+import threading
+
+import numpy as np
+from django.utils import timezone
+
+from .catalog_cache import current_version
+from .models import DepositOption, SavingOption
+
+# 이자소득세 15.4% (소득세 14% + 지방소득세 1.4%)
+INTEREST_TAX_RATE = 0.154
+
+# 예금자보호 한도 (금융회사별 원금과 이자 합계)
+DEPOSIT_INSURANCE_LIMIT = 50000000
+
+# 적금 시뮬레이션 한 번에 받을 수 있는 최대 시나리오 수
+MAX_SCENARIOS = 50
+
+OPTION_MODELS = {
+    'deposit': DepositOption,
+    'saving': SavingOption,
+}
+
+_arrays_lock = threading.Lock()
+_option_arrays = {}
+
+
+def _load_option_arrays(product_type):
+    """판매 중인 상품의 옵션 전체를 열 단위 NumPy 배열로 읽어옴 (상품코드 순 정렬)"""
+    today = timezone.localdate().strftime('%Y%m%d')
+    rows = list(
+        OPTION_MODELS[product_type].objects.exclude(product__dcls_end_day__lte=today)
+        .exclude(intr_rate__isnull=True)
+        .values_list(
+            'product_id', 'product__fin_prdt_nm', 'product__bank__kor_co_nm',
+            'intr_rate_type', 'save_trm', 'intr_rate', 'intr_rate2',
+            'product__bank_id', 'product__max_limit',
+        )
+        .order_by('product_id', 'intr_rate_type', 'save_trm')
+    )
+
+    product_codes = sorted({row[0] for row in rows})
+    product_index = {code: i for i, code in enumerate(product_codes)}
+    names = {row[0]: (row[1], row[2]) for row in rows}
+    limits = {row[0]: row[8] for row in rows}
+    banks = {row[0]: row[7] for row in rows}
+
+    base = np.array([float(row[5]) for row in rows], dtype=np.float64)
+    # 우대금리가 없으면 기본금리로 계산
+    pref = np.array([float(row[6]) if row[6] is not None else float(row[5]) for row in rows], dtype=np.float64)
+    return {
+        'product': np.array([product_index[row[0]] for row in rows], dtype=np.int32),
+        'compound': np.array([row[3] == 'M' for row in rows], dtype=bool),
+        'term': np.array([row[4] for row in rows], dtype=np.int16),
+        'base_rate': base,
+        'pref_rate': pref,
+        'rate_type': [row[3] for row in rows],
+        'product_codes': product_codes,
+        'product_names': [names[code] for code in product_codes],
+        'product_banks': [banks[code] for code in product_codes],
+        # 최고한도가 없으면 제한 없음
+        'product_limits': np.array(
+            [limits[code] if limits[code] else np.inf for code in product_codes], dtype=np.float64
+        ),
+    }
+
+
+def get_option_arrays(product_type):
+    """
+    옵션 배열을 카탈로그 버전별로 프로세스 메모리에 캐시해 반환
+
+    새 버전이 발행되거나 날짜가 바뀌면(판매 종료 반영) 다시 읽는다.
+    """
+    key = (current_version(product_type), timezone.localdate())
+    cached = _option_arrays.get(product_type)
+    if cached and cached[0] == key:
+        return cached[1]
+    with _arrays_lock:
+        cached = _option_arrays.get(product_type)
+        if not cached or cached[0] != key:
+            cached = (key, _load_option_arrays(product_type))
+            _option_arrays[product_type] = cached
+        return cached[1]
+
+
+def clear_cached_arrays():
+    with _arrays_lock:
+        _option_arrays.clear()
+
+
+def option_rate(option, rate):
+    """우대금리 기준이면 우대금리(없으면 기본금리), 아니면 기본금리"""
+    if rate == 'pref' and option.intr_rate2 is not None:
+        return option.intr_rate2
+    return option.intr_rate
+
+
+def after_tax(interest):
+    """원 단위 미만을 절사한 세전 이자와 이자소득세"""
+    interest = np.floor(interest)
+    return interest, np.floor(interest * INTEREST_TAX_RATE)
+
+
+def maturity_amounts(principal, months, annual_rates, compound):
+    """
+    예치금 principal을 months개월 맡겼을 때의 세전 이자를 한 번에 계산
+
+    annual_rates는 연이율(%) 배열, compound가 True인 항목은 월복리, 나머지는 단리.
+    """
+    rates = annual_rates / 100
+    simple = principal * rates * months / 12
+    compounded = principal * ((1 + rates / 12) ** months - 1)
+    return np.where(compound, compounded, simple)
+
+
+def rank_deposits(principal, months, rate='pref', limit=10):
+    """
+    months개월 옵션이 있는 예금을 세후 만기 수령액이 큰 순서로 limit개 반환
+
+    한 상품에 단리/복리 옵션이 모두 있으면 더 유리한 쪽만 남긴다.
+    """
+    arrays = get_option_arrays('deposit')
+    mask = arrays['term'] == months
+    if not mask.any():
+        return []
+
+    indexes = np.flatnonzero(mask)
+    compound = arrays['compound'][indexes]
+    base_interest = maturity_amounts(principal, months, arrays['base_rate'][indexes], compound)
+    pref_interest = maturity_amounts(principal, months, arrays['pref_rate'][indexes], compound)
+    base_interest, base_tax = after_tax(base_interest)
+    pref_interest, pref_tax = after_tax(pref_interest)
+
+    ranking = pref_interest - pref_tax if rate == 'pref' else base_interest - base_tax
+    # 수령액 내림차순 정렬 후 상품별 첫 항목(가장 유리한 옵션)만 남김
+    order = np.argsort(-ranking, kind='stable')
+    _, first = np.unique(arrays['product'][indexes][order], return_index=True)
+    best = order[np.sort(first)][:limit]
+
+    results = []
+    for position in best:
+        option = indexes[position]
+        code = arrays['product_codes'][arrays['product'][option]]
+        name, bank = arrays['product_names'][arrays['product'][option]]
+        results.append({
+            'fin_prdt_cd': code,
+            'fin_prdt_nm': name,
+            'kor_co_nm': bank,
+            'intr_rate_type': arrays['rate_type'][option],
+            'save_trm': months,
+            'intr_rate': round(float(arrays['base_rate'][option]), 2),
+            'intr_rate2': round(float(arrays['pref_rate'][option]), 2),
+            'base': {
+                'interest': int(base_interest[position]),
+                'tax': int(base_tax[position]),
+                'amount': int(principal + base_interest[position] - base_tax[position]),
+            },
+            'pref': {
+                'interest': int(pref_interest[position]),
+                'tax': int(pref_tax[position]),
+                'amount': int(principal + pref_interest[position] - pref_tax[position]),
+            },
+        })
+    return results
+
+
+def _installment_interest(amounts, months, monthly, compound):
+    """월이율 monthly로 매월 초 amounts원씩 months개월 납입한 세전 이자 (인자끼리 브로드캐스트)"""
+    simple = amounts * monthly * months * (months + 1) / 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = (1 + monthly) * ((1 + monthly) ** months - 1) / monthly - months
+    compounded = amounts * np.where(monthly > 0, growth, 0)
+    return np.where(compound, compounded, simple)
+
+
+def installment_interest(amounts, terms, annual_rates, compound):
+    """
+    매월 초 amounts원씩 terms개월 납입할 때의 세전 이자를 (옵션 수 x 시나리오 수) 행렬로 계산
+
+    단리는 k번째 납입분이 (terms - k + 1)개월치 이자를 받고,
+    월복리는 각 납입분이 남은 개월 수만큼 월 단위로 복리 계산된다.
+    """
+    return _installment_interest(
+        np.asarray(amounts, dtype=np.float64)[None, :],
+        np.asarray(terms, dtype=np.float64)[None, :],
+        annual_rates[:, None] / 100 / 12,
+        compound[:, None],
+    )
+
+
+def option_installment_interest(amount, terms, annual_rates, compound):
+    """옵션마다 매월 amount원씩 자기 기간(terms)만큼 납입한 세전 이자 (옵션 수 길이의 배열)"""
+    return _installment_interest(
+        float(amount),
+        np.asarray(terms, dtype=np.float64),
+        np.asarray(annual_rates, dtype=np.float64) / 100 / 12,
+        np.asarray(compound, dtype=bool),
+    )
+
+
+def simulate_installments(arrays, amounts, terms, rate='pref'):
+    """
+    적금 시나리오 여러 개를 모든 옵션에 대해 한 번에 계산
+
+    옵션 기간(save_trm)과 시나리오 기간이 다른 조합은 NaN으로 두고, 상품별로 가장 유리한
+    옵션의 값만 남긴 (상품 수 x 시나리오 수) 행렬을 반환한다.
+    """
+    amounts = np.asarray(amounts, dtype=np.float64)
+    terms = np.asarray(terms, dtype=np.int16)
+    rates = arrays['pref_rate'] if rate == 'pref' else arrays['base_rate']
+
+    interest, tax = after_tax(installment_interest(amounts, terms, rates, arrays['compound']))
+    matched = arrays['term'][:, None] == terms[None, :]
+    net = np.where(matched, interest - tax, np.nan)
+
+    # 옵션은 상품코드 순으로 정렬되어 있으므로 상품별 구간의 최댓값을 한 번에 구함
+    product = arrays['product']
+    if not len(product):
+        empty = np.empty((0, len(terms)))
+        return {'net': empty, 'interest': empty, 'tax': empty, 'option_net': empty, 'starts': product}
+    starts = np.flatnonzero(np.r_[True, product[1:] != product[:-1]])
+    with np.errstate(invalid='ignore'):
+        best = np.fmax.reduceat(net, starts, axis=0)
+    return {'net': best, 'interest': interest, 'tax': tax, 'option_net': net, 'starts': starts}
+
+
+def simulate_savings(scenarios, rate='pref', limit=10):
+    """
+    시나리오별로 세후 만기 수령액이 큰 적금 상품 limit개와 실효 연수익률을 반환
+
+    실효 연수익률은 세후 이자를 납입 원금 합계로 나눠 1년 기준으로 환산한 값(%)이다.
+    """
+    arrays = get_option_arrays('saving')
+    amounts = [scenario['amount'] for scenario in scenarios]
+    terms = [scenario['term'] for scenario in scenarios]
+    simulated = simulate_installments(arrays, amounts, terms, rate=rate)
+    best = simulated['net']
+
+    # 시나리오마다 수령액 내림차순 (NaN은 뒤로)
+    order = np.argsort(np.where(np.isnan(best), np.inf, -best), axis=0, kind='stable')
+
+    results = []
+    for column, (amount, term) in enumerate(zip(amounts, terms)):
+        principal = amount * term
+        products = []
+        for product_position in order[:limit, column]:
+            net_interest = best[product_position, column]
+            if np.isnan(net_interest):
+                break
+            # 상품 구간에서 최고값을 낸 옵션 찾기
+            start = simulated['starts'][product_position]
+            segment = simulated['option_net'][start:, column]
+            option = start + int(np.flatnonzero(segment == net_interest)[0])
+            name, bank = arrays['product_names'][product_position]
+            products.append({
+                'fin_prdt_cd': arrays['product_codes'][product_position],
+                'fin_prdt_nm': name,
+                'kor_co_nm': bank,
+                'intr_rate_type': arrays['rate_type'][option],
+                'intr_rate': round(float(arrays['base_rate'][option]), 2),
+                'intr_rate2': round(float(arrays['pref_rate'][option]), 2),
+                'principal': principal,
+                'interest': int(simulated['interest'][option, column]),
+                'tax': int(simulated['tax'][option, column]),
+                'amount': int(principal + net_interest),
+                'effective_yield': round(float(net_interest / principal * 12 / term * 100), 2),
+            })
+        results.append({'amount': amount, 'term': term, 'products': products})
+    return results
+
+
+def allocate_deposits(amount, months, rate='pref', preferred_bank=None,
+                      insurance_limit=DEPOSIT_INSURANCE_LIMIT):
+    """
+    금융회사별 원리금이 예금자보호 한도를 넘지 않게 예치금을 나눠 세후 이자가 최대가 되는 배분안을 반환
+
+    상품별 최고 옵션의 원당 세후 이자를 한 번에 계산한 뒤, 수익률이 높은 상품부터
+    금융회사 남은 한도와 상품 최고한도(max_limit) 안에서 채우는 탐욕 방식이다.
+    수익률이 같으면 선호 은행을 먼저 채우고, 한도를 넘어 보호받지 못하는 금액은
+    선호 은행(없으면 가장 유리한 상품)에 배분한다.
+    """
+    arrays = get_option_arrays('deposit')
+    mask = arrays['term'] == months
+    plan = {
+        'amount': amount,
+        'term': months,
+        'insurance_limit': insurance_limit,
+        'allocations': [],
+        'total_interest': 0,
+        'total_tax': 0,
+        'allocated': 0,
+        'uninsured': 0,
+        'unallocated': amount,
+    }
+    if not mask.any():
+        return plan
+
+    # 원금 1원당 세전 이자 (기간 옵션이 없는 상품은 NaN)
+    rates = arrays['pref_rate'] if rate == 'pref' else arrays['base_rate']
+    growth = np.where(mask, maturity_amounts(1.0, months, rates, arrays['compound']), np.nan)
+    product = arrays['product']
+    starts = np.flatnonzero(np.r_[True, product[1:] != product[:-1]])
+    with np.errstate(invalid='ignore'):
+        best_growth = np.fmax.reduceat(growth, starts)
+    # 각 상품에서 최고값을 낸 옵션 위치
+    best_option = np.array([
+        start + int(np.nanargmax(growth[start:end]))
+        if not np.isnan(best_growth[i]) else -1
+        for i, (start, end) in enumerate(zip(starts, np.r_[starts[1:], len(product)]))
+    ])
+
+    candidates = np.flatnonzero(~np.isnan(best_growth))
+    preferred = np.array([arrays['product_banks'][i] == preferred_bank for i in candidates])
+    order = candidates[np.lexsort((~preferred, -best_growth[candidates]))]
+
+    bank_room = {}
+    allocated = {}
+    remaining = amount
+    for product_position in order:
+        if remaining <= 0:
+            break
+        bank = arrays['product_banks'][product_position]
+        room = bank_room.get(bank, insurance_limit)
+        # 원금 + 이자가 남은 보호 한도를 넘지 않는 최대 원금
+        principal = min(
+            remaining,
+            int(room / (1 + best_growth[product_position])),
+            arrays['product_limits'][product_position],
+        )
+        principal = int(principal)
+        if principal <= 0:
+            continue
+        allocated[product_position] = principal
+        bank_room[bank] = room - principal * (1 + best_growth[product_position])
+        remaining -= principal
+
+    # 보호 한도를 모두 채우고 남은 금액
+    uninsured = 0
+    if remaining > 0:
+        fallback = [i for i in order if arrays['product_banks'][i] == preferred_bank] or list(order)
+        for product_position in fallback:
+            room = int(arrays['product_limits'][product_position] - allocated.get(product_position, 0)) \
+                if np.isfinite(arrays['product_limits'][product_position]) else remaining
+            principal = min(remaining, room)
+            if principal <= 0:
+                continue
+            allocated[product_position] = allocated.get(product_position, 0) + principal
+            uninsured += principal
+            remaining -= principal
+            if remaining <= 0:
+                break
+
+    for product_position in order:
+        principal = allocated.get(product_position)
+        if not principal:
+            continue
+        option = best_option[product_position]
+        interest, tax = after_tax(principal * best_growth[product_position])
+        name, bank_name = arrays['product_names'][product_position]
+        plan['allocations'].append({
+            'fin_prdt_cd': arrays['product_codes'][product_position],
+            'fin_prdt_nm': name,
+            'fin_co_no': arrays['product_banks'][product_position],
+            'kor_co_nm': bank_name,
+            'intr_rate_type': arrays['rate_type'][option],
+            'save_trm': months,
+            'rate': round(float(rates[option]), 2),
+            'principal': principal,
+            'interest': int(interest),
+            'tax': int(tax),
+            'amount': int(principal + interest - tax),
+        })
+        plan['total_interest'] += int(interest)
+        plan['total_tax'] += int(tax)
+        plan['allocated'] += principal
+
+    plan['uninsured'] = uninsured
+    plan['unallocated'] = remaining
+    return plan
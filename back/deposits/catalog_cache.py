@@ -0,0 +1,235 @@
+import gzip
+
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from rest_framework.renderers import JSONRenderer
+
+from .ingestion import SECTOR_CODES
+from .models import CatalogVersion, DepositProduct, SavingProduct
+from .serializers import DepositProductSerializer, SavingProductSerializer
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip만 제공
+    brotli = None
+
+# 다른 프로세스에서 발행한 버전을 알아차리기까지 걸리는 최대 시간(초)
+VERSION_CACHE_TIMEOUT = 60
+
+# 변경 목록 한 번에 돌려주는 최대 상품 수 (넘으면 전체 목록을 다시 받도록 안내)
+CHANGE_FEED_LIMIT = 500
+
+# 같은 (since, 현재 버전) 변경 목록을 캐시에 두는 시간(초)
+CHANGE_FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+CHANGE_KINDS = ('inserted', 'updated', 'withdrawn')
+
+CATALOG_QUERYSETS = {
+    'deposit': (DepositProduct, 'deposit_options', DepositProductSerializer),
+    'saving': (SavingProduct, 'saving_options', SavingProductSerializer),
+}
+
+
+def _version_key(product_type):
+    return f'catalog-version:{product_type}'
+
+
+def _payload_key(product_type, version, sector_code):
+    return f'catalog-payload:{product_type}:{version}:{sector_code or "all"}'
+
+
+def _changes_key(product_type, since, version):
+    return f'catalog-changes:{product_type}:{since}:{version}'
+
+
+def current_version(product_type):
+    """현재 카탈로그 버전 번호 (캐시 우선, 없으면 0)"""
+    version = cache.get(_version_key(product_type))
+    if version is None:
+        version = CatalogVersion.objects.filter(
+            product_type=product_type
+        ).values_list('id', flat=True).first() or 0
+        cache.set(_version_key(product_type), version, VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def build_payload(product_type, version, sector_code=None):
+    """상품 목록을 한 번 직렬화해 원본/gzip/brotli 바이트로 캐시에 저장"""
+    model, options_relation, serializer_class = CATALOG_QUERYSETS[product_type]
+    queryset = model.objects.select_related('bank').prefetch_related(options_relation)
+    if sector_code:
+        queryset = queryset.filter(sector_code=sector_code)
+
+    body = JSONRenderer().render(serializer_class(queryset, many=True).data)
+    payload = {
+        'etag': f'"{product_type}-v{version}-{sector_code or "all"}"',
+        'version': version,
+        'identity': body,
+        'gzip': gzip.compress(body, compresslevel=6),
+        'br': brotli.compress(body) if brotli else None,
+    }
+    cache.set(_payload_key(product_type, version, sector_code), payload, None)
+    return payload
+
+
+def create_version(product_type, summary, changes=None):
+    """
+    상품 변경이 있으면 새 카탈로그 버전 행만 만듦 (상품 저장과 같은 트랜잭션에서 호출)
+
+    changes(종류별 상품코드)를 함께 저장해 두면 변경 목록 API가 이 버전 이후의 변경을 알려줄 수 있다.
+    변경이 없으면 None을 반환한다.
+    """
+    changed = summary['inserted'] + summary['updated'] + summary['withdrawn']
+    if not changed and CatalogVersion.objects.filter(product_type=product_type).exists():
+        return None
+
+    return CatalogVersion.objects.create(
+        product_type=product_type,
+        summary={key: summary[key] for key in ('inserted', 'updated', 'withdrawn', 'unchanged')},
+        changes={kind: list(changes[kind]) for kind in CHANGE_KINDS} if changes is not None else None,
+    )
+
+
+def warm_version(product_type, version):
+    """커밋된 버전을 현재 버전으로 캐시하고 권역별 목록 캐시를 미리 채움"""
+    cache.set(_version_key(product_type), version.pk, VERSION_CACHE_TIMEOUT)
+    for sector_code in [None, *SECTOR_CODES]:
+        build_payload(product_type, version.pk, sector_code)
+
+
+def publish_version(product_type, summary, changes=None):
+    """
+    상품 변경이 있으면 새 카탈로그 버전을 발행하고 권역별 목록 캐시를 미리 채움
+
+    변경이 없으면 기존 버전과 캐시를 그대로 두고 None을 반환한다.
+    """
+    version = create_version(product_type, summary, changes)
+    if version is not None:
+        warm_version(product_type, version)
+    return version
+
+
+def _collect_changes(product_type, since, version):
+    """
+    since 이후 version까지의 버전 변경을 상품별 마지막 변경으로 합침
+
+    since가 이 상품 유형의 버전이 아니거나, 중간에 변경 내역이 없는 버전이 있으면 None을 반환한다.
+    """
+    if since and not CatalogVersion.objects.filter(product_type=product_type, pk=since).exists():
+        return None
+
+    latest = {}
+    for changes in CatalogVersion.objects.filter(
+        product_type=product_type, pk__gt=since, pk__lte=version
+    ).order_by('pk').values_list('changes', flat=True):
+        if changes is None:
+            return None
+        for kind in CHANGE_KINDS:
+            for code in changes.get(kind, []):
+                latest[code] = kind
+    return latest
+
+
+def build_changes(product_type, since, version):
+    """since 버전 이후 바뀐 상품과 판매 종료/삭제된 상품코드(tombstones)"""
+    document = {
+        'product_type': product_type,
+        'since': since,
+        'version': version,
+        'reset': False,
+        'products': [],
+        'tombstones': [],
+    }
+    if since == version:
+        return document
+
+    latest = _collect_changes(product_type, since, version) if 0 < since < version else None
+    if latest is None or len(latest) > CHANGE_FEED_LIMIT:
+        # 변경을 이어 붙일 수 없으니 전체 목록을 다시 받아야 함
+        document['reset'] = True
+        return document
+
+    # 판매 종료된 상품은 tombstones에만 넣음 (한 응답에서 같은 상품을 갱신하고 지우지 않도록)
+    withdrawn = {code for code, kind in latest.items() if kind == 'withdrawn'}
+    model, options_relation, serializer_class = CATALOG_QUERYSETS[product_type]
+    products = (
+        model.objects.filter(pk__in=[code for code in latest if code not in withdrawn])
+        .select_related('bank').prefetch_related(options_relation)
+    )
+    document['products'] = serializer_class(products.order_by('pk'), many=True).data
+    found = {product['fin_prdt_cd'] for product in document['products']}
+    document['tombstones'] = sorted(code for code in latest if code in withdrawn or code not in found)
+    return document
+
+
+def changes_response(request, product_type, since):
+    """
+    since 버전 이후의 상품 변경 목록으로 응답
+
+    같은 since/현재 버전 조합은 한 번 만든 본문을 캐시에서 그대로 돌려준다.
+    reset이 true면 클라이언트는 전체 목록을 다시 받아야 한다.
+    """
+    version = current_version(product_type)
+    key = _changes_key(product_type, since, version)
+    body = cache.get(key)
+    if body is None:
+        body = JSONRenderer().render(build_changes(product_type, since, version))
+        cache.set(key, body, CHANGE_FEED_CACHE_TIMEOUT)
+
+    etag = f'"{product_type}-changes-{since}-v{version}"'
+    if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+def get_payload(product_type, sector_code=None):
+    version = current_version(product_type)
+    payload = cache.get(_payload_key(product_type, version, sector_code))
+    if payload is None:
+        payload = build_payload(product_type, version, sector_code)
+    return payload
+
+
+def _accepted_encodings(request):
+    encodings = set()
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        token, _, params = part.strip().partition(';')
+        if params.strip().replace(' ', '') in ('q=0', 'q=0.0'):
+            continue
+        encodings.add(token.strip().lower())
+    return encodings
+
+
+def catalog_response(request, product_type, sector_code=None):
+    """
+    캐시된 상품 목록으로 응답
+
+    If-None-Match가 현재 ETag와 같으면 304를, 아니면 클라이언트가 받을 수 있는
+    압축 형식의 바이트를 그대로 돌려준다. 캐시가 채워져 있으면 DB를 조회하지 않는다.
+    """
+    payload = get_payload(product_type, sector_code)
+    etag = payload['etag']
+
+    if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+        response = HttpResponseNotModified()
+    else:
+        accepted = _accepted_encodings(request)
+        if payload['br'] is not None and 'br' in accepted:
+            response = HttpResponse(payload['br'], content_type='application/json')
+            response['Content-Encoding'] = 'br'
+        elif 'gzip' in accepted:
+            response = HttpResponse(payload['gzip'], content_type='application/json')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(payload['identity'], content_type='application/json')
+
+    response['ETag'] = etag
+    # 변경 목록 API의 since로 쓸 현재 버전
+    response['X-Catalog-Version'] = str(payload['version'])
+    response['Vary'] = 'Accept-Encoding'
+    response['Cache-Control'] = 'no-cache'
+    return response
@@ -0,0 +1,132 @@
+import hashlib
+
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from rest_framework.renderers import JSONRenderer
+
+from .calculator import option_rate
+from .catalog_cache import current_version
+from .models import DepositProduct, SavingProduct
+
+# 한 번에 비교할 수 있는 최대 상품 수
+MAX_COMPARE_PRODUCTS = 20
+
+# 같은 상품 묶음의 비교 결과를 캐시에 두는 시간(초, 새 카탈로그 버전이 나오면 키가 바뀜)
+COMPARE_CACHE_TIMEOUT = 60 * 60
+
+COMPARE_MODELS = {
+    'deposit': (DepositProduct, 'deposit_options'),
+    'saving': (SavingProduct, 'saving_options'),
+}
+
+# 상품 열에 함께 담는 필드
+PRODUCT_COLUMNS = ['fin_prdt_cd', 'fin_prdt_nm', 'join_way', 'max_limit', 'dcls_end_day']
+
+
+def _cache_key(product_type, version, codes, rate):
+    digest = hashlib.sha1(','.join(codes).encode('utf-8')).hexdigest()
+    return f'compare:{product_type}:{version}:{rate}:{digest}'
+
+
+def _etag(key):
+    return f'"compare-{hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]}"'
+
+
+def _max(*values):
+    return max((value for value in values if value is not None), default=None)
+
+
+def _best_rates(options):
+    """기간별 (최고 기본금리, 최고 우대금리) (우대금리가 없으면 기본금리)"""
+    rates = {}
+    for option in options:
+        best_base, best_pref = rates.get(option.save_trm, (None, None))
+        rates[option.save_trm] = (
+            _max(best_base, option.intr_rate),
+            _max(best_pref, option_rate(option, 'pref')),
+        )
+    return rates
+
+
+def _to_float(value):
+    return round(float(value), 2) if value is not None else None
+
+
+def build_comparison(product_type, codes, rate='pref'):
+    """
+    상품들의 옵션을 공통 기간 축에 맞춰 열 단위로 정리
+
+    base_rates/pref_rates는 [기간][상품] 순서의 2차원 배열이고, deltas는 기간마다 rate 기준 최고 상품과의 금리 차이다.
+    상품과 은행, 옵션을 prefetch 한 번으로 읽는다.
+    """
+    model, options_relation = COMPARE_MODELS[product_type]
+    products = list(
+        model.objects.filter(pk__in=codes).select_related('bank')
+        .prefetch_related(options_relation).order_by('pk')
+    )
+    rates = [_best_rates(getattr(product, options_relation).all()) for product in products]
+    terms = sorted({term for product_rates in rates for term in product_rates})
+
+    base_rates, pref_rates, best_rates, best_products, deltas = [], [], [], [], []
+    for term in terms:
+        base_row = [_to_float(product_rates.get(term, (None, None))[0]) for product_rates in rates]
+        pref_row = [_to_float(product_rates.get(term, (None, None))[1]) for product_rates in rates]
+        compared = pref_row if rate == 'pref' else base_row
+        available = [value for value in compared if value is not None]
+        best = max(available) if available else None
+        base_rates.append(base_row)
+        pref_rates.append(pref_row)
+        best_rates.append(best)
+        best_products.append(compared.index(best) if best is not None else None)
+        deltas.append([
+            round(value - best, 2) if value is not None and best is not None else None
+            for value in compared
+        ])
+
+    found = {product.pk for product in products}
+    return {
+        'product_type': product_type,
+        'rate': rate,
+        'products': {
+            **{column: [getattr(product, column) for product in products] for column in PRODUCT_COLUMNS},
+            'fin_co_no': [product.bank_id for product in products],
+            'kor_co_nm': [product.bank.kor_co_nm for product in products],
+        },
+        'terms': terms,
+        'base_rates': base_rates,
+        'pref_rates': pref_rates,
+        'best_rates': best_rates,
+        # 기간별 최고 상품의 열 번호
+        'best_products': best_products,
+        'deltas': deltas,
+        'missing': [code for code in codes if code not in found],
+    }
+
+
+def comparison_response(request, product_type, codes, rate='pref'):
+    """
+    비교 결과로 응답 (정렬한 상품코드 묶음과 카탈로그 버전별로 캐시)
+
+    요청한 상품이 하나도 없으면 None을 반환한다.
+    """
+    codes = sorted(set(codes))
+    version = current_version(product_type)
+    key = _cache_key(product_type, version, codes, rate)
+    document = cache.get(key)
+    if document is None:
+        comparison = build_comparison(product_type, codes, rate)
+        if not comparison['products']['fin_prdt_cd']:
+            return None
+        document = {
+            'etag': _etag(key),
+            'body': JSONRenderer().render(comparison),
+        }
+        cache.set(key, document, COMPARE_CACHE_TIMEOUT)
+
+    if document['etag'] in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(document['body'], content_type='application/json')
+    response['ETag'] = document['etag']
+    response['Cache-Control'] = 'no-cache'
+    return response
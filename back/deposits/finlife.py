@@ -0,0 +1,256 @@
+import gzip
+import json
+import random
+import threading
+import time
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+# 상품 유형별 API 엔드포인트
+PRODUCT_ENDPOINTS = {
+    'deposit': 'depositProductsSearch.json',
+    'saving': 'savingProductsSearch.json',
+}
+
+# 연결/응답 대기 시간(초)
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 20
+
+# 동시에 보낼 수 있는 최대 요청 수 (커넥션 풀 크기와 같게 유지)
+MAX_CONCURRENCY = 8
+
+# 재시도 횟수와 대기 시간 (지수 백오프 + 전체 지터)
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+# 재시도할 HTTP 상태 코드
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 수집 모드: live(API 호출), record(호출하며 응답 저장), replay(저장한 응답 사용)
+FINLIFE_MODES = ('live', 'record', 'replay')
+
+# 녹화 파일의 목록 항목 구분 (한 줄에 항목 하나)
+RECORDING_LISTS = {'baseList': 'base', 'optionList': 'option'}
+
+
+class FinlifeError(requests.exceptions.RequestException):
+    """금융감독원 API 호출이 실패한 경우 (메시지에 API 키를 포함하지 않음)"""
+
+
+class FinlifeClient:
+    """
+    금융감독원 금융상품 API 클라이언트
+
+    커넥션 풀 세션 하나를 여러 스레드가 함께 쓰고, 동시 요청 수를 세마포어로 제한한다.
+    네트워크 오류와 일시적인 서버 오류는 지수 백오프와 지터를 두고 재시도하며,
+    호출마다 소요 시간과 시도 횟수를 기록한다.
+    """
+
+    def __init__(self, api_key, base_url=None, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+                 max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE, max_concurrency=MAX_CONCURRENCY):
+        self.api_key = api_key
+        self.base_url = base_url or settings.FINLIFE_BASE_URL
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_concurrency = max_concurrency
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._calls_lock = threading.Lock()
+        self.calls = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(BACKOFF_MAX, self.backoff_base * 2 ** attempt))
+
+    def _record(self, **call):
+        with self._calls_lock:
+            self.calls.append(call)
+
+    def _request(self, url, params):
+        """한 번 요청해 JSON을 반환 (재시도할 오류면 None과 사유를 반환)"""
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            return None, type(e).__name__
+        if response.status_code in RETRY_STATUS_CODES:
+            return None, f'HTTP {response.status_code}'
+        if response.status_code >= 400:
+            # 요청 URL에 API 키가 들어 있으므로 raise_for_status() 메시지를 쓰지 않는다
+            raise FinlifeError(f'HTTP {response.status_code}')
+        try:
+            return response.json(), None
+        except ValueError:
+            return None, '잘못된 JSON 응답'
+
+    def get_page(self, product_type, sector_code, page_no):
+        """권역/페이지 하나를 조회해 result 객체를 반환"""
+        url = self.base_url + PRODUCT_ENDPOINTS[product_type]
+        params = {
+            'auth': self.api_key,
+            'topFinGrpNo': sector_code,
+            'pageNo': page_no,
+        }
+
+        started = time.perf_counter()
+        attempt = 0
+        error = None
+        while True:
+            try:
+                with self._slots:
+                    data, error = self._request(url, params)
+            except FinlifeError as e:
+                data, error = None, str(e)
+                break
+            if data is not None or attempt >= self.max_retries:
+                break
+            # 기다리는 동안에는 다른 요청이 자리를 쓸 수 있게 세마포어 밖에서 대기
+            attempt += 1
+            time.sleep(self._backoff(attempt))
+
+        self._record(
+            product_type=product_type,
+            sector_code=sector_code,
+            page_no=page_no,
+            attempts=attempt + 1,
+            elapsed=round(time.perf_counter() - started, 4),
+            ok=data is not None,
+        )
+        if data is None:
+            raise FinlifeError(f'{sector_code} {page_no}페이지 조회 실패: {error}')
+
+        result = data.get('result', {})
+        err_cd = result.get('err_cd')
+        if err_cd and err_cd != '000':
+            raise FinlifeError(f"{sector_code} {page_no}페이지 조회 실패: [{err_cd}] {result.get('err_msg', '')}")
+        return result
+
+    def stats(self):
+        """기록된 호출의 건수, 재시도 수, 소요 시간 분포(초)"""
+        with self._calls_lock:
+            elapsed = sorted(call['elapsed'] for call in self.calls)
+            retries = sum(call['attempts'] - 1 for call in self.calls)
+            failures = sum(1 for call in self.calls if not call['ok'])
+        if not elapsed:
+            return {'calls': 0, 'retries': 0, 'failures': 0}
+
+        def percentile(ratio):
+            return elapsed[min(len(elapsed) - 1, int(len(elapsed) * ratio))]
+
+        return {
+            'calls': len(elapsed),
+            'retries': retries,
+            'failures': failures,
+            'p50': percentile(0.5),
+            'p95': percentile(0.95),
+            'max': elapsed[-1],
+        }
+
+
+def recording_path(directory, product_type, sector_code, page_no):
+    return Path(directory) / product_type / f'{sector_code}_{page_no}.jsonl.gz'
+
+
+def write_recording(path, result):
+    """
+    응답 result를 gzip으로 압축한 JSON Lines 파일로 저장
+
+    첫 줄은 목록을 뺀 머리 정보, 이후 baseList/optionList 항목이 한 줄에 하나씩 들어간다.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    header = {key: value for key, value in result.items() if key not in RECORDING_LISTS}
+    temp_path = path.with_name(path.name + '.tmp')
+    with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+        f.write(json.dumps(header, ensure_ascii=False) + '\n')
+        for list_name, kind in RECORDING_LISTS.items():
+            for item in result.get(list_name) or []:
+                f.write(json.dumps({kind: item}, ensure_ascii=False) + '\n')
+    # 중간에 실패해도 반쯤 쓴 파일이 남지 않게 다 쓴 뒤 이름을 바꿈
+    temp_path.replace(path)
+
+
+def read_recording(path):
+    """녹화 파일을 한 줄씩 읽어 (종류, 데이터)를 차례로 돌려줌 (파일 전체를 메모리에 올리지 않음)"""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        yield 'header', json.loads(next(f))
+        for line in f:
+            if line.strip():
+                yield next(iter(json.loads(line).items()))
+
+
+class RecordingFinlifeClient(FinlifeClient):
+    """API를 호출하면서 응답을 권역/페이지별 파일로 저장하는 클라이언트"""
+
+    def __init__(self, api_key, directory, **kwargs):
+        super().__init__(api_key, **kwargs)
+        self.directory = Path(directory)
+
+    def get_page(self, product_type, sector_code, page_no):
+        result = super().get_page(product_type, sector_code, page_no)
+        write_recording(recording_path(self.directory, product_type, sector_code, page_no), result)
+        return result
+
+
+class ReplayFinlifeClient(FinlifeClient):
+    """
+    API 대신 녹화 파일을 읽어 같은 형식의 result를 돌려주는 클라이언트
+
+    파일은 한 줄씩 읽어 한 페이지 분량의 목록만 만든다. replay 모드의 갱신 작업은
+    stream_products로 페이지를 하나씩 받아 바로 저장하므로 전체 목록을 메모리에 모으지 않는다.
+    """
+
+    def __init__(self, api_key=None, directory=None, **kwargs):
+        super().__init__(api_key, **kwargs)
+        self.directory = Path(directory)
+
+    def get_page(self, product_type, sector_code, page_no):
+        path = recording_path(self.directory, product_type, sector_code, page_no)
+        if not path.exists():
+            raise FinlifeError(f'{sector_code} {page_no}페이지 녹화 파일이 없습니다: {path}')
+
+        started = time.perf_counter()
+        result = {list_name: [] for list_name in RECORDING_LISTS}
+        lists = {kind: result[list_name] for list_name, kind in RECORDING_LISTS.items()}
+        for kind, data in read_recording(path):
+            if kind == 'header':
+                result.update(data)
+            else:
+                lists[kind].append(data)
+
+        self._record(
+            product_type=product_type,
+            sector_code=sector_code,
+            page_no=page_no,
+            attempts=1,
+            elapsed=round(time.perf_counter() - started, 4),
+            ok=True,
+        )
+        return result
+
+
+def get_client(api_key, mode=None, directory=None):
+    """수집 모드에 맞는 클라이언트 생성 (기본값은 설정의 FINLIFE_MODE/FINLIFE_RECORDINGS_DIR)"""
+    mode = mode or settings.FINLIFE_MODE
+    directory = directory or settings.FINLIFE_RECORDINGS_DIR
+    if mode == 'record':
+        return RecordingFinlifeClient(api_key, directory)
+    if mode == 'replay':
+        return ReplayFinlifeClient(api_key, directory)
+    return FinlifeClient(api_key)
@@ -0,0 +1,166 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from .finlife import PRODUCT_ENDPOINTS, ReplayFinlifeClient, recording_path
+
+# 가상 카탈로그의 페이지당 상품 수
+SYNTHETIC_PAGE_SIZE = 20
+
+TERMS = ['6', '12', '24', '36']
+
+
+def synthetic_page(product_type, sector_code, page_no, products_per_sector, page_size=SYNTHETIC_PAGE_SIZE):
+    """금융감독원 API와 같은 형식의 가상 응답 한 페이지"""
+    max_page_no = max(1, -(-products_per_sector // page_size))
+    prefix = 'D' if product_type == 'deposit' else 'S'
+    base_list, option_list = [], []
+    start = (page_no - 1) * page_size
+    for i in range(start, min(start + page_size, products_per_sector)):
+        bank = f'{sector_code[:3]}{i % 10:04d}'
+        code = f'{prefix}{sector_code}{i:05d}'
+        base_list.append({
+            'dcls_month': '202601',
+            'fin_co_no': bank,
+            'kor_co_nm': f'가상은행{i % 10}',
+            'fin_prdt_cd': code,
+            'fin_prdt_nm': f'가상 {"정기예금" if prefix == "D" else "적금"} {i}',
+            'join_way': '인터넷,스마트폰',
+            'mtrt_int': '만기 후 1개월 이내: 기본금리의 50%',
+            'spcl_cnd': '급여이체 시 우대금리 0.2%p',
+            'join_deny': '1',
+            'join_member': '실명의 개인',
+            'etc_note': '가상 상품',
+            'max_limit': None,
+            'dcls_strt_day': '20260101',
+            'dcls_end_day': None,
+            'fin_co_subm_day': '202601011200',
+        })
+        for j, term in enumerate(TERMS):
+            rate = round(2.5 + (i % 7) * 0.1 + j * 0.15, 2)
+            option = {
+                'dcls_month': '202601',
+                'fin_co_no': bank,
+                'fin_prdt_cd': code,
+                'intr_rate_type': 'S' if i % 3 else 'M',
+                'intr_rate_type_nm': '단리' if i % 3 else '복리',
+                'save_trm': term,
+                'intr_rate': rate,
+                'intr_rate2': round(rate + 0.3, 2),
+            }
+            if product_type == 'saving':
+                option.update({'rsrv_type': 'F', 'rsrv_type_nm': '자유적립식'})
+            option_list.append(option)
+
+    return {'result': {
+        'prdt_div': 'D' if prefix == 'D' else 'S',
+        'total_count': products_per_sector,
+        'max_page_no': max_page_no,
+        'now_page_no': page_no,
+        'err_cd': '000',
+        'err_msg': '정상',
+        'baseList': base_list,
+        'optionList': option_list,
+    }}
+
+
+class FinlifeStubServer:
+    """
+    금융감독원 API를 흉내 내는 로컬 HTTP 서버
+
+    fixtures_dir가 있으면 record 모드로 남긴 파일(`<상품유형>/<권역코드>_<페이지>.jsonl.gz`)을 돌려주고,
+    없으면 권역마다 products_per_sector개의 가상 상품을 만들어 응답한다.
+    latency(초)만큼 늦게 응답하고, fail_rate 확률 또는 요청마다 처음 fail_first번은 503을 돌려준다.
+    """
+
+    def __init__(self, fixtures_dir=None, products_per_sector=100, latency=0.0, fail_rate=0.0,
+                 fail_first=0, host='127.0.0.1', port=0, seed=None):
+        self.fixtures_dir = Path(fixtures_dir) if fixtures_dir else None
+        self.products_per_sector = products_per_sector
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.fail_first = fail_first
+        self.random = random.Random(seed)
+        self.requests = []
+        self._attempts = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body = stub.respond(self.path)
+                payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}/finlifeapi/'
+
+    def respond(self, path):
+        """요청 경로에 대한 (상태 코드, JSON 본문)"""
+        url = urlparse(path)
+        params = parse_qs(url.query)
+        endpoint = url.path.rsplit('/', 1)[-1]
+        sector_code = params.get('topFinGrpNo', [''])[0]
+        page_no = int(params.get('pageNo', ['1'])[0] or 1)
+        key = (endpoint, sector_code, page_no)
+
+        with self._lock:
+            self.requests.append(key)
+            attempt = self._attempts.get(key, 0) + 1
+            self._attempts[key] = attempt
+            fail = attempt <= self.fail_first or self.random.random() < self.fail_rate
+
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            return 503, {'error': 'stub failure'}
+        if not params.get('auth', [''])[0]:
+            return 200, {'result': {'err_cd': '010', 'err_msg': '미등록 인증키'}}
+
+        product_types = {name: product_type for product_type, name in PRODUCT_ENDPOINTS.items()}
+        if endpoint not in product_types:
+            return 404, {'error': 'unknown endpoint'}
+
+        if self.fixtures_dir:
+            product_type = product_types[endpoint]
+            if not recording_path(self.fixtures_dir, product_type, sector_code, page_no).exists():
+                return 404, {'error': 'fixture not found'}
+            replay = ReplayFinlifeClient(directory=self.fixtures_dir)
+            try:
+                return 200, {'result': replay.get_page(product_type, sector_code, page_no)}
+            finally:
+                replay.close()
+        return 200, synthetic_page(product_types[endpoint], sector_code, page_no, self.products_per_sector)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='finlife-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,112 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Avg, Count, Max
+from django.utils import timezone
+
+from .models import DailyRateRollup, DepositOption, RateSnapshot, SavingOption
+
+HISTORY_OPTION_MODELS = {
+    'deposit': DepositOption,
+    'saving': SavingOption,
+}
+
+RATE_PRECISION = Decimal('0.01')
+
+
+def _option_rows(product_type, codes):
+    """(상품코드, 금리유형, 적립유형, 기간) -> (기본금리, 우대금리)"""
+    option_model = HISTORY_OPTION_MODELS[product_type]
+    fields = ['product_id', 'intr_rate_type', 'save_trm', 'intr_rate', 'intr_rate2']
+    if product_type == 'saving':
+        fields.append('rsrv_type')
+    rows = {}
+    for row in option_model.objects.filter(product_id__in=codes).values(*fields):
+        key = (row['product_id'], row['intr_rate_type'], row.get('rsrv_type') or '', row['save_trm'])
+        rows[key] = (row['intr_rate'], row['intr_rate2'])
+    return rows
+
+
+def record_snapshots(product_type, codes, captured_on=None):
+    """
+    주어진 상품들의 옵션 금리를 마지막 이력과 비교해 바뀐 옵션만 이력에 추가
+
+    이력이 없는 옵션은 새로 기록한다. 추가한 행 수를 반환.
+    """
+    if not codes:
+        return 0
+    captured_on = captured_on or timezone.localdate()
+
+    latest = {}
+    for code, rate_type, rsrv_type, term, rate, rate2 in RateSnapshot.objects.filter(
+        product_type=product_type, fin_prdt_cd__in=codes
+    ).order_by('captured_on', 'id').values_list(
+        'fin_prdt_cd', 'intr_rate_type', 'rsrv_type', 'save_trm', 'intr_rate', 'intr_rate2'
+    ):
+        latest[(code, rate_type, rsrv_type, term)] = (rate, rate2)
+
+    snapshots = [
+        RateSnapshot(
+            product_type=product_type,
+            fin_prdt_cd=code,
+            intr_rate_type=rate_type,
+            rsrv_type=rsrv_type,
+            save_trm=term,
+            intr_rate=rates[0],
+            intr_rate2=rates[1],
+            captured_on=captured_on,
+        )
+        for (code, rate_type, rsrv_type, term), rates in _option_rows(product_type, codes).items()
+        if latest.get((code, rate_type, rsrv_type, term)) != rates
+    ]
+    RateSnapshot.objects.bulk_create(snapshots, batch_size=1000)
+    return len(snapshots)
+
+
+def _quantize(value):
+    return Decimal(value).quantize(RATE_PRECISION) if value is not None else None
+
+
+def rollup_daily(product_type, date=None):
+    """
+    판매 중인 상품 옵션의 기간별 평균/최고 금리를 집계해 해당 날짜의 값으로 저장
+
+    같은 날 여러 번 갱신하면 마지막 집계로 덮어쓴다. 집계한 기간 수를 반환.
+    """
+    date = date or timezone.localdate()
+    option_model = HISTORY_OPTION_MODELS[product_type]
+    rows = (
+        option_model.objects.exclude(product__dcls_end_day__lte=date.strftime('%Y%m%d'))
+        .values('save_trm')
+        .annotate(
+            avg_base_rate=Avg('intr_rate'),
+            avg_pref_rate=Avg('intr_rate2'),
+            max_pref_rate=Max('intr_rate2'),
+            option_count=Count('id'),
+        )
+        .order_by('save_trm')
+    )
+    rollups = [
+        DailyRateRollup(
+            product_type=product_type,
+            date=date,
+            save_trm=row['save_trm'],
+            avg_base_rate=_quantize(row['avg_base_rate']),
+            avg_pref_rate=_quantize(row['avg_pref_rate']),
+            max_pref_rate=_quantize(row['max_pref_rate']),
+            option_count=row['option_count'],
+        )
+        for row in rows
+    ]
+    with transaction.atomic():
+        # 판매 상품이 사라진 기간의 이전 집계도 지움
+        DailyRateRollup.objects.filter(product_type=product_type, date=date).exclude(
+            save_trm__in=[rollup.save_trm for rollup in rollups]
+        ).delete()
+        DailyRateRollup.objects.bulk_create(
+            rollups,
+            update_conflicts=True,
+            unique_fields=['product_type', 'save_trm', 'date'],
+            update_fields=['avg_base_rate', 'avg_pref_rate', 'max_pref_rate', 'option_count'],
+        )
+    return len(rollups)
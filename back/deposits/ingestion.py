@@ -0,0 +1,439 @@
+import hashlib
+import json
+import time
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    Bank, DepositProduct, DepositOption, DepositTermRate, SavingProduct, SavingOption, SavingTermRate,
+)
+from .search import index_products
+
+# 권역코드 정의
+SECTOR_CODES = {
+    '020000': '은행',
+    '030200': '여신전문',
+    '030300': '저축은행',
+    '050000': '보험',
+    '060000': '금융투자'
+}
+
+
+def fetch_products(product_type, sector_codes, client):
+    """
+    여러 권역의 모든 페이지를 병렬로 조회
+
+    첫 페이지 응답의 max_page_no를 읽어 나머지 페이지를 같은 스레드 풀에 바로 등록하므로,
+    전체 소요 시간은 가장 느린 권역 하나의 소요 시간에 가깝다.
+
+    반환값: {권역코드: {'base_list', 'option_list', 'pages', 'elapsed'}}
+    """
+    sector_codes = list(sector_codes)
+
+    results = {
+        code: {'base_list': [], 'option_list': [], 'pages': 0, 'elapsed': 0.0}
+        for code in sector_codes
+    }
+    started = {}
+    remaining = {}
+
+    # 동시 요청 수는 클라이언트가 제한하므로 스레드도 그만큼만 둔다
+    with ThreadPoolExecutor(max_workers=client.max_concurrency) as executor:
+        pending = {}
+        for code in sector_codes:
+            started[code] = time.perf_counter()
+            future = executor.submit(client.get_page, product_type, code, 1)
+            pending[future] = (code, 1)
+
+        while pending:
+            # 완료된 요청부터 처리하고, 첫 페이지면 나머지 페이지를 등록
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                code, page_no = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception:
+                    # 하나라도 실패하면 아직 시작하지 않은 요청은 취소
+                    for other in pending:
+                        other.cancel()
+                    raise
+
+                sector = results[code]
+                sector['base_list'].extend(result.get('baseList', []))
+                sector['option_list'].extend(result.get('optionList', []))
+                sector['pages'] += 1
+
+                if page_no == 1:
+                    max_page_no = int(result.get('max_page_no') or 1)
+                    remaining[code] = max_page_no - 1
+                    for next_page in range(2, max_page_no + 1):
+                        next_future = executor.submit(client.get_page, product_type, code, next_page)
+                        pending[next_future] = (code, next_page)
+                else:
+                    remaining[code] -= 1
+
+                if remaining[code] == 0:
+                    sector['elapsed'] = round(time.perf_counter() - started[code], 3)
+
+    return results
+
+
+def stream_products(product_type, sector_codes, client, timings=None):
+    """
+    권역마다 페이지를 차례로 조회해 (권역코드, baseList, optionList)를 한 페이지씩 돌려줌
+
+    fetch_products와 달리 결과를 모아 두지 않으므로, 녹화 파일 재생처럼 읽기가 빠른 원본을
+    write_product_pages로 바로 흘려 보내면 한 번에 한 페이지만 메모리에 둔다.
+    timings를 넘기면 권역별 페이지 수와 소요 시간(저장 시간 포함)을 채운다.
+    """
+    timings = {} if timings is None else timings
+    for code in sector_codes:
+        timing = timings.setdefault(code, {'pages': 0, 'elapsed': 0.0})
+        started = time.perf_counter()
+        page_no = max_page_no = 1
+        while page_no <= max_page_no:
+            result = client.get_page(product_type, code, page_no)
+            if page_no == 1:
+                max_page_no = int(result.get('max_page_no') or 1)
+            timing['pages'] += 1
+            yield code, result.get('baseList', []), result.get('optionList', [])
+            page_no += 1
+        timing['elapsed'] = round(time.perf_counter() - started, 3)
+
+
+# 상품 유형별 저장 대상 모델과 옵션 필드
+CATALOG_SPECS = {
+    'deposit': {
+        'product_model': DepositProduct,
+        'option_model': DepositOption,
+        'option_fields': ['intr_rate_type', 'intr_rate_type_nm', 'save_trm', 'intr_rate', 'intr_rate2'],
+        'option_key': ['intr_rate_type', 'save_trm'],
+        'term_rate_model': DepositTermRate,
+    },
+    'saving': {
+        'product_model': SavingProduct,
+        'option_model': SavingOption,
+        'option_fields': [
+            'intr_rate_type', 'intr_rate_type_nm', 'rsrv_type', 'rsrv_type_nm',
+            'save_trm', 'intr_rate', 'intr_rate2',
+        ],
+        'option_key': ['intr_rate_type', 'rsrv_type', 'save_trm'],
+        'term_rate_model': SavingTermRate,
+    },
+}
+
+# 상품 기본 정보 중 그대로 복사하는 필드
+PRODUCT_TEXT_FIELDS = [
+    'fin_prdt_nm', 'join_way', 'mtrt_int', 'spcl_cnd', 'join_member',
+    'join_deny', 'etc_note', 'dcls_strt_day', 'dcls_end_day', 'fin_co_subm_day',
+]
+
+# 변경 감지 해시에 포함하는 상품 필드
+PRODUCT_HASH_FIELDS = ['fin_co_no', 'kor_co_nm', 'max_limit'] + PRODUCT_TEXT_FIELDS
+
+
+def group_options(option_list):
+    """옵션 목록을 한 번만 순회해 상품코드별로 묶기"""
+    grouped = defaultdict(list)
+    for option in option_list:
+        grouped[option.get('fin_prdt_cd')].append(option)
+    return grouped
+
+
+def _normalize(value):
+    """해시 계산을 위해 API 값을 문자열로 정규화"""
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def parse_rate(value):
+    """API 금리 값을 소수 둘째 자리 Decimal로 변환 (값이 없으면 None)"""
+    if value is None or str(value).strip() == '':
+        return None
+    try:
+        return Decimal(str(value).strip()).quantize(Decimal('0.01'))
+    except InvalidOperation:
+        return None
+
+
+def parse_term(value):
+    """API 저축기간 값을 개월 수 정수로 변환"""
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _max_rate(current, value):
+    if value is None:
+        return current
+    return value if current is None or value > current else current
+
+
+def compute_payload_hash(item, product_options, spec):
+    """
+    상품 기본 정보와 옵션을 정규화해 계산한 안정적인 해시
+
+    옵션 순서나 API가 덧붙이는 조회용 필드가 바뀌어도 같은 값을 돌려주도록
+    저장하는 필드만 골라 키 순서로 직렬화한다.
+    """
+    base = {field: _normalize(item.get(field)) for field in PRODUCT_HASH_FIELDS}
+    options = sorted(
+        [_normalize(option.get(field)) for field in spec['option_fields']]
+        for option in product_options
+    )
+    payload = json.dumps([base, options], ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _stage(product_type, pages):
+    """(권역코드, baseList, optionList) 묶음을 은행/상품/옵션 모델 인스턴스로 변환 (중복은 메모리에서 제거)"""
+    spec = CATALOG_SPECS[product_type]
+    product_model = spec['product_model']
+    option_model = spec['option_model']
+    term_rate_model = spec['term_rate_model']
+
+    banks = {}
+    products = {}
+    options = {}
+    term_rate_rows = {}
+
+    for sector_code, base_list, option_list in pages:
+        options_by_product = group_options(option_list)
+
+        for item in base_list:
+            fin_co_no = item.get('fin_co_no', '')
+            fin_prdt_cd = item.get('fin_prdt_cd', '')
+
+            banks[fin_co_no] = Bank(
+                fin_co_no=fin_co_no,
+                kor_co_nm=item.get('kor_co_nm', ''),
+                sector_code=sector_code,
+                sector_name=SECTOR_CODES.get(sector_code, ''),
+            )
+
+            product_options = options_by_product.get(fin_prdt_cd, [])
+            product = product_model(
+                fin_prdt_cd=fin_prdt_cd,
+                bank_id=fin_co_no,
+                max_limit=int(item['max_limit']) if item.get('max_limit') else None,
+                sector_code=sector_code,
+                payload_hash=compute_payload_hash(item, product_options, spec),
+                **{field: item.get(field, '') for field in PRODUCT_TEXT_FIELDS},
+            )
+            products[fin_prdt_cd] = product
+
+            product_option_rows = {}
+            term_rates = {}
+            for option in product_options:
+                save_trm = parse_term(option.get('save_trm'))
+                if save_trm is None:
+                    continue
+                values = {field: option.get(field) or '' for field in spec['option_fields']}
+                values['save_trm'] = save_trm
+                values['intr_rate'] = parse_rate(option.get('intr_rate'))
+                values['intr_rate2'] = parse_rate(option.get('intr_rate2'))
+                key = tuple(values[field] for field in spec['option_key'])
+                product_option_rows[key] = option_model(product_id=fin_prdt_cd, **values)
+
+                # 가입기간별/상품별 최고 금리를 미리 계산
+                base_rate, pref_rate = term_rates.get(save_trm, (None, None))
+                term_rates[save_trm] = (
+                    _max_rate(base_rate, values['intr_rate']),
+                    _max_rate(pref_rate, values['intr_rate2']),
+                )
+                product.best_base_rate = _max_rate(product.best_base_rate, values['intr_rate'])
+                product.best_pref_rate = _max_rate(product.best_pref_rate, values['intr_rate2'])
+
+            options[fin_prdt_cd] = product_option_rows
+            term_rate_rows[fin_prdt_cd] = [
+                term_rate_model(
+                    product_id=fin_prdt_cd, save_trm=save_trm,
+                    best_base_rate=base_rate, best_pref_rate=pref_rate,
+                )
+                for save_trm, (base_rate, pref_rate) in term_rates.items()
+            ]
+
+    return banks, products, options, term_rate_rows
+
+
+def _is_closed(dcls_end_day, today):
+    """공시 종료일이 오늘 이전이면 판매 종료"""
+    return bool(dcls_end_day) and dcls_end_day <= today
+
+
+def _changed_banks(banks):
+    """DB 값과 다른 은행만 골라내기"""
+    existing = {
+        bank.fin_co_no: (bank.kor_co_nm, bank.sector_code, bank.sector_name)
+        for bank in Bank.objects.filter(fin_co_no__in=banks.keys())
+    }
+    return [
+        bank for code, bank in banks.items()
+        if existing.get(code) != (bank.kor_co_nm, bank.sector_code, bank.sector_name)
+    ]
+
+
+def write_products(product_type, sector_results):
+    """fetch_products 결과를 권역별 묶음으로 write_product_pages에 넘겨 저장"""
+    return write_product_pages(
+        product_type,
+        sector_results.keys(),
+        ((code, result['base_list'], result['option_list']) for code, result in sector_results.items()),
+    )
+
+
+def write_product_pages(product_type, sector_codes, pages):
+    """
+    조회 결과를 DB와 비교해 바뀐 상품만 하나의 트랜잭션에서 일괄 저장
+
+    pages는 (권역코드, baseList, optionList) 묶음을 차례로 돌려주는 iterable로, 묶음마다
+    해시를 비교해 바로 저장하므로 메모리에는 한 묶음과 이번에 본 상품코드만 남는다.
+    상품마다 정규화한 원본의 해시를 저장해 두고, 해시가 같은 상품은 건드리지 않는다.
+    신규/변경 상품과 그 옵션만 bulk_create(update_conflicts=True)로 쓰고,
+    조회한 권역에서 사라진 상품은 공시 종료일을 채워 판매 종료로 표시한다.
+
+    반환값: 건수 요약과 상품코드 목록을 담은 변경 내역
+    """
+    spec = CATALOG_SPECS[product_type]
+    product_model = spec['product_model']
+    sector_codes = list(sector_codes)
+
+    today = timezone.localdate().strftime('%Y%m%d')
+    # 이번에 본 상품코드와 저장한 해시 (사라진 상품 판별과 중복 상품 처리에 사용)
+    seen = {}
+    inserted, updated, withdrawn = [], [], []
+    bank_codes = set()
+    option_count = 0
+
+    with transaction.atomic():
+        for page in pages:
+            banks, products, options, term_rate_rows = _stage(product_type, [page])
+
+            # 이번 묶음에 포함된 기존 상품의 해시를 한 번에 조회
+            existing = {
+                code: (payload_hash, dcls_end_day)
+                for code, payload_hash, dcls_end_day in product_model.objects.filter(
+                    fin_prdt_cd__in=[code for code in products if code not in seen]
+                ).values_list('fin_prdt_cd', 'payload_hash', 'dcls_end_day')
+            }
+
+            changed_codes = []
+            for code, product in products.items():
+                if code in seen:
+                    # 앞 묶음에 나온 상품이 다시 나오면 내용이 다를 때만 덮어씀 (분류는 처음 것을 따름)
+                    if seen[code] != product.payload_hash:
+                        changed_codes.append(code)
+                    continue
+                previous = existing.get(code)
+                if previous is None:
+                    inserted.append(code)
+                elif previous[0] != product.payload_hash:
+                    # 판매 중이던 상품의 공시 종료일이 오늘 이전으로 바뀌었으면 판매 종료로 분류
+                    # (앞으로의 종료일이 새로 공시된 것은 아직 판매 중이므로 변경)
+                    if _is_closed(product.dcls_end_day, today) and not _is_closed(previous[1], today):
+                        withdrawn.append(code)
+                    else:
+                        updated.append(code)
+                else:
+                    continue
+                changed_codes.append(code)
+            seen.update((code, product.payload_hash) for code, product in products.items())
+
+            changed_banks = _changed_banks(banks)
+            bank_codes.update(bank.fin_co_no for bank in changed_banks)
+            option_count += _write_changes(
+                product_type, changed_banks, products, options, term_rate_rows, changed_codes
+            )
+
+        # 원본에서 사라졌지만 아직 판매 중으로 남아 있는 상품
+        missing = [
+            code for code, dcls_end_day in product_model.objects.filter(
+                sector_code__in=sector_codes
+            ).values_list('fin_prdt_cd', 'dcls_end_day')
+            if code not in seen and not _is_closed(dcls_end_day, today)
+        ]
+        if missing:
+            # 해시를 비워 두어 다시 공시되면 변경으로 감지되게 한다
+            product_model.objects.filter(fin_prdt_cd__in=missing).update(
+                dcls_end_day=today,
+                payload_hash='',
+            )
+
+    changed = len(inserted) + len(updated) + len(withdrawn)
+    return {
+        'inserted': len(inserted),
+        'updated': len(updated),
+        'withdrawn': len(withdrawn) + len(missing),
+        'unchanged': len(seen) - changed,
+        'products': len(seen),
+        'banks': len(bank_codes),
+        'options': option_count,
+        'changes': {
+            'inserted': inserted,
+            'updated': updated,
+            'withdrawn': withdrawn + missing,
+        },
+    }
+
+
+def _write_changes(product_type, changed_banks, products, options, term_rate_rows, changed_codes):
+    """한 묶음에서 바뀐 은행/상품/옵션/기간별 금리/검색 색인을 저장하고 쓴 옵션 수를 반환"""
+    spec = CATALOG_SPECS[product_type]
+    product_model = spec['product_model']
+    option_model = spec['option_model']
+
+    if changed_banks:
+        Bank.objects.bulk_create(
+            changed_banks,
+            update_conflicts=True,
+            unique_fields=['fin_co_no'],
+            update_fields=['kor_co_nm', 'sector_code', 'sector_name'],
+        )
+    if not changed_codes:
+        return 0
+
+    product_model.objects.bulk_create(
+        [products[code] for code in changed_codes],
+        update_conflicts=True,
+        unique_fields=['fin_prdt_cd'],
+        update_fields=[
+            'bank', 'max_limit', 'sector_code', 'payload_hash',
+            'best_base_rate', 'best_pref_rate',
+        ] + PRODUCT_TEXT_FIELDS,
+    )
+
+    # 변경된 상품에서 이번 조회에 없는 옵션 행 삭제
+    stale_ids = [
+        row[0]
+        for row in option_model.objects.filter(product_id__in=changed_codes).values_list(
+            'id', 'product_id', *spec['option_key']
+        )
+        if tuple(row[2:]) not in options[row[1]]
+    ]
+    if stale_ids:
+        option_model.objects.filter(id__in=stale_ids).delete()
+
+    changed_options = [row for code in changed_codes for row in options[code].values()]
+    option_model.objects.bulk_create(
+        changed_options,
+        update_conflicts=True,
+        unique_fields=['product'] + spec['option_key'],
+        update_fields=[field for field in spec['option_fields'] if field not in spec['option_key']],
+    )
+
+    # 가입기간별 최고 금리는 변경된 상품만 다시 만든다
+    term_rate_model = spec['term_rate_model']
+    term_rate_model.objects.filter(product_id__in=changed_codes).delete()
+    term_rate_model.objects.bulk_create(
+        [row for code in changed_codes for row in term_rate_rows[code]]
+    )
+
+    # 검색 색인도 변경된 상품만 다시 만든다
+    index_products(product_type, [products[code] for code in changed_codes])
+    return len(changed_options)
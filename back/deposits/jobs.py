@@ -0,0 +1,209 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, close_old_connections, connection, transaction
+from django.utils import timezone
+
+from .catalog_cache import create_version, warm_version
+from .finlife import get_client
+from .history import record_snapshots, rollup_daily
+from .rate_matrix import rebuild_rate_matrices
+from .watches import evaluate_watches
+from .ingestion import SECTOR_CODES, fetch_products, stream_products, write_product_pages
+from .models import CatalogRefreshJob
+
+logger = logging.getLogger(__name__)
+
+# 실행 중인 작업이 살아 있음을 알리는 주기(초)
+JOB_HEARTBEAT_INTERVAL = 30
+
+# 이 시간 동안 heartbeat가 없는 실행 중 작업은 프로세스가 중단된 것으로 보고 잠금을 해제
+JOB_LOCK_TIMEOUT = timedelta(minutes=5)
+
+_worker_lock = threading.Lock()
+_worker = None
+_wakeup = False
+
+
+def refresh_catalog(product_type, sector_code=None, mode=None, summary=None):
+    """
+    금융감독원 API에서 상품을 조회해 저장하고 상품 유형별 요약을 반환
+
+    mode가 record면 응답을 파일로 남기고, replay면 API 대신 남긴 파일로 같은 저장 과정을 거친다.
+    summary를 넘기면 상품 유형 하나를 끝낼 때마다 채우므로, 중간에 실패해도 앞서 끝난 요약이 남는다.
+    """
+    product_types = ['deposit', 'saving'] if product_type == 'all' else [product_type]
+    sectors_to_query = [sector_code] if sector_code else SECTOR_CODES.keys()
+
+    summary = {} if summary is None else summary
+    mode = mode or settings.FINLIFE_MODE
+    for current_type in product_types:
+        with get_client(getattr(settings, 'FINLIFE_API_KEY', None), mode) as client:
+            if mode == 'replay':
+                # 녹화 파일은 한 페이지씩 읽으면서 저장 (전체 목록을 메모리에 모으지 않음)
+                timings = {}
+                pages = stream_products(current_type, sectors_to_query, client, timings)
+            else:
+                sector_results = fetch_products(current_type, sectors_to_query, client)
+                timings = {
+                    code: {'pages': result['pages'], 'elapsed': result['elapsed']}
+                    for code, result in sector_results.items()
+                }
+                pages = (
+                    (code, result['base_list'], result['option_list'])
+                    for code, result in sector_results.items()
+                )
+            # 상품 변경, 금리 이력과 카탈로그 버전은 한 트랜잭션으로 저장
+            # (뒤의 파생 단계가 실패해도 변경 내역이 버전 없이 커밋되지 않게 함)
+            with transaction.atomic():
+                written = write_product_pages(current_type, sectors_to_query, pages)
+                changes = written.pop('changes')
+                # 금리 이력은 새로 들어오거나 바뀐 상품만 비교해 기록
+                written['snapshots'] = record_snapshots(current_type, changes['inserted'] + changes['updated'])
+                version = create_version(current_type, written, changes)
+        written['version'] = version.pk if version else None
+        summary[current_type] = written
+
+        # 커밋한 뒤에 목록 캐시를 미리 채우고 파생 데이터를 다시 만듦
+        if version is not None:
+            warm_version(current_type, version)
+        # 시장 평균은 매번 집계
+        rollup_daily(current_type)
+        # 금융회사 x 기간 금리표도 권역별로 다시 만듦
+        rebuild_rate_matrices(current_type)
+        # 바뀐 상품만 금리 알림 조건과 대조해 알림을 일괄 저장
+        written['notifications'] = evaluate_watches(current_type, changes, written['version'] or 0)
+        written['timings'] = timings
+        written['api_calls'] = client.stats()
+    return summary
+
+
+def _release_stale_locks():
+    """heartbeat가 끊긴 실행 중 작업을 실패로 정리 (오래 걸려도 살아 있는 작업은 그대로 둠)"""
+    CatalogRefreshJob.objects.filter(
+        status='running',
+        heartbeat_at__lt=timezone.now() - JOB_LOCK_TIMEOUT,
+    ).update(status='failed', finished_at=timezone.now(), error='작업 응답이 끊겨 중단된 것으로 처리했습니다.')
+
+
+def _heartbeat(job_id, stopped):
+    """작업이 끝날 때까지 heartbeat_at을 주기적으로 갱신 (작업과 다른 스레드에서 실행)"""
+    try:
+        while not stopped.wait(JOB_HEARTBEAT_INTERVAL):
+            try:
+                CatalogRefreshJob.objects.filter(pk=job_id, status='running').update(heartbeat_at=timezone.now())
+            except DatabaseError:
+                # 갱신 트랜잭션이 쓰기 잠금을 잡고 있으면 다음 주기에 다시 시도
+                logger.warning('상품 갱신 작업 #%s heartbeat 저장 실패', job_id, exc_info=True)
+    finally:
+        connection.close()
+
+
+def run_job(job_id):
+    """
+    대기 중인 작업 하나를 실행
+
+    실행 중 상태는 부분 유니크 제약으로 하나만 허용되므로, 다른 작업이 실행 중이면
+    상태를 바꾸지 못하고 False를 반환한다.
+    """
+    _release_stale_locks()
+
+    try:
+        with transaction.atomic():
+            now = timezone.now()
+            claimed = CatalogRefreshJob.objects.filter(pk=job_id, status='queued').update(
+                status='running', started_at=now, heartbeat_at=now
+            )
+    except IntegrityError:
+        return False
+    if not claimed:
+        return False
+
+    job = CatalogRefreshJob.objects.get(pk=job_id)
+    job.result = {}
+    started = time.perf_counter()
+    stopped = threading.Event()
+    threading.Thread(
+        target=_heartbeat, args=(job.pk, stopped), name=f'catalog-refresh-heartbeat-{job.pk}', daemon=True
+    ).start()
+    try:
+        # 실패해도 먼저 끝난 상품 유형의 요약은 job.result에 남음
+        refresh_catalog(job.product_type, job.sector_code, job.mode, summary=job.result)
+        job.status = 'succeeded'
+    except Exception as e:
+        logger.exception('상품 갱신 작업 #%s 실패', job.pk)
+        job.status = 'failed'
+        job.error = str(e)
+    finally:
+        stopped.set()
+    job.finished_at = timezone.now()
+    job.duration = round(time.perf_counter() - started, 3)
+    job.save(update_fields=['result', 'status', 'error', 'finished_at', 'duration'])
+    return True
+
+
+def run_pending_jobs():
+    """대기 중인 작업을 오래된 순서로 모두 실행하고 실행한 개수를 반환"""
+    count = 0
+    while True:
+        job = CatalogRefreshJob.objects.filter(status='queued').order_by('created_at').first()
+        if job is None or not run_job(job.pk):
+            return count
+        count += 1
+
+
+def _drain_queue():
+    global _worker, _wakeup
+    close_old_connections()
+    try:
+        while True:
+            run_pending_jobs()
+            # 처리하는 동안 새 작업이 등록됐으면 한 번 더 확인
+            with _worker_lock:
+                if not _wakeup:
+                    _worker = None
+                    return
+                _wakeup = False
+    finally:
+        # 예외로 종료된 경우에도 다음 등록 때 새 스레드를 띄울 수 있게 정리
+        with _worker_lock:
+            if _worker is threading.current_thread():
+                _worker = None
+        connection.close()
+
+
+def _start_worker():
+    """프로세스 안의 백그라운드 스레드로 대기 작업 처리"""
+    global _worker, _wakeup
+    with _worker_lock:
+        _wakeup = True
+        if _worker is None:
+            _wakeup = False
+            _worker = threading.Thread(target=_drain_queue, name='catalog-refresh', daemon=True)
+            _worker.start()
+
+
+def enqueue_refresh(product_type, sector_code=None, trigger='api', run_in_background=True, mode=None):
+    """
+    갱신 작업을 등록하고 작업 객체를 반환
+
+    같은 대상의 작업이 이미 대기 중이면 새로 만들지 않고 그 작업을 돌려준다.
+    CATALOG_REFRESH_IN_PROCESS가 꺼져 있으면 refresh_catalog 명령의 워커가 처리한다.
+    run_in_background=False면 호출한 쪽에서 run_job()으로 직접 실행한다.
+    mode를 생략하면 설정의 FINLIFE_MODE를 따른다.
+    """
+    mode = mode or settings.FINLIFE_MODE
+    job = CatalogRefreshJob.objects.filter(
+        status='queued', product_type=product_type, sector_code=sector_code, mode=mode
+    ).first()
+    if job is None:
+        job = CatalogRefreshJob.objects.create(
+            product_type=product_type, sector_code=sector_code, trigger=trigger, mode=mode
+        )
+
+    if run_in_background and getattr(settings, 'CATALOG_REFRESH_IN_PROCESS', True):
+        transaction.on_commit(_start_worker)
+    return job
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from deposits.finlife import FinlifeClient, FinlifeError
+from deposits.finlife_stub import FinlifeStubServer
+from deposits.ingestion import SECTOR_CODES, fetch_products
+
+
+class Command(BaseCommand):
+    help = '로컬 스텁 서버를 상대로 상품 조회 처리량과 재시도 동작을 측정합니다 (DB에 저장하지 않음)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=500, help='권역별 가상 상품 수 (기본값: 500)')
+        parser.add_argument('--latency', type=float, default=0.05, help='응답 지연(초, 기본값: 0.05)')
+        parser.add_argument('--fail-rate', type=float, default=0.0, help='503을 돌려줄 확률 (0~1)')
+        parser.add_argument('--concurrency', type=int, default=8, help='동시 요청 수 (기본값: 8)')
+        parser.add_argument('--fixtures', default=None, help='record 모드로 남긴 응답 디렉터리')
+
+    def handle(self, *args, **options):
+        with FinlifeStubServer(
+            fixtures_dir=options['fixtures'],
+            products_per_sector=options['products'],
+            latency=options['latency'],
+            fail_rate=options['fail_rate'],
+            seed=0,
+        ) as server:
+            for product_type in ('deposit', 'saving'):
+                client = FinlifeClient(
+                    'stub', base_url=server.base_url,
+                    max_concurrency=options['concurrency'], backoff_base=0.05,
+                )
+                started = time.perf_counter()
+                try:
+                    results = fetch_products(product_type, SECTOR_CODES.keys(), client)
+                except FinlifeError as e:
+                    self.stdout.write(self.style.ERROR(f'{product_type}: {e}'))
+                    continue
+                finally:
+                    client.close()
+                elapsed = time.perf_counter() - started
+
+                products = sum(len(result['base_list']) for result in results.values())
+                stats = client.stats()
+                self.stdout.write(
+                    f"{product_type}: 상품 {products}개, 요청 {stats['calls']}건 "
+                    f"(재시도 {stats['retries']}건), {elapsed:.2f}초, "
+                    f"{products / elapsed:.0f}개/초, p50 {stats['p50'] * 1000:.0f}ms, "
+                    f"p95 {stats['p95'] * 1000:.0f}ms"
+                )
@@ -0,0 +1,46 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from deposits.calculator import simulate_installments
+
+
+class Command(BaseCommand):
+    help = '가상의 적금 옵션으로 적금 시뮬레이션 계산 시간을 측정합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--options', type=int, default=10000, help='옵션 수 (기본값: 10000)')
+        parser.add_argument('--scenarios', type=int, default=50, help='시나리오 수 (기본값: 50)')
+        parser.add_argument('--repeat', type=int, default=20, help='반복 횟수 (기본값: 20)')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        size = options['options']
+        terms = np.array([6, 12, 24, 36], dtype=np.int16)
+
+        # 상품 하나에 옵션 4개(기간별)씩 있는 카탈로그를 가정
+        arrays = {
+            'product': np.repeat(np.arange((size + 3) // 4, dtype=np.int32), 4)[:size],
+            'compound': rng.random(size) < 0.3,
+            'term': np.tile(terms, (size + 3) // 4)[:size],
+            'base_rate': rng.uniform(1.5, 5.0, size).round(2),
+        }
+        arrays['pref_rate'] = arrays['base_rate'] + rng.uniform(0, 3.0, size).round(2)
+
+        amounts = rng.integers(10, 100, options['scenarios']) * 10000
+        scenario_terms = rng.choice(terms, options['scenarios'])
+
+        simulate_installments(arrays, amounts, scenario_terms)
+        elapsed = []
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            simulate_installments(arrays, amounts, scenario_terms)
+            elapsed.append(time.perf_counter() - started)
+
+        elapsed = np.array(elapsed) * 1000
+        self.stdout.write(
+            f"옵션 {size}개 x 시나리오 {options['scenarios']}개: "
+            f"중앙값 {np.median(elapsed):.2f}ms, 최소 {elapsed.min():.2f}ms, 최대 {elapsed.max():.2f}ms"
+        )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from deposits.finlife_stub import FinlifeStubServer
+
+
+class Command(BaseCommand):
+    help = '금융감독원 API를 흉내 내는 로컬 스텁 서버를 실행합니다 (FINLIFE_BASE_URL을 이 주소로 지정)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=8765, help='포트 (기본값: 8765)')
+        parser.add_argument('--fixtures', default=None, help='record 모드로 남긴 응답 디렉터리 (없으면 가상 상품)')
+        parser.add_argument('--products', type=int, default=100, help='권역별 가상 상품 수 (기본값: 100)')
+        parser.add_argument('--latency', type=float, default=0.0, help='응답 지연(초)')
+        parser.add_argument('--fail-rate', type=float, default=0.0, help='503을 돌려줄 확률 (0~1)')
+
+    def handle(self, *args, **options):
+        server = FinlifeStubServer(
+            fixtures_dir=options['fixtures'],
+            products_per_sector=options['products'],
+            latency=options['latency'],
+            fail_rate=options['fail_rate'],
+            port=options['port'],
+        )
+        self.stdout.write(f'스텁 서버 실행 중: {server.base_url}')
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.httpd.server_close()
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from deposits.search import SEARCH_MODELS, rebuild_index
+
+
+class Command(BaseCommand):
+    help = '정기예금/적금 상품 검색 색인을 전체 다시 만듭니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type', dest='product_type', default='all',
+            choices=['all', *SEARCH_MODELS],
+            help='색인할 상품 유형 (기본값: all)',
+        )
+
+    def handle(self, *args, **options):
+        product_types = SEARCH_MODELS if options['product_type'] == 'all' else [options['product_type']]
+        for product_type in product_types:
+            count = rebuild_index(product_type)
+            self.stdout.write(self.style.SUCCESS(f'{product_type}: 상품 {count}개 색인 완료'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from deposits.subscriptions import SUBSCRIPTION_MODELS, reconcile_subscriber_counts
+
+
+class Command(BaseCommand):
+    help = '가입 내역을 집계해 정기예금/적금 상품의 가입자 수를 바로잡습니다 (주기적으로 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type', dest='product_type', default='all',
+            choices=['all', *SUBSCRIPTION_MODELS],
+            help='확인할 상품 유형 (기본값: all)',
+        )
+
+    def handle(self, *args, **options):
+        product_types = SUBSCRIPTION_MODELS if options['product_type'] == 'all' else [options['product_type']]
+        for product_type in product_types:
+            fixed = reconcile_subscriber_counts(product_type)
+            self.stdout.write(self.style.SUCCESS(f'{product_type}: 가입자 수 {fixed}개 상품 수정'))
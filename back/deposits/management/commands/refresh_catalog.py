@@ -0,0 +1,78 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from deposits.finlife import FINLIFE_MODES
+from deposits.ingestion import SECTOR_CODES
+from deposits.jobs import enqueue_refresh, run_job, run_pending_jobs
+from deposits.models import CatalogRefreshJob
+
+
+class Command(BaseCommand):
+    help = '금융감독원 API에서 정기예금/적금 상품 정보를 갱신합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type', dest='product_type', default='all',
+            choices=['all', 'deposit', 'saving'],
+            help='갱신할 상품 유형 (기본값: all)',
+        )
+        parser.add_argument(
+            '--sector', dest='sector_code', default=None,
+            choices=list(SECTOR_CODES.keys()),
+            help='갱신할 권역코드 (기본값: 전체 권역)',
+        )
+        parser.add_argument(
+            '--mode', default=None, choices=FINLIFE_MODES,
+            help='수집 모드: live(API 호출), record(응답 저장), replay(저장한 응답 사용) (기본값: FINLIFE_MODE 설정)',
+        )
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='지정한 분 간격으로 계속 갱신 (0이면 한 번만 실행)',
+        )
+        parser.add_argument(
+            '--worker', action='store_true',
+            help='웹 요청으로 등록된 대기 작업을 계속 처리',
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval'] * 60
+        next_run = time.monotonic()
+
+        while True:
+            if not options['worker'] or (interval and time.monotonic() >= next_run):
+                job = enqueue_refresh(
+                    options['product_type'], options['sector_code'],
+                    trigger='schedule' if interval else 'command', run_in_background=False,
+                    mode=options['mode'],
+                )
+                self.run(job)
+                next_run = time.monotonic() + interval
+
+            if options['worker']:
+                processed = run_pending_jobs()
+                if processed:
+                    self.stdout.write(f'대기 작업 {processed}개를 처리했습니다.')
+                time.sleep(5)
+            elif interval:
+                time.sleep(max(next_run - time.monotonic(), 0))
+            else:
+                return
+
+    def run(self, job):
+        if not run_job(job.pk):
+            self.stdout.write(self.style.WARNING(
+                f'작업 #{job.pk}: 다른 갱신 작업이 실행 중이어서 대기열에 남겨 둡니다.'
+            ))
+            return
+
+        job = CatalogRefreshJob.objects.get(pk=job.pk)
+        if job.status == 'succeeded':
+            for product_type, summary in job.result.items():
+                self.stdout.write(
+                    f"[{product_type}] 신규 {summary['inserted']} / 변경 {summary['updated']} / "
+                    f"판매종료 {summary['withdrawn']} / 변경없음 {summary['unchanged']}"
+                )
+            self.stdout.write(self.style.SUCCESS(f'작업 #{job.pk} 완료 ({job.duration}초)'))
+        else:
+            self.stdout.write(self.style.ERROR(f'작업 #{job.pk} 실패: {job.error}'))
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deposits", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="savingoption",
+            name="rsrv_type",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddField(
+            model_name="savingoption",
+            name="rsrv_type_nm",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AlterUniqueTogether(
+            name="depositoption",
+            unique_together={("product", "intr_rate_type", "save_trm")},
+        ),
+        migrations.AlterUniqueTogether(
+            name="savingoption",
+            unique_together={("product", "intr_rate_type", "rsrv_type", "save_trm")},
+        ),
+    ]
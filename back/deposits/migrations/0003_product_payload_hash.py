@@ -0,0 +1,23 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deposits", "0002_option_unique_keys"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="depositproduct",
+            name="payload_hash",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="savingproduct",
+            name="payload_hash",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deposits", "0003_product_payload_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogRefreshJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "product_type",
+                    models.CharField(
+                        choices=[
+                            ("all", "전체"),
+                            ("deposit", "정기예금"),
+                            ("saving", "정기적금"),
+                        ],
+                        default="all",
+                        max_length=10,
+                    ),
+                ),
+                ("sector_code", models.TextField(blank=True, null=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "대기"),
+                            ("running", "실행 중"),
+                            ("succeeded", "완료"),
+                            ("failed", "실패"),
+                        ],
+                        default="queued",
+                        max_length=10,
+                    ),
+                ),
+                ("trigger", models.CharField(default="api", max_length=20)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("duration", models.FloatField(blank=True, null=True)),
+                ("result", models.JSONField(blank=True, default=dict)),
+                ("error", models.TextField(blank=True, default="")),
+            ],
+            options={
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="catalogrefreshjob",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("status", "running")),
+                fields=("status",),
+                name="single_running_catalog_refresh",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:05
+
+from django.db import migrations
+
+
+def clear_blank_rates(apps, schema_editor):
+    """숫자 컬럼으로 바꾸기 전에 빈 문자열 금리를 NULL로 정리"""
+    for model_name in ("DepositOption", "SavingOption"):
+        model = apps.get_model("deposits", model_name)
+        model.objects.filter(intr_rate="").update(intr_rate=None)
+        model.objects.filter(intr_rate2="").update(intr_rate2=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deposits", "0004_catalogrefreshjob"),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_blank_rates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,360 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:05
+
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+RATE_PRECISION = Decimal("0.01")
+
+
+def _rate(value):
+    try:
+        return Decimal(str(value)).quantize(RATE_PRECISION)
+    except (InvalidOperation, TypeError, ValueError):
+        return None
+
+
+def _term(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _max_rate(current, value):
+    if value is None:
+        return current
+    return value if current is None or value > current else current
+
+
+def copy_json_options(apps):
+    """
+    상품의 options JSON을 정규화해 옵션 테이블로 옮기고 유형별로 옮긴 상품코드를 반환
+
+    옵션 행이 이미 있는 상품은 건너뛰고, 기간이 없는 옵션은 버린다.
+    금리 문자열은 소수 둘째 자리 Decimal로, 빈 값은 NULL로 바꾼다.
+    """
+    backfilled = {}
+    for product_name, option_name, extra_fields in (
+        ("DepositProduct", "DepositOption", ()),
+        ("SavingProduct", "SavingOption", ("rsrv_type", "rsrv_type_nm")),
+    ):
+        product_model = apps.get_model("deposits", product_name)
+        option_model = apps.get_model("deposits", option_name)
+        with_rows = set(
+            option_model.objects.values_list("product_id", flat=True).distinct()
+        )
+
+        rows = []
+        codes = set()
+        for code, options in product_model.objects.values_list(
+            "fin_prdt_cd", "options"
+        ):
+            if code in with_rows:
+                continue
+            if isinstance(options, str):
+                try:
+                    options = json.loads(options)
+                except ValueError:
+                    continue
+            if not isinstance(options, list):
+                continue
+
+            for option in options:
+                term = (
+                    _term(option.get("save_trm")) if isinstance(option, dict) else None
+                )
+                if term is None:
+                    continue
+                rows.append(
+                    option_model(
+                        product_id=code,
+                        intr_rate_type=option.get("intr_rate_type") or "",
+                        intr_rate_type_nm=option.get("intr_rate_type_nm") or "",
+                        save_trm=term,
+                        intr_rate=_rate(option.get("intr_rate")),
+                        intr_rate2=_rate(option.get("intr_rate2")),
+                        **{field: option.get(field) or "" for field in extra_fields},
+                    )
+                )
+                codes.add(code)
+
+        # 같은 상품에 키가 겹치는 옵션이 있으면 처음 것을 남김
+        option_model.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+        backfilled[product_name] = codes
+    return backfilled
+
+
+def backfill_options(apps, schema_editor):
+    """options JSON에만 있던 옵션을 금리 타입이 있는 옵션 행으로 옮겨 담음"""
+    copy_json_options(apps)
+
+
+def backfill_best_rates(apps, schema_editor):
+    """
+    옵션 행으로 상품별/가입기간별 최고 금리를 채움 (다음 갱신을 기다리지 않도록)
+
+    기간별 최고 금리 행은 지우고 다시 만들므로 여러 번 실행해도 된다.
+    """
+    for product_name, option_name, term_rate_name in (
+        ("DepositProduct", "DepositOption", "DepositTermRate"),
+        ("SavingProduct", "SavingOption", "SavingTermRate"),
+    ):
+        product_model = apps.get_model("deposits", product_name)
+        option_model = apps.get_model("deposits", option_name)
+        term_rate_model = apps.get_model("deposits", term_rate_name)
+
+        product_rates = {}
+        term_rates = {}
+        for code, term, base, pref in option_model.objects.values_list(
+            "product_id", "save_trm", "intr_rate", "intr_rate2"
+        ).iterator(chunk_size=2000):
+            best_base, best_pref = product_rates.get(code, (None, None))
+            product_rates[code] = (
+                _max_rate(best_base, base),
+                _max_rate(best_pref, pref),
+            )
+            best_base, best_pref = term_rates.get((code, term), (None, None))
+            term_rates[(code, term)] = (
+                _max_rate(best_base, base),
+                _max_rate(best_pref, pref),
+            )
+
+        term_rate_model.objects.all().delete()
+        term_rate_model.objects.bulk_create(
+            [
+                term_rate_model(
+                    product_id=code,
+                    save_trm=term,
+                    best_base_rate=base,
+                    best_pref_rate=pref,
+                )
+                for (code, term), (base, pref) in term_rates.items()
+            ],
+            batch_size=1000,
+        )
+        product_model.objects.bulk_update(
+            [
+                product_model(
+                    fin_prdt_cd=code, best_base_rate=base, best_pref_rate=pref
+                )
+                for code, (base, pref) in product_rates.items()
+            ],
+            ["best_base_rate", "best_pref_rate"],
+            batch_size=1000,
+        )
+
+
+def reset_payload_hashes(apps, schema_editor):
+    """다음 갱신 때 모든 상품의 최고 금리를 다시 계산하도록 해시 초기화"""
+    for model_name in ("DepositProduct", "SavingProduct"):
+        apps.get_model("deposits", model_name).objects.update(payload_hash="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deposits", "0005_clear_blank_option_rates"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DepositTermRate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("save_trm", models.PositiveSmallIntegerField()),
+                (
+                    "best_base_rate",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=5, null=True
+                    ),
+                ),
+                (
+                    "best_pref_rate",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=5, null=True
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="SavingTermRate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("save_trm", models.PositiveSmallIntegerField()),
+                (
+                    "best_base_rate",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=5, null=True
+                    ),
+                ),
+                (
+                    "best_pref_rate",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=5, null=True
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="depositproduct",
+            name="best_base_rate",
+            field=models.DecimalField(
+                blank=True, db_index=True, decimal_places=2, max_digits=5, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="depositproduct",
+            name="best_pref_rate",
+            field=models.DecimalField(
+                blank=True, db_index=True, decimal_places=2, max_digits=5, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="savingproduct",
+            name="best_base_rate",
+            field=models.DecimalField(
+                blank=True, db_index=True, decimal_places=2, max_digits=5, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="savingproduct",
+            name="best_pref_rate",
+            field=models.DecimalField(
+                blank=True, db_index=True, decimal_places=2, max_digits=5, null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="depositoption",
+            name="intr_rate",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=5, null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="depositoption",
+            name="intr_rate2",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=5, null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="depositoption",
+            name="save_trm",
+            field=models.PositiveSmallIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name="savingoption",
+            name="intr_rate",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=5, null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="savingoption",
+            name="intr_rate2",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=5, null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="savingoption",
+            name="save_trm",
+            field=models.PositiveSmallIntegerField(),
+        ),
+        migrations.AddIndex(
+            model_name="depositoption",
+            index=models.Index(
+                fields=["save_trm", "intr_rate"], name="deposit_opt_term_base_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="depositoption",
+            index=models.Index(
+                fields=["save_trm", "intr_rate2"], name="deposit_opt_term_pref_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="savingoption",
+            index=models.Index(
+                fields=["save_trm", "intr_rate"], name="saving_opt_term_base_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="savingoption",
+            index=models.Index(
+                fields=["save_trm", "intr_rate2"], name="saving_opt_term_pref_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="savingtermrate",
+            name="product",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="term_rates",
+                to="deposits.savingproduct",
+            ),
+        ),
+        migrations.AddField(
+            model_name="deposittermrate",
+            name="product",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="term_rates",
+                to="deposits.depositproduct",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="savingtermrate",
+            index=models.Index(
+                fields=["save_trm", "best_base_rate"], name="saving_term_base_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="savingtermrate",
+            index=models.Index(
+                fields=["save_trm", "best_pref_rate"], name="saving_term_pref_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="savingtermrate",
+            unique_together={("product", "save_trm")},
+        ),
+        migrations.AddIndex(
+            model_name="deposittermrate",
+            index=models.Index(
+                fields=["save_trm", "best_base_rate"], name="deposit_term_base_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="deposittermrate",
+            index=models.Index(
+                fields=["save_trm", "best_pref_rate"], name="deposit_term_pref_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="deposittermrate",
+            unique_together={("product", "save_trm")},
+        ),
+        migrations.RunPython(backfill_options, migrations.RunPython.noop),
+        migrations.RunPython(backfill_best_rates, migrations.RunPython.noop),
+        migrations.RunPython(reset_payload_hashes, migrations.RunPython.noop),
+    ]
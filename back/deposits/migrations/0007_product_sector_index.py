@@ -0,0 +1,23 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deposits", "0006_typed_option_rates"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="depositproduct",
+            name="sector_code",
+            field=models.TextField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="savingproduct",
+            name="sector_code",
+            field=models.TextField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deposits", "0007_product_sector_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("product_type", models.CharField(db_index=True, max_length=10)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("summary", models.JSONField(blank=True, default=dict)),
+            ],
+            options={
+                "ordering": ["-id"],
+            },
+        ),
+    ]
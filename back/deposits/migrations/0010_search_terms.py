@@ -0,0 +1,100 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from deposits.search import product_grams
+
+
+def build_search_index(apps, schema_editor):
+    """기존 상품의 검색 색인 생성"""
+    for product_name, term_name in (
+        ("DepositProduct", "DepositSearchTerm"),
+        ("SavingProduct", "SavingSearchTerm"),
+    ):
+        term_model = apps.get_model("deposits", term_name)
+        term_model.objects.bulk_create(
+            [
+                term_model(product_id=product.pk, gram=gram, weight=weight)
+                for product in apps.get_model("deposits", product_name).objects.all()
+                for gram, weight in product_grams(product).items()
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deposits", "0009_subscriptionrequest"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SavingSearchTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("gram", models.CharField(max_length=3)),
+                ("weight", models.PositiveSmallIntegerField()),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_terms",
+                        to="deposits.savingproduct",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["gram", "product", "weight"],
+                        name="saving_search_gram_idx",
+                    )
+                ],
+                "unique_together": {("product", "gram")},
+            },
+        ),
+        migrations.CreateModel(
+            name="DepositSearchTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("gram", models.CharField(max_length=3)),
+                ("weight", models.PositiveSmallIntegerField()),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_terms",
+                        to="deposits.depositproduct",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["gram", "product", "weight"],
+                        name="deposit_search_gram_idx",
+                    )
+                ],
+                "unique_together": {("product", "gram")},
+            },
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
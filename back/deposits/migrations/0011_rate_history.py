@@ -0,0 +1,123 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:16
+
+import datetime
+
+from django.db import migrations, models
+
+
+def seed_rate_snapshots(apps, schema_editor):
+    """현재 옵션 금리를 첫 이력으로 기록 (이후 갱신부터는 바뀐 옵션만 추가)"""
+    snapshot_model = apps.get_model("deposits", "RateSnapshot")
+    today = datetime.date.today()
+    for product_type, option_name in (
+        ("deposit", "DepositOption"),
+        ("saving", "SavingOption"),
+    ):
+        snapshot_model.objects.bulk_create(
+            [
+                snapshot_model(
+                    product_type=product_type,
+                    fin_prdt_cd=option.product_id,
+                    intr_rate_type=option.intr_rate_type,
+                    rsrv_type=getattr(option, "rsrv_type", None) or "",
+                    save_trm=option.save_trm,
+                    intr_rate=option.intr_rate,
+                    intr_rate2=option.intr_rate2,
+                    captured_on=today,
+                )
+                for option in apps.get_model("deposits", option_name).objects.all()
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deposits", "0010_search_terms"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RateSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("product_type", models.CharField(max_length=10)),
+                ("fin_prdt_cd", models.TextField()),
+                ("intr_rate_type", models.CharField(max_length=1)),
+                ("rsrv_type", models.CharField(blank=True, default="", max_length=1)),
+                ("save_trm", models.PositiveSmallIntegerField()),
+                (
+                    "intr_rate",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=5, null=True
+                    ),
+                ),
+                (
+                    "intr_rate2",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=5, null=True
+                    ),
+                ),
+                ("captured_on", models.DateField()),
+            ],
+            options={
+                "ordering": ["captured_on", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["product_type", "fin_prdt_cd", "captured_on"],
+                        name="rate_snapshot_product_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="DailyRateRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("product_type", models.CharField(max_length=10)),
+                ("date", models.DateField()),
+                ("save_trm", models.PositiveSmallIntegerField()),
+                (
+                    "avg_base_rate",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=5, null=True
+                    ),
+                ),
+                (
+                    "avg_pref_rate",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=5, null=True
+                    ),
+                ),
+                (
+                    "max_pref_rate",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=5, null=True
+                    ),
+                ),
+                ("option_count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "ordering": ["date"],
+                "unique_together": {("product_type", "save_trm", "date")},
+            },
+        ),
+        migrations.RunPython(seed_rate_snapshots, migrations.RunPython.noop),
+    ]
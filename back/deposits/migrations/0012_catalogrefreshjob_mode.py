@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deposits", "0011_rate_history"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="catalogrefreshjob",
+            name="mode",
+            field=models.CharField(default="live", max_length=10),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deposits", "0012_catalogrefreshjob_mode"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RateMatrix",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("product_type", models.CharField(max_length=10)),
+                ("sector_code", models.CharField(max_length=10)),
+                ("data", models.JSONField(default=dict)),
+                ("built_at", models.DateTimeField()),
+            ],
+            options={
+                "unique_together": {("product_type", "sector_code")},
+            },
+        ),
+    ]
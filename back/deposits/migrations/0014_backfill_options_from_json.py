@@ -0,0 +1,35 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:21
+
+from importlib import import_module
+
+from django.db import migrations
+
+typed_option_rates = import_module("deposits.migrations.0006_typed_option_rates")
+
+
+def backfill_options(apps, schema_editor):
+    """
+    options JSON 컬럼을 지우기 전에 옵션 테이블에 없는 옵션을 한 번 더 옮겨 담음
+
+    0006이 JSON 옵션을 옮기기 전에 0006을 적용한 DB를 위한 것으로, 그 밖의 DB에서는 옮길 옵션이 없다.
+    최고 금리를 다시 계산하고, 옮긴 상품은 다음 갱신 때 변경으로 감지되도록 해시를 초기화한다.
+    """
+    backfilled = typed_option_rates.copy_json_options(apps)
+    if not any(backfilled.values()):
+        return
+    typed_option_rates.backfill_best_rates(apps, schema_editor)
+    for product_name, codes in backfilled.items():
+        apps.get_model("deposits", product_name).objects.filter(
+            fin_prdt_cd__in=codes
+        ).update(payload_hash="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deposits", "0013_ratematrix"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_options, migrations.RunPython.noop),
+    ]
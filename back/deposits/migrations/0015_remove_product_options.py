@@ -0,0 +1,21 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:22
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deposits", "0014_backfill_options_from_json"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="depositproduct",
+            name="options",
+        ),
+        migrations.RemoveField(
+            model_name="savingproduct",
+            name="options",
+        ),
+    ]
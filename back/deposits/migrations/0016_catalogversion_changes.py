@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deposits", "0015_remove_product_options"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="catalogversion",
+            name="changes",
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
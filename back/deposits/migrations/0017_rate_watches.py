@@ -0,0 +1,140 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("deposits", "0016_catalogversion_changes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RateWatch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("product_type", models.CharField(default="deposit", max_length=10)),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("threshold", "기준 금리 이상 상품"),
+                            ("subscription", "가입 상품 금리 변경"),
+                        ],
+                        default="threshold",
+                        max_length=20,
+                    ),
+                ),
+                ("save_trm", models.PositiveSmallIntegerField(blank=True, null=True)),
+                (
+                    "min_rate",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=5, null=True
+                    ),
+                ),
+                ("sector_code", models.CharField(blank=True, max_length=10, null=True)),
+                ("is_active", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "bank",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="deposits.bank",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rate_watches",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="RateNotification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("product_type", models.CharField(max_length=10)),
+                ("fin_prdt_cd", models.TextField()),
+                ("save_trm", models.PositiveSmallIntegerField()),
+                (
+                    "rate",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=5, null=True
+                    ),
+                ),
+                (
+                    "reason",
+                    models.CharField(
+                        choices=[
+                            ("threshold", "기준 금리 이상"),
+                            ("rate_change", "가입 상품 금리 변경"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("read_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rate_notifications",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "watch",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="notifications",
+                        to="deposits.ratewatch",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at", "-id"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="ratewatch",
+            index=models.Index(
+                fields=["product_type", "kind", "save_trm", "min_rate"],
+                name="rate_watch_match_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ratenotification",
+            index=models.Index(
+                fields=["user", "read_at"], name="rate_notification_user_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="ratenotification",
+            unique_together={("watch", "fin_prdt_cd", "save_trm", "rate")},
+        ),
+    ]
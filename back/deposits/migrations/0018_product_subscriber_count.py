@@ -0,0 +1,35 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deposits", "0017_rate_watches"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="depositproduct",
+            name="subscriber_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="savingproduct",
+            name="subscriber_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="depositproduct",
+            index=models.Index(
+                fields=["-subscriber_count", "fin_prdt_cd"], name="deposit_popular_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="savingproduct",
+            index=models.Index(
+                fields=["-subscriber_count", "fin_prdt_cd"], name="saving_popular_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.16 on 2026-10-18 10:32
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def fill_subscriber_counts(apps, schema_editor):
+    """현재 가입 내역으로 상품별 가입자 수를 채움"""
+    for product_name, subscription_name in (
+        ("DepositProduct", "DepositSubscription"),
+        ("SavingProduct", "SavingSubscription"),
+    ):
+        product_model = apps.get_model("deposits", product_name)
+        counts = (
+            apps.get_model("deposits", subscription_name)
+            .objects.values("product_id")
+            .annotate(count=Count("id"))
+        )
+        products = [
+            product_model(fin_prdt_cd=row["product_id"], subscriber_count=row["count"])
+            for row in counts
+        ]
+        product_model.objects.bulk_update(products, ["subscriber_count"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deposits", "0018_product_subscriber_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_subscriber_counts, migrations.RunPython.noop),
+    ]
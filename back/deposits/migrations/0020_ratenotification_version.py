@@ -0,0 +1,26 @@
+# Generated by Django 4.2.16 on 2026-10-18 11:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deposits", "0019_fill_subscriber_counts"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="ratenotification",
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name="ratenotification",
+            name="version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterUniqueTogether(
+            name="ratenotification",
+            unique_together={("watch", "fin_prdt_cd", "save_trm", "rate", "version")},
+        ),
+    ]
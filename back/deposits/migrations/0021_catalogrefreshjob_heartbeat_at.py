@@ -0,0 +1,26 @@
+# Generated by Django 4.2.16 on 2026-10-18 11:10
+
+from django.db import migrations, models
+
+
+def start_heartbeats(apps, schema_editor):
+    """이미 실행 중인 작업은 시작 시각을 마지막 heartbeat로 봄"""
+    apps.get_model("deposits", "CatalogRefreshJob").objects.filter(
+        status="running"
+    ).update(heartbeat_at=models.F("started_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deposits", "0020_ratenotification_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="catalogrefreshjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(start_heartbeats, migrations.RunPython.noop),
+    ]
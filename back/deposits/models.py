@@ -27,11 +27,20 @@ class DepositProduct(models.Model):
     dcls_strt_day = models.TextField()  # 공시 시작일
     dcls_end_day = models.TextField(null=True, blank=True)  # 공시 종료일
     fin_co_subm_day = models.TextField()  # 금융회사 제출일
-    sector_code = models.TextField(null=True, blank=True)  # 권역코드
-    options = JSONField(default=list)  # 금리 옵션 정보 (JSON 형태로 저장)
+    sector_code = models.TextField(null=True, blank=True, db_index=True)  # 권역코드
+    payload_hash = models.CharField(max_length=64, blank=True, default='')  # 원본 데이터 해시 (변경 감지용)
+    best_base_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, db_index=True)  # 최고 기본금리
+    best_pref_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, db_index=True)  # 최고 우대금리
+    subscriber_count = models.PositiveIntegerField(default=0)  # 가입자 수 (가입/취소 시 F()로 갱신)
     
     # subscribers 필드 제거 - User 모델에서만 관계 정의
     
+    class Meta:
+        indexes = [
+            # 인기 상품 목록을 가입자 수 순서로 색인에서 바로 읽음
+            models.Index(fields=['-subscriber_count', 'fin_prdt_cd'], name='deposit_popular_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.fin_prdt_nm} - {self.bank.kor_co_nm}"
 
@@ -40,13 +49,52 @@ class DepositOption(models.Model):
     product = models.ForeignKey(DepositProduct, on_delete=models.CASCADE, related_name='deposit_options')
     intr_rate_type = models.TextField()  # 금리유형
     intr_rate_type_nm = models.TextField()  # 금리유형명
-    save_trm = models.TextField()  # 저축기간
-    intr_rate = models.TextField(null=True, blank=True)  # 기본금리
-    intr_rate2 = models.TextField(null=True, blank=True)  # 우대금리
+    save_trm = models.PositiveSmallIntegerField()  # 저축기간 (개월)
+    intr_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # 기본금리
+    intr_rate2 = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # 우대금리
+    
+    class Meta:
+        unique_together = ('product', 'intr_rate_type', 'save_trm')
+        indexes = [
+            models.Index(fields=['save_trm', 'intr_rate'], name='deposit_opt_term_base_idx'),
+            models.Index(fields=['save_trm', 'intr_rate2'], name='deposit_opt_term_pref_idx'),
+        ]
     
     def __str__(self):
         return f"{self.product.fin_prdt_nm} - {self.save_trm}개월"
 
+class DepositTermRate(models.Model):
+    """정기예금 상품의 가입기간별 최고 금리 (옵션에서 미리 계산)"""
+    product = models.ForeignKey(DepositProduct, on_delete=models.CASCADE, related_name='term_rates')
+    save_trm = models.PositiveSmallIntegerField()  # 저축기간 (개월)
+    best_base_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # 최고 기본금리
+    best_pref_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # 최고 우대금리
+    
+    class Meta:
+        unique_together = ('product', 'save_trm')
+        indexes = [
+            models.Index(fields=['save_trm', 'best_base_rate'], name='deposit_term_base_idx'),
+            models.Index(fields=['save_trm', 'best_pref_rate'], name='deposit_term_pref_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.product_id} - {self.save_trm}개월"
+
+class DepositSearchTerm(models.Model):
+    """정기예금 상품 검색용 역색인 (상품 텍스트의 2~3글자 n-gram)"""
+    product = models.ForeignKey(DepositProduct, on_delete=models.CASCADE, related_name='search_terms')
+    gram = models.CharField(max_length=3)
+    weight = models.PositiveSmallIntegerField()  # 필드별 가중치 합
+    
+    class Meta:
+        unique_together = ('product', 'gram')
+        indexes = [
+            models.Index(fields=['gram', 'product', 'weight'], name='deposit_search_gram_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.product_id} - {self.gram}"
+
 class DepositSubscription(models.Model):
     """사용자의 예금 상품 가입 정보"""
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -74,11 +122,20 @@ class SavingProduct(models.Model):
     dcls_strt_day = models.TextField()  # 공시 시작일
     dcls_end_day = models.TextField(null=True, blank=True)  # 공시 종료일
     fin_co_subm_day = models.TextField()  # 금융회사 제출일
-    sector_code = models.TextField(null=True, blank=True)  # 권역코드
-    options = JSONField(default=list)  # 금리 옵션 정보 (JSON 형태로 저장)
+    sector_code = models.TextField(null=True, blank=True, db_index=True)  # 권역코드
+    payload_hash = models.CharField(max_length=64, blank=True, default='')  # 원본 데이터 해시 (변경 감지용)
+    best_base_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, db_index=True)  # 최고 기본금리
+    best_pref_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, db_index=True)  # 최고 우대금리
+    subscriber_count = models.PositiveIntegerField(default=0)  # 가입자 수 (가입/취소 시 F()로 갱신)
     
     # subscribers 필드 제거 - User 모델에서만 관계 정의
     
+    class Meta:
+        indexes = [
+            # 인기 상품 목록을 가입자 수 순서로 색인에서 바로 읽음
+            models.Index(fields=['-subscriber_count', 'fin_prdt_cd'], name='saving_popular_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.fin_prdt_nm} - {self.bank.kor_co_nm}"
 
@@ -87,13 +144,54 @@ class SavingOption(models.Model):
     product = models.ForeignKey(SavingProduct, on_delete=models.CASCADE, related_name='saving_options')
     intr_rate_type = models.TextField()  # 금리유형
     intr_rate_type_nm = models.TextField()  # 금리유형명
-    save_trm = models.TextField()  # 저축기간
-    intr_rate = models.TextField(null=True, blank=True)  # 기본금리
-    intr_rate2 = models.TextField(null=True, blank=True)  # 우대금리
+    rsrv_type = models.TextField(default='', blank=True)  # 적립유형
+    rsrv_type_nm = models.TextField(default='', blank=True)  # 적립유형명
+    save_trm = models.PositiveSmallIntegerField()  # 저축기간 (개월)
+    intr_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # 기본금리
+    intr_rate2 = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # 우대금리
+    
+    class Meta:
+        unique_together = ('product', 'intr_rate_type', 'rsrv_type', 'save_trm')
+        indexes = [
+            models.Index(fields=['save_trm', 'intr_rate'], name='saving_opt_term_base_idx'),
+            models.Index(fields=['save_trm', 'intr_rate2'], name='saving_opt_term_pref_idx'),
+        ]
     
     def __str__(self):
         return f"{self.product.fin_prdt_nm} - {self.save_trm}개월"
 
+class SavingTermRate(models.Model):
+    """정기적금 상품의 가입기간별 최고 금리 (옵션에서 미리 계산)"""
+    product = models.ForeignKey(SavingProduct, on_delete=models.CASCADE, related_name='term_rates')
+    save_trm = models.PositiveSmallIntegerField()  # 저축기간 (개월)
+    best_base_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # 최고 기본금리
+    best_pref_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # 최고 우대금리
+    
+    class Meta:
+        unique_together = ('product', 'save_trm')
+        indexes = [
+            models.Index(fields=['save_trm', 'best_base_rate'], name='saving_term_base_idx'),
+            models.Index(fields=['save_trm', 'best_pref_rate'], name='saving_term_pref_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.product_id} - {self.save_trm}개월"
+
+class SavingSearchTerm(models.Model):
+    """정기적금 상품 검색용 역색인 (상품 텍스트의 2~3글자 n-gram)"""
+    product = models.ForeignKey(SavingProduct, on_delete=models.CASCADE, related_name='search_terms')
+    gram = models.CharField(max_length=3)
+    weight = models.PositiveSmallIntegerField()  # 필드별 가중치 합
+    
+    class Meta:
+        unique_together = ('product', 'gram')
+        indexes = [
+            models.Index(fields=['gram', 'product', 'weight'], name='saving_search_gram_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.product_id} - {self.gram}"
+
 class SavingSubscription(models.Model):
     """사용자의 적금 상품 가입 정보"""
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -104,4 +202,180 @@ class SavingSubscription(models.Model):
         unique_together = ('user', 'product')
     
     def __str__(self):
-        return f"{self.user.username} - {self.product.fin_prdt_nm}"
\ No newline at end of file
+        return f"{self.user.username} - {self.product.fin_prdt_nm}"
+
+class SubscriptionRequest(models.Model):
+    """Idempotency-Key로 받은 일괄 가입/취소 요청과 그 응답 (재시도 시 그대로 재사용)"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)  # 같은 키로 다른 요청을 보냈는지 확인용
+    response = JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('user', 'key')
+
+    def __str__(self):
+        return f"{self.user.username} - {self.key}"
+
+class CatalogRefreshJob(models.Model):
+    """금융상품 데이터 갱신 작업 및 실행 이력"""
+    PRODUCT_TYPE_CHOICES = [
+        ('all', '전체'),
+        ('deposit', '정기예금'),
+        ('saving', '정기적금'),
+    ]
+    STATUS_CHOICES = [
+        ('queued', '대기'),
+        ('running', '실행 중'),
+        ('succeeded', '완료'),
+        ('failed', '실패'),
+    ]
+
+    product_type = models.CharField(max_length=10, choices=PRODUCT_TYPE_CHOICES, default='all')  # 갱신 대상
+    sector_code = models.TextField(null=True, blank=True)  # 권역코드 (없으면 전체 권역)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    trigger = models.CharField(max_length=20, default='api')  # 요청 경로 (api/command/schedule)
+    mode = models.CharField(max_length=10, default='live')  # 수집 모드 (live/record/replay)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)  # 실행 중 마지막으로 살아 있음을 알린 시각
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration = models.FloatField(null=True, blank=True)  # 소요 시간(초)
+    result = JSONField(default=dict, blank=True)  # 상품 유형별 변경 건수와 권역별 소요 시간
+    error = models.TextField(blank=True, default='')
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            # 실행 중인 작업은 항상 하나만 존재 (DB 수준 잠금)
+            models.UniqueConstraint(
+                fields=['status'],
+                condition=models.Q(status='running'),
+                name='single_running_catalog_refresh',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_product_type_display()} 갱신 #{self.pk} ({self.get_status_display()})"
+
+
+class CatalogVersion(models.Model):
+    """상품 데이터가 바뀔 때마다 올라가는 카탈로그 버전"""
+    product_type = models.CharField(max_length=10, db_index=True)  # deposit 또는 saving
+    created_at = models.DateTimeField(auto_now_add=True)
+    summary = JSONField(default=dict, blank=True)  # 신규/변경/판매종료 건수
+    changes = JSONField(null=True, blank=True)  # 신규/변경/판매종료 상품코드 (없으면 변경 내역을 모름)
+
+    class Meta:
+        ordering = ['-id']
+
+    def __str__(self):
+        return f"{self.product_type} v{self.pk}"
+
+
+class RateSnapshot(models.Model):
+    """상품 옵션 금리 변경 이력 (갱신 시 금리가 바뀐 옵션만 추가)"""
+    product_type = models.CharField(max_length=10)  # deposit 또는 saving
+    fin_prdt_cd = models.TextField()  # 금융상품 코드
+    intr_rate_type = models.CharField(max_length=1)  # 저축금리유형
+    rsrv_type = models.CharField(max_length=1, blank=True, default='')  # 적립유형 (적금만)
+    save_trm = models.PositiveSmallIntegerField()  # 저축기간 (개월)
+    intr_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # 저축금리
+    intr_rate2 = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # 최고우대금리
+    captured_on = models.DateField()  # 갱신 날짜
+
+    class Meta:
+        ordering = ['captured_on', 'id']
+        indexes = [
+            models.Index(fields=['product_type', 'fin_prdt_cd', 'captured_on'], name='rate_snapshot_product_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.fin_prdt_cd} {self.save_trm}개월 ({self.captured_on})"
+
+
+class DailyRateRollup(models.Model):
+    """날짜/상품 유형/기간별 시장 평균 금리 (갱신 때마다 미리 집계)"""
+    product_type = models.CharField(max_length=10)
+    date = models.DateField()
+    save_trm = models.PositiveSmallIntegerField()
+    avg_base_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # 평균 기본금리
+    avg_pref_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # 평균 우대금리
+    max_pref_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # 최고 우대금리
+    option_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['date']
+        unique_together = ('product_type', 'save_trm', 'date')
+
+    def __str__(self):
+        return f"{self.product_type} {self.save_trm}개월 ({self.date})"
+
+
+class RateMatrix(models.Model):
+    """상품 유형/권역별 금융회사 x 기간 최고 금리표 (수집할 때마다 다시 만듦)"""
+    product_type = models.CharField(max_length=10)  # deposit 또는 saving
+    sector_code = models.CharField(max_length=10)  # 권역코드 (전체는 all)
+    data = JSONField(default=dict)  # 금융회사별 기간 최고 금리와 기간별 집계
+    built_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('product_type', 'sector_code')
+
+    def __str__(self):
+        return f"{self.product_type} {self.sector_code} 금리표"
+
+
+class RateWatch(models.Model):
+    """사용자가 등록한 금리 알림 조건 (수집할 때마다 바뀐 상품만 대조)"""
+    KIND_CHOICES = [
+        ('threshold', '기준 금리 이상 상품'),
+        ('subscription', '가입 상품 금리 변경'),
+    ]
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='rate_watches')
+    product_type = models.CharField(max_length=10, default='deposit')  # deposit 또는 saving
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='threshold')
+    save_trm = models.PositiveSmallIntegerField(null=True, blank=True)  # 가입기간 (개월, 가입 상품 알림은 생략 가능)
+    min_rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # 최고 우대금리 기준
+    sector_code = models.CharField(max_length=10, null=True, blank=True)  # 권역코드
+    bank = models.ForeignKey(Bank, on_delete=models.CASCADE, null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # 기간별로 기준 금리 이하인 조건만 범위 조회
+            models.Index(fields=['product_type', 'kind', 'save_trm', 'min_rate'], name='rate_watch_match_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.product_type} {self.save_trm}개월 {self.min_rate}%"
+
+
+class RateNotification(models.Model):
+    """금리 알림 조건에 맞은 상품 알림 (같은 조건/상품/기간/금리/버전은 한 번만)"""
+    REASON_CHOICES = [
+        ('threshold', '기준 금리 이상'),
+        ('rate_change', '가입 상품 금리 변경'),
+    ]
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='rate_notifications')
+    watch = models.ForeignKey(RateWatch, on_delete=models.CASCADE, related_name='notifications')
+    product_type = models.CharField(max_length=10)
+    fin_prdt_cd = models.TextField()  # 금융상품 코드
+    save_trm = models.PositiveSmallIntegerField()
+    rate = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)  # 알림 시점의 최고 금리
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+    version = models.PositiveIntegerField(default=0)  # 금리 변경 알림을 만든 카탈로그 버전 (기준 금리 알림은 0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        unique_together = ('watch', 'fin_prdt_cd', 'save_trm', 'rate', 'version')
+        indexes = [
+            models.Index(fields=['user', 'read_at'], name='rate_notification_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.fin_prdt_cd} {self.save_trm}개월 {self.rate}%"
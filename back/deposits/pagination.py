@@ -0,0 +1,29 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ProductCursorPagination(CursorPagination):
+    """
+    상품 목록용 커서 페이지네이션
+
+    기존 클라이언트는 전체 목록(배열)을 받으므로 cursor 또는 page_size 파라미터가 있거나
+    뷰가 필터/정렬을 적용했을 때(paginate_by_default)만 페이지로 나눈다.
+    정렬 기준은 뷰의 cursor_ordering을 따른다.
+    """
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    ordering = ('fin_prdt_cd',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_page_size(self, request):
+        if self.cursor_query_param not in request.query_params and \
+                self.page_size_query_param not in request.query_params and \
+                not getattr(self.view, 'paginate_by_default', False):
+            return None
+        return super().get_page_size(request)
+
+    def get_ordering(self, request, queryset, view):
+        return getattr(view, 'cursor_ordering', self.ordering)
@@ -0,0 +1,164 @@
+from collections import defaultdict
+
+import numpy as np
+
+from .calculator import (
+    DEPOSIT_INSURANCE_LIMIT, after_tax, maturity_amounts, option_installment_interest, option_rate,
+)
+from .models import DepositSubscription, SavingSubscription
+
+# 기본 예치금(예금)과 월 납입액(적금)
+DEFAULT_DEPOSIT_AMOUNT = 10000000
+DEFAULT_SAVING_AMOUNT = 300000
+
+PORTFOLIO_SOURCES = {
+    'deposit': (DepositSubscription, 'deposit_options'),
+    'saving': (SavingSubscription, 'saving_options'),
+}
+
+
+def best_option(options, rate='pref', term=None):
+    """
+    금리가 가장 높은 옵션 (같으면 기간이 짧은 옵션)
+
+    term이 있으면 그 기간의 옵션만 고르고, 적용할 옵션이 없으면 None을 반환한다.
+    """
+    candidates = [
+        option for option in options
+        if option_rate(option, rate) is not None and (term is None or option.save_trm == term)
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda option: (option_rate(option, rate), -option.save_trm))
+
+
+def _subscriptions(user, product_type):
+    subscription_model, options_relation = PORTFOLIO_SOURCES[product_type]
+    return (
+        subscription_model.objects.filter(user=user)
+        .select_related('product__bank')
+        .prefetch_related(f'product__{options_relation}')
+        .order_by('created_at', 'id')
+    )
+
+
+def _expected_interest(product_type, amount, options, rate):
+    """고른 옵션들의 (원금, 세전 이자, 이자소득세) 배열을 한 번에 계산"""
+    if not options:
+        empty = np.empty(0)
+        return empty, empty, empty
+    rates = np.array([float(option_rate(option, rate)) for option in options], dtype=np.float64)
+    terms = np.array([option.save_trm for option in options], dtype=np.float64)
+    compound = np.array([option.intr_rate_type == 'M' for option in options], dtype=bool)
+
+    if product_type == 'deposit':
+        principal = np.full(len(options), float(amount))
+        interest = maturity_amounts(amount, terms, rates, compound)
+    else:
+        principal = amount * terms
+        interest = option_installment_interest(amount, terms, rates, compound)
+    interest, tax = after_tax(interest)
+    return principal, interest, tax
+
+
+def _option_data(product_type, option):
+    data = {
+        'intr_rate_type': option.intr_rate_type,
+        'intr_rate_type_nm': option.intr_rate_type_nm,
+        'save_trm': option.save_trm,
+        'intr_rate': option.intr_rate,
+        'intr_rate2': option.intr_rate2,
+    }
+    if product_type == 'saving':
+        data['rsrv_type'] = option.rsrv_type
+        data['rsrv_type_nm'] = option.rsrv_type_nm
+    return data
+
+
+def _totals(items):
+    return {
+        'count': len(items),
+        'principal': sum(item['principal'] for item in items),
+        'interest': sum(item['interest'] for item in items),
+        'tax': sum(item['tax'] for item in items),
+        'net_interest': sum(item['net_interest'] for item in items),
+        'amount': sum(item['amount'] for item in items),
+    }
+
+
+def build_portfolio(user, deposit_amount=DEFAULT_DEPOSIT_AMOUNT, saving_amount=DEFAULT_SAVING_AMOUNT,
+                    rate='pref', term=None):
+    """
+    사용자가 가입한 예금/적금마다 가장 유리한 옵션과 세후 예상 이자, 금융회사/기간별 합계
+
+    예금은 deposit_amount원을 예치, 적금은 매월 saving_amount원을 납입한다고 가정한다.
+    가입 내역과 옵션은 상품 유형별로 (가입+상품+은행, 옵션) 두 번의 쿼리로 읽는다.
+    """
+    items = []
+    for product_type, amount in (('deposit', deposit_amount), ('saving', saving_amount)):
+        _, options_relation = PORTFOLIO_SOURCES[product_type]
+        subscriptions = list(_subscriptions(user, product_type))
+        chosen = [
+            best_option(getattr(subscription.product, options_relation).all(), rate, term)
+            for subscription in subscriptions
+        ]
+        applicable = [option for option in chosen if option is not None]
+        principal, interest, tax = _expected_interest(product_type, amount, applicable, rate)
+
+        position = 0
+        for subscription, option in zip(subscriptions, chosen):
+            product = subscription.product
+            item = {
+                'subscription_id': subscription.pk,
+                'product_type': product_type,
+                'fin_prdt_cd': product.fin_prdt_cd,
+                'fin_prdt_nm': product.fin_prdt_nm,
+                'fin_co_no': product.bank_id,
+                'kor_co_nm': product.bank.kor_co_nm,
+                'subscribed_at': subscription.created_at,
+                'option': None,
+                'principal': 0,
+                'interest': 0,
+                'tax': 0,
+                'net_interest': 0,
+                'amount': 0,
+            }
+            if option is not None:
+                item.update({
+                    'option': _option_data(product_type, option),
+                    'principal': int(principal[position]),
+                    'interest': int(interest[position]),
+                    'tax': int(tax[position]),
+                    'net_interest': int(interest[position] - tax[position]),
+                    'amount': int(principal[position] + interest[position] - tax[position]),
+                })
+                position += 1
+            items.append(item)
+
+    by_bank = defaultdict(list)
+    by_term = defaultdict(list)
+    for item in items:
+        by_bank[(item['fin_co_no'], item['kor_co_nm'])].append(item)
+        if item['option']:
+            by_term[item['option']['save_trm']].append(item)
+
+    banks = []
+    for (bank_code, bank_name), bank_items in sorted(by_bank.items(), key=lambda entry: entry[0][1]):
+        totals = _totals(bank_items)
+        banks.append({
+            'fin_co_no': bank_code,
+            'kor_co_nm': bank_name,
+            **totals,
+            # 예금자보호 한도(금융회사별 원리금 합계)를 넘는지
+            'exceeds_insurance_limit': totals['amount'] > DEPOSIT_INSURANCE_LIMIT,
+        })
+
+    return {
+        'subscriptions': items,
+        'totals': _totals(items),
+        'by_bank': banks,
+        'by_term': [
+            {'save_trm': save_trm, **_totals(term_items)}
+            for save_trm, term_items in sorted(by_term.items())
+        ],
+    }
@@ -0,0 +1,147 @@
+from collections import defaultdict
+
+import numpy as np
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from .ingestion import SECTOR_CODES
+from .models import DepositTermRate, RateMatrix, SavingTermRate
+
+# 금리표의 열 (가입기간, 개월)
+MATRIX_TERMS = (6, 12, 24, 36)
+
+# 전체 권역 금리표의 권역코드
+ALL_SECTORS = 'all'
+
+TERM_RATE_MODELS = {
+    'deposit': DepositTermRate,
+    'saving': SavingTermRate,
+}
+
+
+def _cache_key(product_type, sector_code):
+    return f'rate-matrix:{product_type}:{sector_code}'
+
+
+def _summary(values):
+    if not values:
+        return None
+    values = np.array(values, dtype=np.float64)
+    return {
+        'avg': round(float(values.mean()), 2),
+        'median': round(float(np.median(values)), 2),
+        'max': round(float(values.max()), 2),
+    }
+
+
+def _build_document(product_type, sector_code, rows, built_at):
+    """(금융회사코드, 금융회사명, 기간, 기본금리, 우대금리) 행으로 금리표 문서 생성"""
+    banks = {}
+    base_rates = defaultdict(list)
+    pref_rates = defaultdict(list)
+    for bank_code, bank_name, term, base, pref in rows:
+        bank = banks.setdefault(bank_code, {'fin_co_no': bank_code, 'kor_co_nm': bank_name, 'rates': {}})
+        cell = bank['rates'].setdefault(str(term), {'base': None, 'pref': None})
+        if base is not None:
+            base_rates[term].append(base)
+            cell['base'] = max(cell['base'] or 0, float(base))
+        if pref is not None:
+            pref_rates[term].append(pref)
+            cell['pref'] = max(cell['pref'] or 0, float(pref))
+
+    return {
+        'product_type': product_type,
+        'sector_code': sector_code,
+        'sector_name': SECTOR_CODES.get(sector_code, '전체'),
+        'terms': list(MATRIX_TERMS),
+        'banks': sorted(banks.values(), key=lambda bank: bank['kor_co_nm']),
+        'aggregates': {
+            str(term): {
+                'products': max(len(base_rates[term]), len(pref_rates[term])),
+                'base': _summary(base_rates[term]),
+                'pref': _summary(pref_rates[term]),
+            }
+            for term in MATRIX_TERMS
+        },
+        'built_at': built_at.isoformat(),
+    }
+
+
+def _cache_document(matrix):
+    document = {
+        'etag': f'"matrix-{matrix.product_type}-{matrix.sector_code}-{int(matrix.built_at.timestamp() * 1000)}"',
+        'body': JSONRenderer().render(matrix.data),
+    }
+    cache.set(_cache_key(matrix.product_type, matrix.sector_code), document, None)
+    return document
+
+
+def rebuild_rate_matrices(product_type):
+    """
+    판매 중인 상품의 기간별 최고 금리를 한 번 조회해 권역별/전체 금리표를 다시 만들고 캐시에 올림
+
+    반환값: 만든 금리표 수
+    """
+    today = timezone.localdate().strftime('%Y%m%d')
+    rows = (
+        TERM_RATE_MODELS[product_type].objects.filter(save_trm__in=MATRIX_TERMS)
+        .exclude(product__dcls_end_day__lte=today)
+        .values_list(
+            'product__sector_code', 'product__bank_id', 'product__bank__kor_co_nm',
+            'save_trm', 'best_base_rate', 'best_pref_rate',
+        )
+    )
+    by_sector = defaultdict(list)
+    for sector_code, *row in rows:
+        by_sector[sector_code].append(row)
+        by_sector[ALL_SECTORS].append(row)
+
+    built_at = timezone.now()
+    matrices = [
+        RateMatrix(
+            product_type=product_type,
+            sector_code=sector_code,
+            data=_build_document(product_type, sector_code, by_sector[sector_code], built_at),
+            built_at=built_at,
+        )
+        for sector_code in [ALL_SECTORS, *SECTOR_CODES]
+    ]
+    RateMatrix.objects.bulk_create(
+        matrices,
+        update_conflicts=True,
+        unique_fields=['product_type', 'sector_code'],
+        update_fields=['data', 'built_at'],
+    )
+    for matrix in matrices:
+        _cache_document(matrix)
+    return len(matrices)
+
+
+def matrix_response(request, product_type, sector_code=ALL_SECTORS):
+    """
+    캐시된 금리표 JSON으로 응답 (없으면 DB에서 읽어 캐시)
+
+    기간별 최고 금리는 있는데 금리표가 아직 없으면(마이그레이션/픽스처로 채운 경우) 지금 만들고,
+    금리 자체가 없으면 None을 반환한다.
+    """
+    document = cache.get(_cache_key(product_type, sector_code))
+    if document is None:
+        matrix = RateMatrix.objects.filter(product_type=product_type, sector_code=sector_code).first()
+        if matrix is None:
+            if not TERM_RATE_MODELS[product_type].objects.exists():
+                return None
+            rebuild_rate_matrices(product_type)
+            matrix = RateMatrix.objects.filter(product_type=product_type, sector_code=sector_code).first()
+            if matrix is None:
+                return None
+        document = _cache_document(matrix)
+
+    if document['etag'] in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(document['body'], content_type='application/json')
+    response['ETag'] = document['etag']
+    response['Cache-Control'] = 'no-cache'
+    return response
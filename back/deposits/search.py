@@ -0,0 +1,101 @@
+import re
+from math import ceil
+
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Sum
+from rest_framework.exceptions import ValidationError
+
+from .models import DepositProduct, DepositSearchTerm, SavingProduct, SavingSearchTerm
+
+# 검색 대상 필드와 가중치 (상품명에 있는 단어가 가장 관련도가 높음)
+SEARCH_FIELDS = {
+    'fin_prdt_nm': 5,
+    'spcl_cnd': 2,
+    'join_member': 1,
+    'join_deny': 1,
+    'etc_note': 1,
+}
+GRAM_SIZES = (2, 3)
+
+# 검색어 n-gram 중 이 비율 이상이 일치해야 결과에 포함
+MIN_MATCH_RATIO = 0.5
+
+SEARCH_MODELS = {
+    'deposit': (DepositProduct, DepositSearchTerm),
+    'saving': (SavingProduct, SavingSearchTerm),
+}
+
+_non_word = re.compile(r'[^0-9a-z가-힣]+')
+
+
+def tokenize(text):
+    """소문자로 바꾸고 한글/영문/숫자가 아닌 문자를 기준으로 단어를 나눔"""
+    return [word for word in _non_word.split((text or '').lower()) if word]
+
+
+def grams(text):
+    """텍스트의 2글자/3글자 n-gram 집합 (단어 경계는 넘지 않음)"""
+    result = set()
+    for word in tokenize(text):
+        for size in GRAM_SIZES:
+            result.update(word[i:i + size] for i in range(len(word) - size + 1))
+    return result
+
+
+def product_grams(product):
+    """상품 하나의 {n-gram: 가중치} (필드마다 한 번씩만 가중치를 더함)"""
+    weights = {}
+    for field, weight in SEARCH_FIELDS.items():
+        for gram in grams(getattr(product, field)):
+            weights[gram] = weights.get(gram, 0) + weight
+    return weights
+
+
+def index_products(product_type, products):
+    """
+    주어진 상품들의 색인을 다시 만듦
+
+    상품 객체는 저장된 것이어야 하며, 기존 색인을 지우고 새로 넣는다.
+    """
+    _, term_model = SEARCH_MODELS[product_type]
+    codes = [product.pk for product in products]
+    with transaction.atomic():
+        term_model.objects.filter(product_id__in=codes).delete()
+        term_model.objects.bulk_create(
+            [
+                term_model(product_id=product.pk, gram=gram, weight=weight)
+                for product in products
+                for gram, weight in product_grams(product).items()
+            ],
+            batch_size=1000,
+        )
+
+
+def rebuild_index(product_type):
+    """상품 유형의 색인 전체를 다시 만들고 색인한 상품 수를 반환"""
+    product_model, term_model = SEARCH_MODELS[product_type]
+    products = list(product_model.objects.only('fin_prdt_cd', *SEARCH_FIELDS))
+    with transaction.atomic():
+        term_model.objects.all().delete()
+        index_products(product_type, products)
+    return len(products)
+
+
+def search_products(queryset, product_type, query):
+    """
+    검색어와 관련된 상품만 남기고 관련도를 주석으로 붙인 queryset을 반환
+
+    검색어의 n-gram으로 색인을 조회해 상품마다 일치한 n-gram 수(search_matched)와
+    가중치 합(search_score)을 서브쿼리로 붙인다. 결과 수는 자르지 않으므로 페이지 범위는 페이지네이션이 정한다.
+    """
+    query_grams = grams(query)
+    if not query_grams:
+        raise ValidationError({'q': '검색어는 두 글자 이상 입력해주세요.'})
+
+    _, term_model = SEARCH_MODELS[product_type]
+    required = ceil(len(query_grams) * MIN_MATCH_RATIO)
+    terms = term_model.objects.filter(product=OuterRef('pk'), gram__in=query_grams).order_by().values('product')
+    return queryset.annotate(
+        search_matched=Subquery(terms.annotate(matched=Count('gram')).values('matched')),
+        search_score=Subquery(terms.annotate(score=Sum('weight')).values('score')),
+    ).filter(search_matched__gte=required)
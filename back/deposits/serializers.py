@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import Bank, DepositProduct, DepositOption, DepositSubscription, SavingProduct, SavingOption, SavingSubscription
+from .models import Bank, DepositProduct, DepositOption, DepositSubscription, SavingProduct, SavingOption, SavingSubscription, CatalogRefreshJob, RateSnapshot, DailyRateRollup, RateWatch, RateNotification
+from .ingestion import SECTOR_CODES
 
 
 class BankSerializer(serializers.ModelSerializer):
@@ -7,40 +8,60 @@ class BankSerializer(serializers.ModelSerializer):
         model = Bank
         fields = '__all__'
 
+class DepositOptionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DepositOption
+        fields = ['intr_rate_type', 'intr_rate_type_nm', 'save_trm', 'intr_rate', 'intr_rate2']
+
 class DepositProductSerializer(serializers.ModelSerializer):
     bank = BankSerializer(read_only=True)
-    options = serializers.SerializerMethodField()
+    # 옵션 테이블에서 가져오기 (prefetch_related 결과 사용)
+    options = DepositOptionSerializer(source='deposit_options', many=True, read_only=True)
     
     class Meta:
         model = DepositProduct
-        fields = '__all__'
+        # 가입자 수는 가입/취소마다 바뀌므로 버전별로 캐시하는 목록에는 넣지 않음 (인기 상품 API에서만 제공)
+        exclude = ['subscriber_count', 'payload_hash']
     
-    def get_options(self, obj):
-        # options 필드가 JSONField로 저장되어 있다면 그대로 반환
-        if hasattr(obj, 'options') and obj.options:
-            return obj.options
-        # 없다면 deposit_options 관계에서 가져오기
-        return list(obj.deposit_options.all().values())
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # 목록 API에서 가입 여부를 주석(annotate)한 경우에만 포함
+        if hasattr(instance, 'is_subscribed'):
+            data['is_subscribed'] = instance.is_subscribed
+        return data
 
 class SavingOptionSerializer(serializers.ModelSerializer):
     class Meta:
         model = SavingOption
-        fields = '__all__'
+        fields = [
+            'intr_rate_type', 'intr_rate_type_nm', 'rsrv_type', 'rsrv_type_nm',
+            'save_trm', 'intr_rate', 'intr_rate2',
+        ]
 
 class SavingProductSerializer(serializers.ModelSerializer):
     bank = BankSerializer(read_only=True)
-    options = serializers.SerializerMethodField()
+    # 옵션 테이블에서 가져오기 (prefetch_related 결과 사용)
+    options = SavingOptionSerializer(source='saving_options', many=True, read_only=True)
     
     class Meta:
         model = SavingProduct
-        fields = '__all__'
+        # 가입자 수는 가입/취소마다 바뀌므로 버전별로 캐시하는 목록에는 넣지 않음 (인기 상품 API에서만 제공)
+        exclude = ['subscriber_count', 'payload_hash']
     
-    def get_options(self, obj):
-        # options 필드가 JSONField로 저장되어 있다면 그대로 반환
-        if hasattr(obj, 'options') and obj.options:
-            return obj.options
-        # 없다면 saving_options 관계에서 가져오기
-        return list(obj.saving_options.all().values())
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # 목록 API에서 가입 여부를 주석(annotate)한 경우에만 포함
+        if hasattr(instance, 'is_subscribed'):
+            data['is_subscribed'] = instance.is_subscribed
+        return data
+
+class PopularDepositProductSerializer(DepositProductSerializer):
+    class Meta(DepositProductSerializer.Meta):
+        exclude = ['payload_hash']
+
+class PopularSavingProductSerializer(SavingProductSerializer):
+    class Meta(SavingProductSerializer.Meta):
+        exclude = ['payload_hash']
 
 class SavingSubscriptionSerializer(serializers.ModelSerializer):
     product_name = serializers.SerializerMethodField()
@@ -54,4 +75,59 @@ class SavingSubscriptionSerializer(serializers.ModelSerializer):
         return obj.product.fin_prdt_nm
     
     def get_bank_name(self, obj):
-        return obj.product.bank.kor_co_nm
\ No newline at end of file
+        return obj.product.bank.kor_co_nm
+
+class CatalogRefreshJobSerializer(serializers.ModelSerializer):
+    job_id = serializers.IntegerField(source='id', read_only=True)
+    
+    class Meta:
+        model = CatalogRefreshJob
+        fields = [
+            'job_id', 'product_type', 'sector_code', 'status', 'trigger', 'mode',
+            'created_at', 'started_at', 'finished_at', 'duration', 'result', 'error'
+        ]
+
+class RateSnapshotSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RateSnapshot
+        fields = ['captured_on', 'intr_rate_type', 'rsrv_type', 'save_trm', 'intr_rate', 'intr_rate2']
+
+class DailyRateRollupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DailyRateRollup
+        fields = ['date', 'save_trm', 'avg_base_rate', 'avg_pref_rate', 'max_pref_rate', 'option_count']
+
+class RateWatchSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RateWatch
+        fields = [
+            'id', 'product_type', 'kind', 'save_trm', 'min_rate', 'sector_code', 'bank',
+            'is_active', 'created_at',
+        ]
+        read_only_fields = ['id', 'created_at']
+
+    def validate_product_type(self, value):
+        if value not in ('deposit', 'saving'):
+            raise serializers.ValidationError('deposit 또는 saving이어야 합니다.')
+        return value
+
+    def validate_sector_code(self, value):
+        if value and value not in SECTOR_CODES:
+            raise serializers.ValidationError('잘못된 권역코드입니다.')
+        return value
+
+    def validate(self, attrs):
+        # 기준 금리 알림은 기간별 색인으로 찾으므로 기간과 기준 금리가 모두 필요
+        if attrs.get('kind', 'threshold') == 'threshold':
+            errors = {
+                field: '기준 금리 알림에는 필수입니다.'
+                for field in ('save_trm', 'min_rate') if attrs.get(field) is None
+            }
+            if errors:
+                raise serializers.ValidationError(errors)
+        return attrs
+
+class RateNotificationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RateNotification
+        fields = ['id', 'watch', 'product_type', 'fin_prdt_cd', 'save_trm', 'rate', 'reason', 'created_at', 'read_at']
@@ -0,0 +1,208 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .models import (
+    DepositProduct, DepositSubscription, SavingProduct, SavingSubscription, SubscriptionRequest,
+)
+
+# 같은 Idempotency-Key를 재사용으로 인정하는 기간
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+
+SUBSCRIPTION_MODELS = {
+    'deposit': (DepositProduct, DepositSubscription),
+    'saving': (SavingProduct, SavingSubscription),
+}
+ACTIONS = ('subscribe', 'unsubscribe')
+
+
+class IdempotencyKeyConflict(Exception):
+    """같은 Idempotency-Key로 내용이 다른 요청이 들어온 경우"""
+
+
+def parse_operations(data):
+    """
+    요청 본문의 operations를 상품 유형별 최종 상태로 정리
+
+    같은 상품이 여러 번 나오면 마지막 작업을 적용한다.
+    반환값: {'deposit': {상품코드: action}, 'saving': {...}}
+    """
+    operations = data.get('operations') if isinstance(data, dict) else None
+    if not isinstance(operations, list) or not operations:
+        raise ValidationError({'operations': '가입/취소할 상품 목록을 입력해주세요.'})
+
+    desired = {product_type: {} for product_type in SUBSCRIPTION_MODELS}
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            raise ValidationError({'operations': f'{index}번째 항목 형식이 올바르지 않습니다.'})
+        product_type = operation.get('product_type')
+        action = operation.get('action', 'subscribe')
+        product_id = operation.get('product_id')
+        if product_type not in SUBSCRIPTION_MODELS:
+            raise ValidationError({'operations': f'{index}번째 항목의 product_type은 deposit 또는 saving이어야 합니다.'})
+        if action not in ACTIONS:
+            raise ValidationError({'operations': f'{index}번째 항목의 action은 subscribe 또는 unsubscribe여야 합니다.'})
+        if not product_id:
+            raise ValidationError({'operations': f'{index}번째 항목에 product_id가 없습니다.'})
+        desired[product_type][str(product_id)] = action
+    return desired
+
+
+def _adjust_counts(product_model, codes, delta):
+    """가입자 수를 F()로 한 번에 더하거나 뺌 (0 아래로는 내려가지 않음)"""
+    if not codes:
+        return
+    products = product_model.objects.filter(pk__in=codes)
+    if delta < 0:
+        products = products.filter(subscriber_count__gte=-delta)
+    products.update(subscriber_count=F('subscriber_count') + delta)
+
+
+def subscribe(user, product_type, product_id):
+    """가입 내역을 만들고 가입자 수를 1 늘림 (이미 가입했으면 False)"""
+    product_model, subscription_model = SUBSCRIPTION_MODELS[product_type]
+    try:
+        with transaction.atomic():
+            subscription_model.objects.create(user=user, product_id=product_id)
+            _adjust_counts(product_model, [product_id], 1)
+    except IntegrityError:
+        return False
+    return True
+
+
+def unsubscribe(user, product_type, product_id):
+    """가입 내역을 지우고 가입자 수를 1 줄임 (가입하지 않았으면 False)"""
+    product_model, subscription_model = SUBSCRIPTION_MODELS[product_type]
+    with transaction.atomic():
+        deleted, _ = subscription_model.objects.filter(user=user, product_id=product_id).delete()
+        if deleted:
+            _adjust_counts(product_model, [product_id], -1)
+    return bool(deleted)
+
+
+def _recount(product_model, subscription_model, codes):
+    """상품들의 가입자 수를 가입 내역 집계로 UPDATE 한 번에 다시 맞춤"""
+    if not codes:
+        return
+    counts = (
+        subscription_model.objects.filter(product=OuterRef('pk')).order_by()
+        .values('product').annotate(count=Count('id')).values('count')
+    )
+    product_model.objects.filter(pk__in=codes).update(subscriber_count=Coalesce(Subquery(counts), 0))
+
+
+def apply_operations(user, desired):
+    """
+    상품 유형별로 가입은 bulk_create(ignore_conflicts) 한 번, 취소는 delete 한 번으로 처리
+
+    이미 가입/취소된 상품은 그대로 두므로 동시에 여러 번 호출해도 결과가 같다.
+    건너뛴 행이 동시 요청 때문인지 알 수 없으므로, 가입자 수는 더하고 빼는 대신
+    요청에 나온 상품들만 가입 내역을 집계해 UPDATE 한 번으로 다시 맞춘다.
+    상품 수와 관계없이 유형마다 쿼리 수가 일정하다. 호출하는 쪽에서 트랜잭션을 연다.
+    """
+    result = {}
+    for product_type, actions in desired.items():
+        product_model, subscription_model = SUBSCRIPTION_MODELS[product_type]
+        subscribe_ids = [pk for pk, action in actions.items() if action == 'subscribe']
+        unsubscribe_ids = [pk for pk, action in actions.items() if action == 'unsubscribe']
+
+        if subscribe_ids:
+            existing = set(product_model.objects.filter(pk__in=subscribe_ids).values_list('pk', flat=True))
+            missing = [pk for pk in subscribe_ids if pk not in existing]
+            if missing:
+                raise ValidationError({'operations': f'존재하지 않는 상품입니다: {", ".join(missing)}'})
+            subscription_model.objects.bulk_create(
+                [subscription_model(user=user, product_id=pk) for pk in subscribe_ids],
+                ignore_conflicts=True,
+            )
+
+        unsubscribed = 0
+        if unsubscribe_ids:
+            unsubscribed, _ = subscription_model.objects.filter(
+                user=user, product_id__in=unsubscribe_ids
+            ).delete()
+
+        _recount(product_model, subscription_model, subscribe_ids + unsubscribe_ids)
+
+        result[f'{product_type}s'] = {
+            'subscribed': sorted(subscribe_ids),
+            'unsubscribed': sorted(unsubscribe_ids),
+            'removed': unsubscribed,
+        }
+    return result
+
+
+def reconcile_subscriber_counts(product_type):
+    """
+    가입 내역을 집계해 상품의 가입자 수와 다른 것만 바로잡고 고친 상품 수를 반환
+
+    읽은 뒤 다른 요청이 가입자 수를 바꿨으면 그 상품은 건드리지 않는다 (다음 실행 때 다시 확인).
+    """
+    product_model, subscription_model = SUBSCRIPTION_MODELS[product_type]
+    counts = dict(
+        subscription_model.objects.values('product_id').annotate(count=Count('id')).values_list('product_id', 'count')
+    )
+    fixed = 0
+    for code, current in product_model.objects.values_list('fin_prdt_cd', 'subscriber_count'):
+        actual = counts.get(code, 0)
+        if current != actual:
+            fixed += product_model.objects.filter(pk=code, subscriber_count=current).update(subscriber_count=actual)
+    return fixed
+
+
+def _request_hash(desired):
+    return hashlib.sha256(json.dumps(desired, sort_keys=True).encode()).hexdigest()
+
+
+def _find_previous(user, key, request_hash):
+    """유효한 이전 요청의 응답을 반환 (없으면 None, 내용이 다르면 IdempotencyKeyConflict)"""
+    previous = SubscriptionRequest.objects.filter(user=user, key=key).first()
+    if previous is None:
+        return None
+    if previous.created_at < timezone.now() - IDEMPOTENCY_KEY_TTL:
+        previous.delete()
+        return None
+    if previous.request_hash != request_hash:
+        raise IdempotencyKeyConflict(key)
+    return previous.response
+
+
+def bulk_update_subscriptions(user, data, idempotency_key=None):
+    """
+    일괄 가입/취소를 한 트랜잭션으로 적용하고 (응답, 재사용 여부)를 반환
+
+    Idempotency-Key가 있으면 응답을 함께 저장해 두고, 같은 키로 다시 오면
+    DB를 변경하지 않고 저장된 응답을 돌려준다.
+    """
+    desired = parse_operations(data)
+    if not idempotency_key:
+        with transaction.atomic():
+            return apply_operations(user, desired), False
+
+    if len(idempotency_key) > 255:
+        raise ValidationError({'error': 'Idempotency-Key는 255자 이하여야 합니다.'})
+
+    request_hash = _request_hash(desired)
+    response = _find_previous(user, idempotency_key, request_hash)
+    if response is not None:
+        return response, True
+
+    try:
+        with transaction.atomic():
+            response = apply_operations(user, desired)
+            SubscriptionRequest.objects.create(
+                user=user, key=idempotency_key, request_hash=request_hash, response=response
+            )
+    except IntegrityError:
+        # 같은 키의 동시 요청이 먼저 저장됨 - 그 결과를 돌려줌
+        response = _find_previous(user, idempotency_key, request_hash)
+        if response is None:
+            raise
+        return response, True
+    return response, False
@@ -0,0 +1,1357 @@
+import datetime
+import gzip
+import importlib
+import json
+import tempfile
+from decimal import Decimal
+from unittest import mock
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from . import autocomplete, jobs
+from .autocomplete import clear_cached_tries
+from .calculator import clear_cached_arrays
+from .catalog_cache import publish_version
+from .finlife import FinlifeClient, FinlifeError, ReplayFinlifeClient, read_recording, recording_path
+from .finlife_stub import FinlifeStubServer, synthetic_page
+from .history import record_snapshots, rollup_daily
+from .ingestion import fetch_products, write_products
+from .jobs import enqueue_refresh, refresh_catalog, run_job
+from .rate_matrix import rebuild_rate_matrices
+from .search import rebuild_index
+from .subscriptions import apply_operations, reconcile_subscriber_counts, subscribe, unsubscribe
+from .watches import evaluate_watches
+from .models import (
+    Bank, CatalogRefreshJob, CatalogVersion, DepositProduct, DepositOption, DepositSubscription, DepositTermRate,
+    RateMatrix, RateNotification, RateSnapshot, RateWatch, SavingProduct, SavingOption, SavingSubscription,
+)
+
+
+def create_catalog(size, start=0):
+    """테스트용 은행/예금/적금 상품과 옵션 생성"""
+    banks = [Bank(fin_co_no=f'B{i}', kor_co_nm=f'은행{i}', sector_code='020000') for i in range(3)]
+    Bank.objects.bulk_create(banks, ignore_conflicts=True)
+
+    deposits, savings, deposit_options, saving_options = [], [], [], []
+    for i in range(start, start + size):
+        common = {
+            'bank_id': f'B{i % 3}',
+            'fin_prdt_nm': f'상품{i}',
+            'dcls_strt_day': '20250101',
+            'fin_co_subm_day': '202501010000',
+            'sector_code': '020000',
+            'best_base_rate': '3.00',
+            'best_pref_rate': '3.50',
+        }
+        deposits.append(DepositProduct(fin_prdt_cd=f'D{i}', **common))
+        savings.append(SavingProduct(fin_prdt_cd=f'S{i}', **common))
+        for term in (6, 12):
+            deposit_options.append(DepositOption(
+                product_id=f'D{i}', intr_rate_type='S', intr_rate_type_nm='단리',
+                save_trm=term, intr_rate='3.00', intr_rate2='3.50',
+            ))
+            saving_options.append(SavingOption(
+                product_id=f'S{i}', intr_rate_type='S', intr_rate_type_nm='단리',
+                rsrv_type='F', rsrv_type_nm='자유적립식',
+                save_trm=term, intr_rate='3.00', intr_rate2='3.50',
+            ))
+    DepositProduct.objects.bulk_create(deposits)
+    SavingProduct.objects.bulk_create(savings)
+    DepositOption.objects.bulk_create(deposit_options)
+    SavingOption.objects.bulk_create(saving_options)
+
+
+def sector_results(product_type='deposit', sector_code='020000', size=5):
+    """스텁 서버와 같은 형식의 가상 응답을 fetch_products 결과 형태로 변환"""
+    page = synthetic_page(product_type, sector_code, 1, size, page_size=size)['result']
+    return {sector_code: {
+        'base_list': page['baseList'], 'option_list': page['optionList'], 'pages': 1, 'elapsed': 0.0,
+    }}
+
+
+class WriteProductsTestCase(TestCase):
+    """원본 해시로 바뀐 상품만 다시 쓰는 증분 저장"""
+
+    def setUp(self):
+        self.results = sector_results()
+        self.first = write_products('deposit', self.results)
+        self.today = timezone.localdate().strftime('%Y%m%d')
+
+    def product(self, index):
+        return self.results['020000']['base_list'][index]
+
+    def options(self, index):
+        code = self.product(index)['fin_prdt_cd']
+        return [option for option in self.results['020000']['option_list'] if option['fin_prdt_cd'] == code]
+
+    def test_identical_refresh_is_unchanged(self):
+        self.assertEqual(self.first['inserted'], 5)
+        second = write_products('deposit', self.results)
+        self.assertEqual(second['unchanged'], 5)
+        self.assertEqual(second['changes'], {'inserted': [], 'updated': [], 'withdrawn': []})
+
+    def test_changed_payload_is_updated(self):
+        self.options(0)[0]['intr_rate2'] = 9.99
+        written = write_products('deposit', self.results)
+        code = self.product(0)['fin_prdt_cd']
+        self.assertEqual(written['changes']['updated'], [code])
+        self.assertEqual(written['unchanged'], 4)
+        self.assertEqual(DepositProduct.objects.get(pk=code).best_pref_rate, Decimal('9.99'))
+
+    def test_missing_product_is_withdrawn(self):
+        removed = self.results['020000']['base_list'].pop(1)['fin_prdt_cd']
+        written = write_products('deposit', self.results)
+        self.assertEqual(written['changes']['withdrawn'], [removed])
+        product = DepositProduct.objects.get(pk=removed)
+        self.assertEqual(product.dcls_end_day, self.today)
+        self.assertEqual(product.payload_hash, '')
+
+    def test_stale_options_deleted(self):
+        code = self.product(2)['fin_prdt_cd']
+        stale = self.options(2)[-1]
+        self.results['020000']['option_list'].remove(stale)
+        written = write_products('deposit', self.results)
+        self.assertEqual(written['changes']['updated'], [code])
+        self.assertEqual(
+            sorted(DepositOption.objects.filter(product_id=code).values_list('save_trm', flat=True)),
+            sorted(int(option['save_trm']) for option in self.options(2)),
+        )
+        self.assertFalse(DepositTermRate.objects.filter(product_id=code, save_trm=int(stale['save_trm'])).exists())
+
+    def test_end_date_decides_withdrawal(self):
+        # 앞으로의 종료일이 새로 공시된 상품은 아직 판매 중
+        self.product(0)['dcls_end_day'] = '99991231'
+        # 종료일이 오늘인 상품은 판매 종료
+        self.product(1)['dcls_end_day'] = self.today
+        written = write_products('deposit', self.results)
+        self.assertEqual(written['changes']['updated'], [self.product(0)['fin_prdt_cd']])
+        self.assertEqual(written['changes']['withdrawn'], [self.product(1)['fin_prdt_cd']])
+
+
+class TypedOptionRatesTestCase(TestCase):
+    """옵션 금리로 미리 계산하는 상품별/가입기간별 최고 금리"""
+
+    def setUp(self):
+        self.results = sector_results(size=2)
+        code = self.results['020000']['base_list'][0]['fin_prdt_cd']
+        self.code = code
+        option = {'fin_prdt_cd': code, 'intr_rate_type_nm': '단리'}
+        self.results['020000']['option_list'] = [
+            dict(option, intr_rate_type='S', save_trm='12', intr_rate=3.0, intr_rate2=3.5),
+            dict(option, intr_rate_type='M', save_trm='12', intr_rate=3.2, intr_rate2=None),
+            dict(option, intr_rate_type='S', save_trm='6', intr_rate='2.1', intr_rate2=''),
+            # 기간이 없는 옵션은 건너뜀
+            dict(option, intr_rate_type='M', save_trm='', intr_rate=9.0, intr_rate2=9.0),
+        ]
+
+    def term_rates(self, code):
+        return {
+            term: (base, pref) for term, base, pref in DepositTermRate.objects.filter(product_id=code)
+            .values_list('save_trm', 'best_base_rate', 'best_pref_rate')
+        }
+
+    def test_write_products_aggregates_best_rates(self):
+        write_products('deposit', self.results)
+        product = DepositProduct.objects.get(pk=self.code)
+        self.assertEqual(product.best_base_rate, Decimal('3.20'))
+        self.assertEqual(product.best_pref_rate, Decimal('3.50'))
+        self.assertEqual(self.term_rates(self.code), {
+            12: (Decimal('3.20'), Decimal('3.50')),
+            6: (Decimal('2.10'), None),
+        })
+        # 옵션이 없는 상품은 최고 금리도 비어 있음
+        other = DepositProduct.objects.exclude(pk=self.code).get()
+        self.assertIsNone(other.best_pref_rate)
+        self.assertEqual(self.term_rates(other.pk), {})
+
+    def test_migration_backfills_existing_options(self):
+        write_products('deposit', self.results)
+        DepositTermRate.objects.all().delete()
+        DepositProduct.objects.update(best_base_rate=None, best_pref_rate=None)
+
+        migration = importlib.import_module('deposits.migrations.0006_typed_option_rates')
+        migration.backfill_best_rates(apps, None)
+        product = DepositProduct.objects.get(pk=self.code)
+        self.assertEqual((product.best_base_rate, product.best_pref_rate), (Decimal('3.20'), Decimal('3.50')))
+        self.assertEqual(self.term_rates(self.code)[12], (Decimal('3.20'), Decimal('3.50')))
+
+
+@override_settings(CATALOG_REFRESH_IN_PROCESS=False)
+class CatalogRefreshJobTestCase(TestCase):
+    """갱신 작업 잠금, 중복 등록 방지와 상태 조회"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='tester', password='pass1234')
+
+    def test_second_claim_while_running(self):
+        # 한참 전에 시작했어도 heartbeat가 이어지면 살아 있는 작업
+        started_at = timezone.now() - datetime.timedelta(hours=2)
+        running = CatalogRefreshJob.objects.create(status='running', started_at=started_at, heartbeat_at=timezone.now())
+        queued = CatalogRefreshJob.objects.create()
+        # 실행 중 상태의 부분 유니크 제약에 걸려 가져가지 못함
+        self.assertFalse(run_job(queued.pk))
+        queued.refresh_from_db()
+        running.refresh_from_db()
+        self.assertEqual(queued.status, 'queued')
+        self.assertEqual(running.status, 'running')
+
+    def test_stale_heartbeat_releases_lock(self):
+        stale = timezone.now() - jobs.JOB_LOCK_TIMEOUT - datetime.timedelta(minutes=1)
+        running = CatalogRefreshJob.objects.create(status='running', started_at=timezone.now(), heartbeat_at=stale)
+        queued = enqueue_refresh('deposit', '020000', run_in_background=False, mode='replay')
+
+        with tempfile.TemporaryDirectory() as recordings, override_settings(FINLIFE_RECORDINGS_DIR=recordings):
+            with self.assertLogs('deposits.jobs', level='ERROR'):
+                self.assertTrue(run_job(queued.pk))
+        running.refresh_from_db()
+        self.assertEqual(running.status, 'failed')
+
+    def test_enqueue_returns_existing_queued_job(self):
+        first = enqueue_refresh('deposit', run_in_background=False, mode='replay')
+        second = enqueue_refresh('deposit', run_in_background=False, mode='replay')
+        self.assertEqual(first.pk, second.pk)
+        self.assertNotEqual(enqueue_refresh('saving', run_in_background=False, mode='replay').pk, first.pk)
+        self.assertEqual(CatalogRefreshJob.objects.count(), 2)
+
+    def test_failed_type_keeps_finished_summary(self):
+        with tempfile.TemporaryDirectory() as recordings:
+            with FinlifeStubServer(products_per_sector=3) as server:
+                with override_settings(FINLIFE_BASE_URL=server.base_url, FINLIFE_RECORDINGS_DIR=recordings):
+                    refresh_catalog('deposit', '020000', mode='record')
+            DepositProduct.objects.all().delete()
+
+            # 적금 녹화 파일이 없어 두 번째 상품 유형에서 실패
+            job = enqueue_refresh('all', '020000', run_in_background=False, mode='replay')
+            with override_settings(FINLIFE_RECORDINGS_DIR=recordings):
+                with self.assertLogs('deposits.jobs', level='ERROR'):
+                    self.assertTrue(run_job(job.pk))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertTrue(job.error)
+        self.assertEqual(job.result['deposit']['inserted'], 3)
+        self.assertNotIn('saving', job.result)
+
+    def test_enqueue_endpoint_requires_login_and_post(self):
+        self.assertIn(self.client.post('/api/save-deposit-products/').status_code, (401, 403))
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get('/api/save-deposit-products/').status_code, 405)
+
+        response = self.client.post('/api/save-deposit-products/', {'mode': 'replay'}, format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(CatalogRefreshJob.objects.get(pk=response.data['job_id']).mode, 'replay')
+
+        # 강제 새로고침은 관리자만
+        create_catalog(1)
+        response = self.client.post('/api/save-saving-products/', {'force_refresh': True}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_status_view(self):
+        job = CatalogRefreshJob.objects.create(product_type='deposit')
+        self.client.force_authenticate(self.user)
+        response = self.client.get(f'/api/catalog-jobs/{job.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['status'], 'queued')
+        self.assertEqual(self.client.get(f'/api/catalog-jobs/{job.pk + 1}/').status_code, 404)
+
+
+class ProductFilterTestCase(TestCase):
+    """목록 API의 서버 측 필터, 금리 정렬과 커서 페이지네이션"""
+
+    def setUp(self):
+        # 가상 상품은 7개마다 같은 금리(동률), 3개마다 복리 상품
+        self.results = sector_results(size=25)
+        write_products('deposit', self.results)
+
+    def codes(self, params):
+        response = self.client.get('/api/deposits/', params)
+        self.assertEqual(response.status_code, 200)
+        return [item['fin_prdt_cd'] for item in response.data['results']]
+
+    def test_term_sorts_by_term_rate(self):
+        response = self.client.get('/api/deposits/', {'term': 24, 'sort': 'base_rate', 'page_size': 100})
+        rates = [
+            max(float(option['intr_rate']) for option in item['options'] if option['save_trm'] == 24)
+            for item in response.data['results']
+        ]
+        self.assertEqual(len(rates), 25)
+        self.assertEqual(rates, sorted(rates, reverse=True))
+        self.assertEqual(self.codes({'term': 48}), [])
+
+    def test_rate_type_and_min_rate(self):
+        compound = {item['fin_prdt_cd'] for item in self.results['020000']['base_list'][::3]}
+        self.assertEqual(set(self.codes({'rate_type': 'M', 'page_size': 100})), compound)
+
+        codes = self.codes({'min_rate': '3.4', 'sort': 'base_rate', 'page_size': 100})
+        for product in DepositProduct.objects.filter(pk__in=codes):
+            self.assertGreaterEqual(product.best_base_rate, Decimal('3.4'))
+        self.assertEqual(
+            len(codes), DepositProduct.objects.filter(best_base_rate__gte=Decimal('3.4')).count()
+        )
+
+    def test_rate_type_sorts_by_matching_options(self):
+        # 두 번째 상품은 단리 12개월 금리가 가장 높지만 복리 옵션만 보면 첫 상품보다 낮음
+        first, second = [item['fin_prdt_cd'] for item in self.results['020000']['base_list'][:2]]
+        DepositOption.objects.filter(product_id=first, save_trm=12).update(intr_rate2='4.00')
+        DepositOption.objects.create(
+            product_id=second, intr_rate_type='M', intr_rate_type_nm='복리', save_trm=12,
+            intr_rate='2.00', intr_rate2='2.50',
+        )
+        DepositOption.objects.filter(product_id=second, intr_rate_type='S', save_trm=12).update(intr_rate2='9.00')
+
+        codes = self.codes({'rate_type': 'M', 'term': 12, 'sort': 'pref_rate'})
+        self.assertEqual(codes[0], first)
+        self.assertLess(codes.index(first), codes.index(second))
+
+    def test_keyword_and_join_way(self):
+        banks = {item['fin_prdt_cd'] for item in self.results['020000']['base_list'] if item['kor_co_nm'] == '가상은행3'}
+        self.assertEqual(set(self.codes({'keyword': '가상은행3'})), banks)
+        self.assertEqual(self.codes({'keyword': '정기예금 12'}), [self.results['020000']['base_list'][12]['fin_prdt_cd']])
+
+        code = self.results['020000']['base_list'][5]['fin_prdt_cd']
+        DepositProduct.objects.filter(pk=code).update(join_way='영업점')
+        self.assertEqual(self.codes({'join_way': '영업점'}), [code])
+
+    def test_sort_without_page_size_is_paginated(self):
+        response = self.client.get('/api/deposits/', {'sort': 'pref_rate'})
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_cursor_stable_across_ties(self):
+        seen = []
+        url, params = '/api/deposits/', {'sort': 'pref_rate', 'page_size': 4}
+        while url:
+            response = self.client.get(url, params)
+            seen.extend((item['fin_prdt_cd'], Decimal(item['best_pref_rate'])) for item in response.data['results'])
+            url, params = response.data['next'], None
+
+        codes = [code for code, _ in seen]
+        self.assertEqual(len(codes), 25)
+        self.assertEqual(len(set(codes)), 25)
+        # 금리 내림차순, 같은 금리는 상품코드 순
+        self.assertEqual(seen, sorted(seen, key=lambda item: (-item[1], item[0])))
+
+
+class QueryBudgetTestCase(TestCase):
+    """목록 API의 쿼리 수가 상품 수와 무관하게 고정되어 있는지 확인"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='tester', password='pass1234')
+        self.client.force_authenticate(self.user)
+
+    def subscribe_all(self):
+        DepositSubscription.objects.bulk_create(
+            [DepositSubscription(user=self.user, product=p) for p in DepositProduct.objects.all()],
+            ignore_conflicts=True,
+        )
+        SavingSubscription.objects.bulk_create(
+            [SavingSubscription(user=self.user, product=p) for p in SavingProduct.objects.all()],
+            ignore_conflicts=True,
+        )
+
+    def assertQueryBudget(self, url, budget):
+        """상품 수를 늘려도 같은 쿼리 수(budget)로 응답하는지 확인 (목록 캐시가 빈 상태 기준)"""
+        create_catalog(2)
+        self.subscribe_all()
+        cache.clear()
+        with self.assertNumQueries(budget):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        create_catalog(20, start=2)
+        self.subscribe_all()
+        cache.clear()
+        with self.assertNumQueries(budget):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_deposit_list(self):
+        # 카탈로그 버전 조회 1 + 상품/은행 1 + 옵션 1
+        response = self.assertQueryBudget('/api/deposits/', 3)
+        data = json.loads(response.content)
+        self.assertEqual(len(data), 22)
+        self.assertEqual(len(data[0]['options']), 2)
+        # 옵션은 옵션 테이블의 값만 담고 상품 참조는 반복하지 않음
+        self.assertEqual(
+            set(data[0]['options'][0]),
+            {'intr_rate_type', 'intr_rate_type_nm', 'save_trm', 'intr_rate', 'intr_rate2'},
+        )
+
+    def test_saving_list(self):
+        response = self.assertQueryBudget('/api/savings/', 3)
+        self.assertEqual(len(json.loads(response.content)), 22)
+
+    def test_deposit_list_filtered(self):
+        response = self.assertQueryBudget('/api/deposits/?bank=B1', 2)
+        # 필터가 있으면 page_size를 생략해도 기본 크기로 나눔
+        self.assertEqual(len(response.data['results']), 7)
+
+    def test_deposit_list_paginated(self):
+        response = self.assertQueryBudget('/api/deposits/?sort=pref_rate&page_size=5', 2)
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_user_subscribed_deposits(self):
+        response = self.assertQueryBudget('/api/deposits/user-subscriptions/', 2)
+        self.assertEqual(len(response.data), 22)
+        self.assertEqual(len(response.data[0]['options']), 2)
+
+    def test_user_subscribed_savings(self):
+        response = self.assertQueryBudget('/api/savings/user-subscriptions/', 2)
+        self.assertEqual(len(response.data), 22)
+
+
+class OptionBackfillTestCase(TransactionTestCase):
+    """options JSON을 옵션 행과 최고 금리로 옮기는 마이그레이션 0006"""
+
+    before = [('deposits', '0005_clear_blank_option_rates')]
+    after = [('deposits', '0006_typed_option_rates')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        old_apps = executor.loader.project_state(self.before).apps
+        old_apps.get_model('deposits', 'Bank').objects.create(fin_co_no='B0', kor_co_nm='은행0')
+        old_apps.get_model('deposits', 'SavingProduct').objects.create(
+            fin_prdt_cd='S0', bank_id='B0', fin_prdt_nm='적금0', dcls_strt_day='20240101', fin_co_subm_day='',
+            options=[
+                {'intr_rate_type': 'S', 'rsrv_type': 'F', 'save_trm': '12', 'intr_rate': '3.1', 'intr_rate2': None},
+                {'intr_rate_type': 'M', 'rsrv_type': 'F', 'save_trm': '12', 'intr_rate': 2.9, 'intr_rate2': '3.5'},
+                {'intr_rate_type': 'S', 'rsrv_type': 'F', 'save_trm': '6', 'intr_rate': '3.0', 'intr_rate2': '3.2'},
+                # 기간이 없는 옵션은 버림
+                {'intr_rate_type': 'S', 'rsrv_type': 'S', 'save_trm': '', 'intr_rate': '9.0', 'intr_rate2': '9.0'},
+            ],
+        )
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_json_options_become_typed_rows(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        new_apps = executor.loader.project_state(self.after).apps
+        option_model = new_apps.get_model('deposits', 'SavingOption')
+        term_rate_model = new_apps.get_model('deposits', 'SavingTermRate')
+        product = new_apps.get_model('deposits', 'SavingProduct').objects.get(pk='S0')
+
+        self.assertEqual(option_model.objects.filter(product_id='S0').count(), 3)
+        self.assertEqual(option_model.objects.get(product_id='S0', intr_rate_type='S', save_trm=12).intr_rate2, None)
+        self.assertEqual((product.best_base_rate, product.best_pref_rate), (Decimal('3.10'), Decimal('3.50')))
+        self.assertEqual(
+            {row.save_trm: (row.best_base_rate, row.best_pref_rate) for row in term_rate_model.objects.all()},
+            {12: (Decimal('3.10'), Decimal('3.50')), 6: (Decimal('3.00'), Decimal('3.20'))},
+        )
+        self.assertEqual(product.payload_hash, '')
+
+
+class DummyFixtureTestCase(TestCase):
+    """문서의 설치 절차대로 더미 사용자/상품 fixture를 불러올 수 있는지 확인"""
+    fixtures = ['dummy_accounts.json', 'dummy_deposits.json']
+
+    def test_fixture_loads_with_option_rows(self):
+        self.assertEqual(DepositProduct.objects.count(), 124)
+        self.assertEqual(DepositOption.objects.count(), 788)
+        self.assertEqual(SavingOption.objects.count(), 503)
+        # 옵션이 있는 상품은 최고 금리와 기간별 금리, 가입자 수까지 채워져 있음
+        self.assertFalse(DepositProduct.objects.filter(deposit_options__isnull=False, best_pref_rate__isnull=True).exists())
+        self.assertEqual(
+            DepositTermRate.objects.values('product_id', 'save_trm').distinct().count(),
+            DepositOption.objects.values('product_id', 'save_trm').distinct().count(),
+        )
+        self.assertEqual(reconcile_subscriber_counts('deposit'), 0)
+        self.assertEqual(reconcile_subscriber_counts('saving'), 0)
+
+        response = self.client.get('/api/deposits/', {'term': 12, 'sort': 'pref_rate'})
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertTrue(response.data['results'][0]['options'])
+
+
+class CatalogCacheTestCase(TestCase):
+    """카탈로그 버전별 목록 캐시와 조건부 GET"""
+
+    def setUp(self):
+        cache.clear()
+        create_catalog(5)
+
+    def test_cached_list_needs_no_queries(self):
+        self.client.get('/api/deposits/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/deposits/')
+        self.assertEqual(len(json.loads(response.content)), 5)
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get('/api/deposits/')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/deposits/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_gzip_payload(self):
+        response = self.client.get('/api/savings/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))), 5)
+
+    def test_new_version_changes_etag(self):
+        etag = self.client.get('/api/deposits/')['ETag']
+        create_catalog(2, start=5)
+        publish_version('deposit', {'inserted': 2, 'updated': 0, 'withdrawn': 0, 'unchanged': 5})
+
+        response = self.client.get('/api/deposits/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(json.loads(response.content)), 7)
+
+
+class CatalogChangesTestCase(TestCase):
+    """카탈로그 버전 사이의 변경 목록"""
+
+    def setUp(self):
+        cache.clear()
+        create_catalog(5)
+        self.first = publish_version(
+            'deposit',
+            {'inserted': 5, 'updated': 0, 'withdrawn': 0, 'unchanged': 0},
+            {'inserted': [f'D{i}' for i in range(5)], 'updated': [], 'withdrawn': []},
+        ).pk
+
+    def publish(self, inserted=(), updated=(), withdrawn=()):
+        summary = {'inserted': len(inserted), 'updated': len(updated), 'withdrawn': len(withdrawn), 'unchanged': 0}
+        changes = {'inserted': inserted, 'updated': updated, 'withdrawn': withdrawn}
+        return publish_version('deposit', summary, changes).pk
+
+    def test_changes_since_version(self):
+        self.assertEqual(self.client.get('/api/deposits/')['X-Catalog-Version'], str(self.first))
+
+        create_catalog(1, start=5)
+        self.publish(inserted=['D5'], updated=['D1'])
+        DepositProduct.objects.filter(pk='D2').update(dcls_end_day='20260101')
+        latest = self.publish(updated=['D5'], withdrawn=['D2'])
+
+        data = self.client.get(f'/api/deposits/changes/?since={self.first}').json()
+        self.assertEqual(data['version'], latest)
+        self.assertFalse(data['reset'])
+        # 판매 종료된 D2는 tombstones에만 있음
+        self.assertEqual([p['fin_prdt_cd'] for p in data['products']], ['D1', 'D5'])
+        self.assertEqual(len(data['products'][0]['options']), 2)
+        self.assertEqual(data['tombstones'], ['D2'])
+
+        # 최신 버전이면 빈 목록
+        data = self.client.get(f'/api/deposits/changes/?since={latest}').json()
+        self.assertEqual((data['products'], data['tombstones'], data['reset']), ([], [], False))
+
+    def test_reset_when_history_unknown(self):
+        # 처음 받는 클라이언트나 다른 상품 유형의 버전
+        self.assertTrue(self.client.get('/api/deposits/changes/?since=0').json()['reset'])
+        saving_version = publish_version('saving', {'inserted': 5, 'updated': 0, 'withdrawn': 0, 'unchanged': 0}).pk
+        self.publish(updated=['D1'])
+        self.assertTrue(self.client.get(f'/api/deposits/changes/?since={saving_version}').json()['reset'])
+
+        # 변경 내역 없이 발행된 버전을 건너야 하는 경우
+        publish_version('deposit', {'inserted': 0, 'updated': 1, 'withdrawn': 0, 'unchanged': 4})
+        self.assertTrue(self.client.get(f'/api/deposits/changes/?since={self.first}').json()['reset'])
+
+    def test_invalid_since(self):
+        response = self.client.get('/api/deposits/changes/?since=abc')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('since', response.json())
+
+
+class SubscriptionStatusTestCase(TestCase):
+    """여러 상품의 가입 여부 일괄 조회"""
+
+    def setUp(self):
+        create_catalog(5)
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='tester', password='pass1234')
+        self.client.force_authenticate(self.user)
+        DepositSubscription.objects.create(user=self.user, product_id='D1')
+        DepositSubscription.objects.create(user=self.user, product_id='D3')
+        SavingSubscription.objects.create(user=self.user, product_id='S2')
+
+    def test_status_for_given_ids(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/subscriptions/status/?deposit_ids=D0,D1,D2&saving_ids=S2,S4')
+        self.assertEqual(response.data, {'deposits': ['D1'], 'savings': ['S2']})
+
+    def test_status_without_ids_returns_all(self):
+        response = self.client.post('/api/subscriptions/status/', {}, format='json')
+        self.assertEqual(response.data, {'deposits': ['D1', 'D3'], 'savings': ['S2']})
+
+    def test_status_with_json_body(self):
+        response = self.client.post(
+            '/api/subscriptions/status/', {'deposit_ids': ['D3', 'D4']}, format='json'
+        )
+        self.assertEqual(response.data, {'deposits': ['D3'], 'savings': []})
+
+    def test_list_annotates_is_subscribed(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/deposits/?with_subscription=true')
+        subscribed = {item['fin_prdt_cd'] for item in response.data if item['is_subscribed']}
+        self.assertEqual(subscribed, {'D1', 'D3'})
+
+
+class BulkSubscribeTestCase(TestCase):
+    """일괄 가입/취소와 Idempotency-Key 재시도"""
+
+    def setUp(self):
+        create_catalog(5)
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='tester', password='pass1234')
+        self.client.force_authenticate(self.user)
+        DepositSubscription.objects.create(user=self.user, product_id='D0')
+        self.operations = {'operations': [
+            {'product_type': 'deposit', 'product_id': 'D0', 'action': 'subscribe'},
+            {'product_type': 'deposit', 'product_id': 'D1', 'action': 'subscribe'},
+            {'product_type': 'saving', 'product_id': 'S2', 'action': 'subscribe'},
+            {'product_type': 'deposit', 'product_id': 'D0', 'action': 'unsubscribe'},
+        ]}
+
+    def subscribed(self):
+        return (
+            set(DepositSubscription.objects.filter(user=self.user).values_list('product_id', flat=True)),
+            set(SavingSubscription.objects.filter(user=self.user).values_list('product_id', flat=True)),
+        )
+
+    def test_bulk_operations(self):
+        response = self.client.post('/api/subscriptions/bulk/', self.operations, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['deposits']['removed'], 1)
+        self.assertEqual(self.subscribed(), ({'D1'}, {'S2'}))
+
+    def test_idempotent_retry(self):
+        first = self.client.post(
+            '/api/subscriptions/bulk/', self.operations, format='json', HTTP_IDEMPOTENCY_KEY='abc'
+        )
+        DepositSubscription.objects.create(user=self.user, product_id='D0')
+        with self.assertNumQueries(1):
+            retry = self.client.post(
+                '/api/subscriptions/bulk/', self.operations, format='json', HTTP_IDEMPOTENCY_KEY='abc'
+            )
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.data, first.data)
+        # 재시도는 다시 적용되지 않음
+        self.assertEqual(self.subscribed(), ({'D0', 'D1'}, {'S2'}))
+
+    def test_reused_key_with_different_body(self):
+        self.client.post('/api/subscriptions/bulk/', self.operations, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        response = self.client.post(
+            '/api/subscriptions/bulk/',
+            {'operations': [{'product_type': 'saving', 'product_id': 'S1'}]},
+            format='json', HTTP_IDEMPOTENCY_KEY='abc',
+        )
+        self.assertEqual(response.status_code, 409)
+
+    def test_unknown_product_rolls_back(self):
+        response = self.client.post('/api/subscriptions/bulk/', {'operations': [
+            {'product_type': 'deposit', 'product_id': 'D1'},
+            {'product_type': 'saving', 'product_id': 'NOPE'},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.subscribed(), ({'D0'}, set()))
+
+
+class MaturityRankingTestCase(TestCase):
+    """예금 만기 수령액 계산과 순위"""
+
+    def setUp(self):
+        cache.clear()
+        clear_cached_arrays()
+        create_catalog(3)
+        # D1은 월복리 옵션을 추가로 가짐, D2는 판매 종료
+        DepositOption.objects.create(
+            product_id='D1', intr_rate_type='M', intr_rate_type_nm='복리',
+            save_trm=12, intr_rate='3.00', intr_rate2='4.00',
+        )
+        DepositProduct.objects.filter(pk='D2').update(dcls_end_day='20000101')
+
+    def test_simple_and_compound_amounts(self):
+        response = self.client.get('/api/deposits/maturity-ranking/?amount=10000000&term=12')
+        results = response.data['results']
+        self.assertEqual([item['fin_prdt_cd'] for item in results], ['D1', 'D0'])
+
+        # 월복리 4%: 10,000,000 * ((1 + 0.04/12)^12 - 1) = 407,415원, 세금 62,741원
+        self.assertEqual(results[0]['intr_rate_type'], 'M')
+        self.assertEqual(results[0]['pref'], {'interest': 407415, 'tax': 62741, 'amount': 10344674})
+        # 단리 3.5%: 350,000원, 세금 53,900원
+        self.assertEqual(results[1]['pref'], {'interest': 350000, 'tax': 53900, 'amount': 10296100})
+        self.assertEqual(results[1]['base']['interest'], 300000)
+
+    def test_arrays_cached_between_requests(self):
+        self.client.get('/api/deposits/maturity-ranking/')
+        with self.assertNumQueries(0):
+            self.client.get('/api/deposits/maturity-ranking/?term=6&rate=base&limit=1')
+
+    def test_invalid_params(self):
+        response = self.client.get('/api/deposits/maturity-ranking/?amount=abc')
+        self.assertEqual(response.status_code, 400)
+
+
+class SavingSimulationTestCase(TestCase):
+    """적금 시나리오 일괄 시뮬레이션"""
+
+    def setUp(self):
+        cache.clear()
+        clear_cached_arrays()
+        create_catalog(3)
+        self.client = APIClient()
+        SavingOption.objects.create(
+            product_id='S1', intr_rate_type='M', intr_rate_type_nm='복리',
+            rsrv_type='F', rsrv_type_nm='자유적립식',
+            save_trm=12, intr_rate='3.00', intr_rate2='4.00',
+        )
+
+    def test_scenarios(self):
+        response = self.client.post('/api/savings/simulate/', {
+            'scenarios': [{'amount': 100000, 'term': 12}, {'amount': 100000, 'term': 24}],
+            'limit': 2,
+        }, format='json')
+        twelve, twenty_four = response.data['results']
+
+        # 월복리 4%가 단리 3.5%보다 유리
+        self.assertEqual([p['fin_prdt_cd'] for p in twelve['products']], ['S1', 'S0'])
+        self.assertEqual(twelve['products'][0]['interest'], 26320)
+        self.assertEqual(twelve['products'][0]['amount'], 1222267)
+        # 단리: 100,000 * 3.5% / 12 * (12 * 13 / 2) = 22,750원
+        self.assertEqual(twelve['products'][1]['interest'], 22750)
+        self.assertEqual(twelve['products'][1]['effective_yield'], 1.6)
+        # 24개월 옵션은 없음
+        self.assertEqual(twenty_four['products'], [])
+
+    def test_products_without_term_are_skipped(self):
+        # S0에는 12개월 옵션이 없어도 나머지 상품은 순위에 나와야 함
+        SavingOption.objects.filter(product_id='S0', save_trm=12).delete()
+        response = self.client.post('/api/savings/simulate/', {
+            'scenarios': [{'amount': 100000, 'term': 12}],
+        }, format='json')
+        codes = [p['fin_prdt_cd'] for p in response.data['results'][0]['products']]
+        self.assertEqual(codes[0], 'S1')
+        self.assertNotIn('S0', codes)
+        self.assertIn('S2', codes)
+
+    def test_too_many_scenarios(self):
+        response = self.client.post('/api/savings/simulate/', {
+            'scenarios': [{'amount': 100000, 'term': 12}] * 51,
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class DepositAllocationTestCase(TestCase):
+    """예금자보호 한도를 고려한 예금 배분"""
+
+    def setUp(self):
+        cache.clear()
+        clear_cached_arrays()
+        create_catalog(3)
+        # B0 은행의 D0 상품이 가장 유리하지만 최고한도는 3천만원
+        DepositOption.objects.filter(product_id='D0').update(intr_rate2='5.00')
+        DepositProduct.objects.filter(pk='D0').update(max_limit=30000000)
+        DepositOption.objects.filter(product_id='D1').update(intr_rate2='4.00')
+        self.client = APIClient()
+
+    def test_respects_limits(self):
+        response = self.client.get('/api/deposits/allocation/?amount=120000000&term=12')
+        plan = response.data
+        principals = {item['fin_prdt_cd']: item['principal'] for item in plan['allocations']}
+
+        self.assertEqual(principals['D0'], 30000000)
+        # 원금 + 세전 이자(4%)가 5천만원을 넘지 않음
+        self.assertEqual(principals['D1'], int(50000000 / 1.04))
+        for item in plan['allocations']:
+            self.assertLessEqual(item['principal'] + item['interest'], 50000000)
+        self.assertEqual(plan['allocated'] + plan['unallocated'], 120000000)
+        self.assertEqual(plan['uninsured'], 0)
+
+    def test_uses_user_assets_and_preferred_bank(self):
+        user = User.objects.create_user(
+            username='rich', password='pass1234', assets=200000000, preferred_bank='B2'
+        )
+        self.client.force_authenticate(user)
+        plan = self.client.get('/api/deposits/allocation/?term=12').data
+
+        self.assertEqual(plan['amount'], 200000000)
+        self.assertEqual(plan['unallocated'], 0)
+        # 모든 은행 한도를 채우고 남은 금액은 선호 은행 상품에 배분
+        self.assertGreater(plan['uninsured'], 0)
+        preferred = [item for item in plan['allocations'] if item['fin_co_no'] == 'B2']
+        self.assertEqual(sum(item['principal'] for item in preferred), int(50000000 / 1.035) + plan['uninsured'])
+
+
+class ProductSearchTestCase(TestCase):
+    """n-gram 색인 검색"""
+
+    def setUp(self):
+        create_catalog(4)
+        DepositProduct.objects.filter(pk='D0').update(fin_prdt_nm='e-그린세이브예금', spcl_cnd='급여이체 시 우대')
+        DepositProduct.objects.filter(pk='D1').update(fin_prdt_nm='첫거래우대 정기예금', join_member='실명의 개인')
+        DepositProduct.objects.filter(pk='D2').update(etc_note='급여 관련 안내')
+        rebuild_index('deposit')
+
+    def test_ranked_by_relevance(self):
+        # 검색어 n-gram의 절반 이상이 일치해야 함 (D2의 '급여'만으로는 부족)
+        response = self.client.get('/api/deposits/', {'q': '급여이체'})
+        self.assertEqual([item['fin_prdt_cd'] for item in response.data['results']], ['D0'])
+
+        response = self.client.get('/api/deposits/', {'q': '우대'})
+        self.assertEqual([item['fin_prdt_cd'] for item in response.data['results']], ['D1', 'D0'])
+
+    def test_uses_index_without_scanning_text(self):
+        # 관련도를 붙인 상품 페이지 1 + 옵션 1
+        with self.assertNumQueries(2) as context:
+            self.client.get('/api/deposits/', {'q': '그린세이브'})
+        self.assertNotIn('LIKE', context.captured_queries[0]['sql'])
+
+    def test_results_not_capped_before_pagination(self):
+        create_catalog(30, start=4)
+        DepositProduct.objects.update(fin_prdt_nm='급여우대 정기예금')
+        rebuild_index('deposit')
+
+        codes = []
+        response = self.client.get('/api/deposits/', {'q': '급여우대', 'page_size': 20})
+        while True:
+            codes.extend(item['fin_prdt_cd'] for item in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(len(codes), 34)
+        self.assertEqual(len(set(codes)), 34)
+
+    def test_short_query_rejected(self):
+        response = self.client.get('/api/deposits/', {'q': '예'})
+        self.assertEqual(response.status_code, 400)
+
+
+class RateHistoryTestCase(TestCase):
+    """금리 변경 이력과 일별 시장 평균"""
+
+    def setUp(self):
+        create_catalog(2)
+        self.day1 = datetime.date(2026, 1, 1)
+        self.day2 = datetime.date(2026, 1, 2)
+        record_snapshots('deposit', ['D0', 'D1'], self.day1)
+        rollup_daily('deposit', self.day1)
+
+    def test_only_changed_options_recorded(self):
+        DepositOption.objects.filter(product_id='D0', save_trm=12).update(intr_rate2='4.10')
+        self.assertEqual(record_snapshots('deposit', ['D0', 'D1'], self.day2), 1)
+
+        response = self.client.get('/api/deposits/D0/rate-history/', {'term': 12})
+        history = response.data['history']
+        self.assertEqual([row['captured_on'] for row in history], ['2026-01-01', '2026-01-02'])
+        self.assertEqual(history[-1]['intr_rate2'], '4.10')
+
+    def test_market_history_from_rollup(self):
+        DepositOption.objects.filter(product_id='D0', save_trm=12).update(intr_rate2='4.50')
+        rollup_daily('deposit', self.day2)
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/rates/market-history/', {'term': 12})
+        history = response.data['history']
+        self.assertEqual([row['avg_pref_rate'] for row in history], ['3.50', '4.00'])
+        self.assertEqual(history[1]['max_pref_rate'], '4.50')
+        self.assertEqual(history[1]['option_count'], 2)
+
+
+class FinlifeClientTestCase(TestCase):
+    """로컬 스텁 서버를 상대로 한 API 클라이언트 재시도와 수집"""
+
+    def test_retries_transient_failures(self):
+        with FinlifeStubServer(products_per_sector=45, fail_first=1) as server:
+            with FinlifeClient('key', base_url=server.base_url, backoff_base=0.001) as client:
+                results = fetch_products('deposit', ['020000', '030300'], client)
+
+        self.assertEqual(len(results['020000']['base_list']), 45)
+        self.assertEqual(results['030300']['pages'], 3)
+        # 페이지마다 한 번씩 실패 후 재시도
+        self.assertEqual(client.stats()['calls'], 6)
+        self.assertEqual(client.stats()['retries'], 6)
+
+    def test_gives_up_without_leaking_key(self):
+        with FinlifeStubServer(fail_rate=1.0) as server:
+            with FinlifeClient('secret-key', base_url=server.base_url, max_retries=2, backoff_base=0.001) as client:
+                with self.assertRaises(FinlifeError) as context:
+                    client.get_page('saving', '020000', 1)
+
+        self.assertEqual(len(server.requests), 3)
+        self.assertNotIn('secret-key', str(context.exception))
+        self.assertEqual(client.stats()['failures'], 1)
+
+    def test_refresh_catalog_against_stub(self):
+        with FinlifeStubServer(products_per_sector=5) as server:
+            with override_settings(FINLIFE_BASE_URL=server.base_url):
+                summary = refresh_catalog('deposit', '020000')
+
+        self.assertEqual(summary['deposit']['inserted'], 5)
+        self.assertEqual(summary['deposit']['api_calls']['calls'], 1)
+        self.assertEqual(DepositProduct.objects.count(), 5)
+        self.assertEqual(DepositOption.objects.count(), 20)
+
+
+class RecordReplayTestCase(TestCase):
+    """FINLIFE 응답 녹화와 재생"""
+
+    def setUp(self):
+        self.recordings = tempfile.TemporaryDirectory()
+        self.addCleanup(self.recordings.cleanup)
+
+    def test_replay_reproduces_recorded_ingestion(self):
+        with FinlifeStubServer(products_per_sector=30) as server:
+            with override_settings(FINLIFE_BASE_URL=server.base_url, FINLIFE_RECORDINGS_DIR=self.recordings.name):
+                recorded = refresh_catalog('saving', '030300', mode='record')
+
+        path = recording_path(self.recordings.name, 'saving', '030300', 2)
+        entries = list(read_recording(path))
+        self.assertEqual(entries[0][0], 'header')
+        self.assertEqual(entries[0][1]['max_page_no'], 2)
+        self.assertEqual(sum(1 for kind, _ in entries if kind == 'base'), 10)
+
+        # 녹화 파일을 스텁 서버로 다시 내보낼 수 있음
+        with FinlifeStubServer(fixtures_dir=self.recordings.name) as server:
+            with FinlifeClient('key', base_url=server.base_url) as client:
+                self.assertEqual(len(fetch_products('saving', ['030300'], client)['030300']['base_list']), 30)
+
+        SavingProduct.objects.all().delete()
+        # 스텁 서버가 꺼진 상태에서도 녹화 파일만으로 같은 결과
+        with override_settings(FINLIFE_RECORDINGS_DIR=self.recordings.name):
+            replayed = refresh_catalog('saving', '030300', mode='replay')
+
+        self.assertEqual(replayed['saving']['inserted'], recorded['saving']['inserted'])
+        self.assertEqual(SavingProduct.objects.count(), 30)
+        self.assertEqual(SavingOption.objects.count(), 120)
+
+    def test_replay_writes_each_page_as_it_is_read(self):
+        with FinlifeStubServer(products_per_sector=30) as server:
+            with override_settings(FINLIFE_BASE_URL=server.base_url, FINLIFE_RECORDINGS_DIR=self.recordings.name):
+                refresh_catalog('saving', '030300', mode='record')
+        first_page = [
+            data['fin_prdt_cd']
+            for kind, data in read_recording(recording_path(self.recordings.name, 'saving', '030300', 1))
+            if kind == 'base'
+        ]
+        SavingProduct.objects.filter(pk__in=first_page[:3]).update(fin_prdt_nm='변경 전', payload_hash='')
+        SavingProduct.objects.create(fin_prdt_cd='GONE', bank_id=SavingProduct.objects.first().bank_id,
+                                     fin_prdt_nm='사라진 상품', sector_code='030300')
+
+        # 다음 페이지를 읽을 때는 앞 페이지의 상품이 이미 저장되어 있어야 함
+        written_before_page = []
+        get_page = ReplayFinlifeClient.get_page
+
+        def recording_get_page(client, product_type, sector_code, page_no):
+            written_before_page.append(SavingProduct.objects.exclude(fin_prdt_nm='변경 전').count())
+            return get_page(client, product_type, sector_code, page_no)
+
+        with override_settings(FINLIFE_RECORDINGS_DIR=self.recordings.name):
+            with mock.patch.object(ReplayFinlifeClient, 'get_page', recording_get_page):
+                replayed = refresh_catalog('saving', '030300', mode='replay')
+
+        # 첫 페이지에서 바뀐 3개 상품은 두 번째 페이지를 읽기 전에 저장됨
+        self.assertEqual(written_before_page, [28, 31])
+        self.assertEqual(replayed['saving']['updated'], 3)
+        self.assertEqual(replayed['saving']['withdrawn'], 1)
+        self.assertEqual(replayed['saving']['unchanged'], 27)
+        self.assertEqual(replayed['saving']['timings']['030300']['pages'], 2)
+
+    def test_missing_recording_fails(self):
+        with override_settings(FINLIFE_RECORDINGS_DIR=self.recordings.name):
+            with self.assertRaises(FinlifeError):
+                refresh_catalog('deposit', '020000', mode='replay')
+
+
+class RateMatrixTestCase(TestCase):
+    """금융회사 x 기간 금리표"""
+
+    def setUp(self):
+        cache.clear()
+        create_catalog(3)
+        DepositTermRate.objects.bulk_create([
+            DepositTermRate(product_id='D0', save_trm=6, best_base_rate='2.50', best_pref_rate='2.80'),
+            DepositTermRate(product_id='D0', save_trm=12, best_base_rate='3.00', best_pref_rate='3.50'),
+            DepositTermRate(product_id='D1', save_trm=12, best_base_rate='2.00', best_pref_rate='4.00'),
+            DepositTermRate(product_id='D2', save_trm=12, best_base_rate='3.00', best_pref_rate='3.00'),
+        ])
+        rebuild_rate_matrices('deposit')
+
+    def test_matrix_document(self):
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/rates/matrix/', {'sector_code': '020000'})
+        data = json.loads(response.content)
+
+        banks = {bank['fin_co_no']: bank['rates'] for bank in data['banks']}
+        self.assertEqual(banks['B0'], {'6': {'base': 2.5, 'pref': 2.8}, '12': {'base': 3.0, 'pref': 3.5}})
+        self.assertEqual(data['aggregates']['12']['pref'], {'avg': 3.5, 'median': 3.5, 'max': 4.0})
+        self.assertEqual(data['aggregates']['12']['products'], 3)
+        self.assertIsNone(data['aggregates']['24']['pref'])
+
+    def test_served_from_db_after_cache_loss(self):
+        cache.clear()
+        etag = self.client.get('/api/rates/matrix/')['ETag']
+        response = self.client.get('/api/rates/matrix/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_not_built(self):
+        response = self.client.get('/api/rates/matrix/', {'product_type': 'saving'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_built_on_demand_when_rates_exist(self):
+        # 마이그레이션으로 기간별 금리만 채워지고 금리표는 아직 없는 경우
+        RateMatrix.objects.all().delete()
+        cache.clear()
+        response = self.client.get('/api/rates/matrix/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.content)['banks']), 3)
+        self.assertTrue(RateMatrix.objects.filter(product_type='deposit').exists())
+
+
+class RateWatchTestCase(TestCase):
+    """수집 후 바뀐 상품과 금리 알림 조건 대조"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='tester', password='pass1234')
+        self.client.force_authenticate(self.user)
+        create_catalog(3)
+        DepositTermRate.objects.bulk_create([
+            DepositTermRate(product_id='D0', save_trm=12, best_base_rate='3.50', best_pref_rate='3.80'),
+            DepositTermRate(product_id='D1', save_trm=12, best_base_rate='3.00', best_pref_rate='3.20'),
+            DepositTermRate(product_id='D2', save_trm=12, best_base_rate='3.90', best_pref_rate='4.10'),
+        ])
+
+    def changes(self, inserted=(), updated=()):
+        return {'inserted': list(inserted), 'updated': list(updated), 'withdrawn': []}
+
+    def test_threshold_watches(self):
+        watch = RateWatch.objects.create(user=self.user, save_trm=12, min_rate='3.50')
+        RateWatch.objects.create(user=self.user, save_trm=12, min_rate='4.00', bank_id='B1')
+        RateWatch.objects.create(user=self.user, save_trm=6, min_rate='3.00')
+
+        self.assertEqual(evaluate_watches('deposit', self.changes(inserted=['D0', 'D1', 'D2'])), 2)
+        self.assertEqual(
+            sorted(RateNotification.objects.values_list('watch_id', 'fin_prdt_cd', 'rate')),
+            [(watch.pk, 'D0', Decimal('3.80')), (watch.pk, 'D2', Decimal('4.10'))],
+        )
+
+        # 같은 금리로 다시 바뀌어도 알림은 한 번만, 바뀌지 않은 상품은 대조하지 않음
+        evaluate_watches('deposit', self.changes(updated=['D0']))
+        self.assertEqual(evaluate_watches('deposit', self.changes(updated=['D1'])), 0)
+        self.assertEqual(RateNotification.objects.count(), 2)
+
+    def snapshot(self, code, rate, days_ago=0):
+        RateSnapshot.objects.create(
+            product_type='deposit', fin_prdt_cd=code, intr_rate_type='S', save_trm=12,
+            intr_rate=rate, intr_rate2=rate, captured_on=timezone.localdate() - datetime.timedelta(days=days_ago),
+        )
+
+    def test_subscribed_product_rate_change(self):
+        RateWatch.objects.create(user=self.user, kind='subscription')
+        DepositSubscription.objects.create(user=self.user, product_id='D1')
+        DepositSubscription.objects.create(user=self.user, product_id='D2')
+        self.snapshot('D1', '3.00', days_ago=1)
+        self.snapshot('D1', '3.20')
+        # D2는 오늘 처음 기록된 이력뿐이라 바뀐 금리가 아님
+        self.snapshot('D2', '4.10')
+
+        self.assertEqual(evaluate_watches('deposit', self.changes(updated=['D1', 'D2']), version=1), 1)
+        notification = RateNotification.objects.get()
+        self.assertEqual((notification.fin_prdt_cd, notification.reason), ('D1', 'rate_change'))
+
+    def test_rate_change_back_to_earlier_value(self):
+        RateWatch.objects.create(user=self.user, kind='subscription')
+        DepositSubscription.objects.create(user=self.user, product_id='D1')
+        self.snapshot('D1', '3.20', days_ago=2)
+        self.snapshot('D1', '3.00', days_ago=1)
+        self.snapshot('D1', '3.20')
+
+        # 예전과 같은 금리로 돌아와도 새 버전의 변경이면 다시 알림, 같은 버전을 다시 대조하면 중복 없음
+        RateNotification.objects.create(
+            user=self.user, watch=RateWatch.objects.get(), product_type='deposit', fin_prdt_cd='D1',
+            save_trm=12, rate='3.20', reason='rate_change', version=1,
+        )
+        evaluate_watches('deposit', self.changes(updated=['D1']), version=3)
+        evaluate_watches('deposit', self.changes(updated=['D1']), version=3)
+        self.assertEqual(
+            list(RateNotification.objects.order_by('version').values_list('rate', 'version')),
+            [(Decimal('3.20'), 1), (Decimal('3.20'), 3)],
+        )
+
+    def test_failed_evaluation_keeps_published_version(self):
+        with FinlifeStubServer(products_per_sector=3) as server:
+            with override_settings(FINLIFE_BASE_URL=server.base_url):
+                with mock.patch('deposits.jobs.evaluate_watches', side_effect=RuntimeError('boom')):
+                    with self.assertRaises(RuntimeError):
+                        refresh_catalog('deposit', '030300')
+                # 상품 변경과 함께 버전과 금리 이력이 커밋되어 있어 다음 갱신이 변경을 놓치지 않음
+                version = CatalogVersion.objects.get(product_type='deposit')
+                self.assertEqual(len(version.changes['inserted']), 3)
+                self.assertEqual(RateSnapshot.objects.filter(fin_prdt_cd__in=version.changes['inserted']).count(), 12)
+
+                with mock.patch('deposits.jobs.create_version', side_effect=RuntimeError('boom')):
+                    with self.assertRaises(RuntimeError):
+                        refresh_catalog('deposit', '020000')
+                # 버전을 만들지 못하면 상품 변경도 함께 롤백
+                self.assertFalse(DepositProduct.objects.filter(fin_prdt_cd__startswith='D020000').exists())
+
+    def test_watch_and_notification_api(self):
+        response = self.client.post('/api/rate-watches/', {'product_type': 'deposit', 'save_trm': 12}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('min_rate', response.data)
+
+        response = self.client.post(
+            '/api/rate-watches/', {'product_type': 'deposit', 'save_trm': 12, 'min_rate': '4.00'}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        evaluate_watches('deposit', self.changes(inserted=['D2']))
+
+        data = self.client.get('/api/notifications/?unread=true').data
+        self.assertEqual(data['unread_count'], 1)
+        self.assertEqual(data['notifications'][0]['fin_prdt_cd'], 'D2')
+        self.assertEqual(self.client.post('/api/notifications/read/', {}, format='json').data['updated'], 1)
+        self.assertEqual(self.client.get('/api/notifications/').data['unread_count'], 0)
+
+
+class PortfolioTestCase(TestCase):
+    """가입 상품별 예상 이자와 포트폴리오 합계"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='tester', password='pass1234')
+        self.client.force_authenticate(self.user)
+        create_catalog(3)
+        DepositSubscription.objects.create(user=self.user, product_id='D0')
+        DepositSubscription.objects.create(user=self.user, product_id='D1')
+        SavingSubscription.objects.create(user=self.user, product_id='S0')
+
+    def test_expected_interest(self):
+        # 상품 유형별 가입+상품+은행 1 + 옵션 1
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/portfolio/')
+        self.assertEqual(response.status_code, 200)
+
+        deposit, _, saving = response.data['subscriptions']
+        # 금리가 같으면 짧은 기간: 1천만원 x 3.5% x 6/12
+        self.assertEqual(deposit['option']['save_trm'], 6)
+        self.assertEqual((deposit['interest'], deposit['tax'], deposit['amount']), (175000, 26950, 10148050))
+        # 월 30만원 6개월 단리: 30만원 x 3.5%/12 x (6 x 7 / 2)
+        self.assertEqual((saving['principal'], saving['interest'], saving['tax']), (1800000, 18375, 2829))
+
+        totals = response.data['totals']
+        self.assertEqual(totals['count'], 3)
+        self.assertEqual(totals['net_interest'], 148050 * 2 + 15546)
+        self.assertEqual([bank['fin_co_no'] for bank in response.data['by_bank']], ['B0', 'B1'])
+        self.assertEqual(response.data['by_bank'][0]['count'], 2)
+        self.assertEqual(response.data['by_term'][0]['save_trm'], 6)
+
+    def test_term_and_amount(self):
+        response = self.client.get('/api/portfolio/?term=12&deposit_amount=20000000&rate=base')
+        deposit = response.data['subscriptions'][0]
+        self.assertEqual(deposit['option']['save_trm'], 12)
+        self.assertEqual(deposit['interest'], 600000)
+
+        # 해당 기간의 옵션이 없으면 이자 없이 가입 내역만
+        deposit = self.client.get('/api/portfolio/?term=36').data['subscriptions'][0]
+        self.assertIsNone(deposit['option'])
+        self.assertEqual(deposit['amount'], 0)
+
+    def test_invalid_params(self):
+        self.assertEqual(self.client.get('/api/portfolio/?rate=max').status_code, 400)
+        self.assertEqual(self.client.get('/api/portfolio/?saving_amount=abc').status_code, 400)
+
+
+class CompareProductsTestCase(TestCase):
+    """상품 비교 (공통 기간 축과 최고 상품 대비 차이)"""
+
+    def setUp(self):
+        cache.clear()
+        create_catalog(3)
+        DepositOption.objects.filter(product_id='D1', save_trm=12).update(intr_rate2='4.00')
+        DepositOption.objects.create(
+            product_id='D2', intr_rate_type='M', intr_rate_type_nm='복리', save_trm=24,
+            intr_rate='3.60', intr_rate2=None,
+        )
+
+    def test_columnar_comparison(self):
+        # 카탈로그 버전 1 + 상품/은행 1 + 옵션 1
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/compare/?ids=D2,D0,D1,D9')
+        data = response.json()
+        self.assertEqual(data['products']['fin_prdt_cd'], ['D0', 'D1', 'D2'])
+        self.assertEqual(data['missing'], ['D9'])
+        self.assertEqual(data['terms'], [6, 12, 24])
+        self.assertEqual(data['pref_rates'][1], [3.5, 4.0, 3.5])
+        self.assertEqual(data['best_products'], [0, 1, 2])
+        self.assertEqual(data['deltas'][1], [-0.5, 0.0, -0.5])
+        # 우대금리가 없으면 기본금리, 해당 기간 옵션이 없으면 null
+        self.assertEqual(data['pref_rates'][2], [None, None, 3.6])
+
+        # 순서가 달라도 같은 상품 묶음이면 캐시된 본문 재사용
+        with self.assertNumQueries(0):
+            cached = self.client.get('/api/compare/?ids=D1,D9,D0,D2')
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(
+            self.client.get('/api/compare/?ids=D0,D1,D2,D9', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304
+        )
+
+    def test_invalid_requests(self):
+        response = self.client.get('/api/compare/')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.data)
+        ids = ','.join(f'D{i}' for i in range(21))
+        self.assertEqual(self.client.get(f'/api/compare/?ids={ids}').status_code, 400)
+        self.assertEqual(self.client.get('/api/compare/?ids=X1,X2').status_code, 404)
+        self.assertEqual(self.client.get('/api/compare/?ids=S0&product_type=saving').status_code, 200)
+
+
+class AutocompleteTestCase(TestCase):
+    """금융회사/상품명 자동완성"""
+
+    def setUp(self):
+        cache.clear()
+        clear_cached_tries()
+        create_catalog(3)
+        Bank.objects.filter(pk='B0').update(kor_co_nm='국민은행')
+        Bank.objects.filter(pk='B1').update(kor_co_nm='신한은행')
+        DepositProduct.objects.filter(pk='D0').update(fin_prdt_nm='KB Star 정기예금')
+        DepositProduct.objects.filter(pk='D1').update(fin_prdt_nm='쏠편한 정기예금')
+        DepositProduct.objects.filter(pk='D2').update(fin_prdt_nm='국민수퍼정기예금', dcls_end_day='20200101')
+        SavingProduct.objects.filter(pk='S0').update(fin_prdt_nm='국민 첫재테크적금')
+        DepositProduct.objects.filter(pk='D1').update(subscriber_count=1)
+
+    def suggestions(self, query, **params):
+        response = self.client.get('/api/autocomplete/', {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [(item['type'], item['id']) for item in response.json()['results']]
+
+    def test_prefix_of_any_word_ranked_by_popularity(self):
+        # 판매 종료된 D2는 제외, 가입자가 있는 D1이 먼저
+        self.assertEqual(self.suggestions('정기'), [('deposit', 'D1'), ('deposit', 'D0')])
+        self.assertEqual(self.suggestions('kb s'), [('deposit', 'D0')])
+        self.assertEqual(self.suggestions('국민', type='bank'), [('bank', 'B0')])
+
+    def test_choseong_and_incomplete_syllable(self):
+        self.assertEqual(self.suggestions('ㅅㅎ'), [('bank', 'B1')])
+        self.assertEqual(self.suggestions('국ㅁ'), [('saving', 'S0'), ('bank', 'B0')])
+        # 받침을 입력하기 전 ('국미' -> '국민')
+        self.assertEqual(self.suggestions('국미'), [('saving', 'S0'), ('bank', 'B0')])
+
+    def test_rebuilt_on_new_version(self):
+        self.suggestions('정기')
+        with self.assertNumQueries(0):
+            self.suggestions('정기예')
+
+        create_catalog(1, start=3)
+        DepositProduct.objects.filter(pk='D3').update(fin_prdt_nm='정기예금 특판')
+        publish_version('deposit', {'inserted': 1, 'updated': 0, 'withdrawn': 0, 'unchanged': 3})
+        self.assertIn(('deposit', 'D3'), self.suggestions('정기'))
+
+    def test_ranking_refreshed_after_interval(self):
+        self.assertEqual(self.suggestions('정기'), [('deposit', 'D1'), ('deposit', 'D0')])
+        DepositProduct.objects.filter(pk='D0').update(subscriber_count=5)
+        # 버전이 그대로면 주기가 지나기 전까지는 이전 순서
+        self.assertEqual(self.suggestions('정기'), [('deposit', 'D1'), ('deposit', 'D0')])
+        with mock.patch.object(autocomplete, 'RANKING_REFRESH_SECONDS', 0):
+            self.assertEqual(self.suggestions('정기'), [('deposit', 'D0'), ('deposit', 'D1')])
+
+    def test_invalid_params(self):
+        self.assertEqual(self.client.get('/api/autocomplete/?q=a&type=fund').status_code, 400)
+        self.assertEqual(self.client.get('/api/autocomplete/?q=a&limit=50').status_code, 400)
+
+
+class SubscriberCountTestCase(TestCase):
+    """가입자 수 카운터와 인기 상품 목록"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='tester', password='pass1234')
+        self.client.force_authenticate(self.user)
+        create_catalog(3)
+
+    def counts(self, model):
+        return dict(model.objects.values_list('fin_prdt_cd', 'subscriber_count'))
+
+    def test_counters_follow_subscriptions(self):
+        self.client.post('/api/deposits/D0/subscribe/', {}, format='json')
+        self.client.post('/api/deposits/D0/subscribe/', {}, format='json')
+        self.client.post('/api/savings/S1/subscribe/', {}, format='json')
+        self.assertEqual(self.counts(DepositProduct)['D0'], 1)
+        self.assertEqual(self.counts(SavingProduct)['S1'], 1)
+
+        self.client.post('/api/subscriptions/bulk/', {'operations': [
+            {'product_type': 'deposit', 'product_id': 'D0', 'action': 'subscribe'},
+            {'product_type': 'deposit', 'product_id': 'D1', 'action': 'subscribe'},
+            {'product_type': 'saving', 'product_id': 'S1', 'action': 'unsubscribe'},
+            {'product_type': 'saving', 'product_id': 'S2', 'action': 'unsubscribe'},
+        ]}, format='json')
+        self.assertEqual(self.counts(DepositProduct), {'D0': 1, 'D1': 1, 'D2': 0})
+        self.assertEqual(self.counts(SavingProduct), {'S0': 0, 'S1': 0, 'S2': 0})
+
+        self.client.post('/api/deposits/D0/subscribe/', {'action': 'unsubscribe'}, format='json')
+        self.assertEqual(self.counts(DepositProduct)['D0'], 0)
+
+    def test_counts_only_rows_actually_changed(self):
+        # 다른 요청이 먼저 가입/취소해 둔 상태에서 같은 작업이 다시 들어와도 카운터가 어긋나지 않음
+        subscribe(self.user, 'deposit', 'D0')
+        subscribe(self.user, 'saving', 'S0')
+        unsubscribe(self.user, 'saving', 'S0')
+        desired = {
+            'deposit': {'D0': 'subscribe', 'D1': 'subscribe'},
+            'saving': {'S0': 'unsubscribe', 'S1': 'subscribe'},
+        }
+        with transaction.atomic():
+            result = apply_operations(self.user, desired)
+        with transaction.atomic():
+            apply_operations(self.user, desired)
+
+        self.assertEqual(result['savings']['removed'], 0)
+        self.assertEqual(self.counts(DepositProduct), {'D0': 1, 'D1': 1, 'D2': 0})
+        self.assertEqual(self.counts(SavingProduct), {'S0': 0, 'S1': 1, 'S2': 0})
+        self.assertEqual(reconcile_subscriber_counts('deposit') + reconcile_subscriber_counts('saving'), 0)
+
+    def test_bulk_queries_do_not_grow_with_operations(self):
+        def queries(codes, action):
+            desired = {
+                'deposit': {f'D{code}': action for code in codes},
+                'saving': {f'S{code}': action for code in codes},
+            }
+            with CaptureQueriesContext(connection) as context, transaction.atomic():
+                apply_operations(self.user, desired)
+            return len(context.captured_queries)
+
+        self.assertEqual(queries([0], 'subscribe'), queries([0, 1, 2], 'subscribe'))
+        self.assertEqual(queries([0], 'unsubscribe'), queries([0, 1, 2], 'unsubscribe'))
+        self.assertEqual(self.counts(DepositProduct), {'D0': 0, 'D1': 0, 'D2': 0})
+
+    def test_reconcile(self):
+        DepositSubscription.objects.create(user=self.user, product_id='D2')
+        DepositProduct.objects.filter(pk='D0').update(subscriber_count=5)
+
+        self.assertEqual(reconcile_subscriber_counts('deposit'), 2)
+        self.assertEqual(self.counts(DepositProduct), {'D0': 0, 'D1': 0, 'D2': 1})
+        self.assertEqual(reconcile_subscriber_counts('deposit'), 0)
+
+    def test_popular_products(self):
+        DepositProduct.objects.filter(pk='D1').update(subscriber_count=7)
+        DepositProduct.objects.filter(pk='D2').update(subscriber_count=3)
+        DepositProduct.objects.filter(pk='D0').update(subscriber_count=9, dcls_end_day='20200101')
+
+        # 상품/은행 1 + 옵션 1, 판매 종료된 상품 제외
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/deposits/popular/?limit=2')
+        self.assertEqual([p['fin_prdt_cd'] for p in response.data], ['D1', 'D2'])
+        self.assertEqual(response.data[0]['subscriber_count'], 7)
+        self.assertNotIn('payload_hash', response.data[0])
+        self.assertEqual(self.client.get('/api/savings/popular/?limit=0').status_code, 400)
+
+    def test_catalog_payload_excludes_counters(self):
+        # 버전별로 캐시하는 목록에는 가입할 때마다 바뀌는 가입자 수가 없음
+        cache.clear()
+        product = self.client.get('/api/deposits/').json()[0]
+        self.assertNotIn('subscriber_count', product)
+        self.assertNotIn('payload_hash', product)
@@ -11,13 +11,34 @@ urlpatterns = [
     # URL 패턴 이름 변경: 'subscriptions' -> 'user-subscriptions'
     path('deposits/user-subscriptions/', views.get_user_subscribed_deposits, name='user-subscribed-deposits'),
     path('savings/user-subscriptions/', views.get_user_subscribed_savings, name='user-subscribed-savings'),
+    path('deposits/maturity-ranking/', views.get_deposit_maturity_ranking, name='deposit-maturity-ranking'),
+    path('deposits/allocation/', views.get_deposit_allocation, name='deposit-allocation'),
+    path('savings/simulate/', views.simulate_saving_products, name='simulate-saving-products'),
+    path('subscriptions/status/', views.get_subscription_status, name='subscription-status'),
+    path('subscriptions/bulk/', views.bulk_subscribe, name='bulk-subscribe'),
+    path('portfolio/', views.get_portfolio, name='portfolio'),
+    path('deposits/popular/', views.get_popular_products, {'product_type': 'deposit'}, name='popular-deposits'),
+    path('savings/popular/', views.get_popular_products, {'product_type': 'saving'}, name='popular-savings'),
+    path('compare/', views.compare_products, name='compare-products'),
+    path('autocomplete/', views.autocomplete, name='autocomplete'),
+    path('deposits/changes/', views.get_catalog_changes, {'product_type': 'deposit'}, name='deposit-changes'),
+    path('savings/changes/', views.get_catalog_changes, {'product_type': 'saving'}, name='saving-changes'),
     
     path('', include(router.urls)),
     path('save-deposit-products/', views.save_deposit_products, name='save-deposit-products'),
     path('save-saving-products/', views.save_saving_products, name='save-saving-products'),
+    path('catalog-jobs/<int:job_id>/', views.get_catalog_refresh_job, name='catalog-refresh-job'),
     path('sectors/', views.get_sectors, name='get-sectors'),
     path('deposits/<str:pk>/subscribe/', views.subscribe_deposit, name='subscribe-deposit'),
     path('deposits/<str:pk>/check-subscription/', views.check_subscription, name='check-deposit-subscription'),
     path('savings/<str:pk>/subscribe/', views.subscribe_saving, name='subscribe-saving'),
     path('savings/<str:pk>/check-subscription/', views.check_saving_subscription, name='check-saving-subscription'),
+    path('deposits/<str:pk>/rate-history/', views.get_product_rate_history, {'product_type': 'deposit'}, name='deposit-rate-history'),
+    path('savings/<str:pk>/rate-history/', views.get_product_rate_history, {'product_type': 'saving'}, name='saving-rate-history'),
+    path('rates/market-history/', views.get_market_rate_history, name='market-rate-history'),
+    path('rates/matrix/', views.get_rate_matrix, name='rate-matrix'),
+    path('rate-watches/', views.rate_watches, name='rate-watches'),
+    path('rate-watches/<int:watch_id>/', views.delete_rate_watch, name='delete-rate-watch'),
+    path('notifications/', views.get_rate_notifications, name='rate-notifications'),
+    path('notifications/read/', views.mark_rate_notifications_read, name='read-rate-notifications'),
 ]
\ No newline at end of file
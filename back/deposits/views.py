@@ -1,43 +1,61 @@
-import os
-import requests
+import datetime
+import logging
 import traceback
-from django.db.models import Prefetch
+from decimal import Decimal, InvalidOperation
+from django.db.models import Exists, F, Max, OuterRef, Prefetch, Q, Subquery, Value
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework import viewsets
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 
 # 모델 import 추가
-from .models import Bank, DepositProduct, DepositOption, DepositSubscription, SavingProduct, SavingOption, SavingSubscription
+from .models import (
+    Bank, DepositProduct, DepositOption, DepositSubscription, SavingProduct, SavingOption, SavingSubscription,
+    CatalogRefreshJob, RateSnapshot, DailyRateRollup, RateWatch, RateNotification,
+)
 # 시리얼라이저 import 추가
-from .serializers import BankSerializer, DepositProductSerializer, SavingProductSerializer
+from .serializers import (
+    BankSerializer, DepositOptionSerializer, DepositProductSerializer, SavingOptionSerializer,
+    SavingProductSerializer, PopularDepositProductSerializer, PopularSavingProductSerializer,
+    CatalogRefreshJobSerializer,
+    RateSnapshotSerializer, DailyRateRollupSerializer, RateWatchSerializer, RateNotificationSerializer,
+)
+from .ingestion import SECTOR_CODES
+from .finlife import FINLIFE_MODES
+from .jobs import enqueue_refresh
+from .pagination import ProductCursorPagination
+from .autocomplete import MAX_SUGGESTIONS, SUGGESTION_TYPES, suggest
+from .catalog_cache import catalog_response, changes_response
+from .compare import MAX_COMPARE_PRODUCTS, comparison_response
+from .rate_matrix import ALL_SECTORS, matrix_response
+from .portfolio import DEFAULT_DEPOSIT_AMOUNT, DEFAULT_SAVING_AMOUNT, build_portfolio
+from .search import search_products
+from .subscriptions import IdempotencyKeyConflict, bulk_update_subscriptions, subscribe, unsubscribe
+from .calculator import (
+    DEPOSIT_INSURANCE_LIMIT, INTEREST_TAX_RATE, MAX_SCENARIOS,
+    allocate_deposits, rank_deposits, simulate_savings,
+)
 
 from .models import DepositSubscription, SavingSubscription
 
-# .env 파일에서 API 키 가져오기
-API_KEY = os.environ.get('FINLIFE_API_KEY')
+logger = logging.getLogger(__name__)
 
-# API 키가 없을 경우 오류 로그
-if not API_KEY:
-    print("경고: FINLIFE_API_KEY 환경변수가 설정되어 있지 않습니다.")
-
-# 권역코드 정의
-SECTOR_CODES = {
-    '020000': '은행',
-    '030200': '여신전문',
-    '030300': '저축은행',
-    '050000': '보험',
-    '060000': '금융투자'
-}
-
-@api_view(['GET'])
-@permission_classes([AllowAny])
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
 def save_deposit_products(request):
-    """금융감독원 API에서 정기예금 상품 정보를 가져와 DB에 저장"""
+    """금융감독원 API에서 정기예금 상품 정보를 가져와 DB에 저장하는 작업 등록"""
     
     # 강제 새로고침 여부 확인
-    force_refresh = request.GET.get('force_refresh', 'false').lower() == 'true'
+    force_refresh = str(request.data.get('force_refresh', 'false')).lower() == 'true'
+    if force_refresh and not request.user.is_staff:
+        return Response(
+            {"error": "강제 새로고침은 관리자만 요청할 수 있습니다."},
+            status=status.HTTP_403_FORBIDDEN
+        )
 
     # 이미 데이터가 있는지 확인
     existing_products_count = DepositProduct.objects.count()
@@ -51,109 +69,45 @@ def save_deposit_products(request):
         })
     
     # 권역코드 파라미터 가져오기 (기본값: 모든 권역)
-    selected_sector = request.GET.get('sector_code', None)
-    
-    # 디버깅을 위한 출력
-    print(f"API 키: {API_KEY}")
-    print(f"선택된 권역코드: {selected_sector}")
-    
-    url = 'https://finlife.fss.or.kr/finlifeapi/depositProductsSearch.json'
-    
-    all_products_count = 0
-    all_base_list = []
-    all_option_list = []
-    
-    # 선택된 권역이 있으면 해당 권역만 조회, 없으면 모든 권역 조회
-    sectors_to_query = [selected_sector] if selected_sector else SECTOR_CODES.keys()
+    selected_sector = request.data.get('sector_code') or None
+    if selected_sector and selected_sector not in SECTOR_CODES:
+        return Response(
+            {"error": "잘못된 권역코드입니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
-    try:
-        # 각 권역별로 API 호출
-        for sector_code in sectors_to_query:
-            params = {
-                'auth': API_KEY,
-                'topFinGrpNo': sector_code,
-                'pageNo': 1
-            }
-            
-            # API 요청
-            response = requests.get(url, params=params)
-            response.raise_for_status()  # HTTP 오류 발생시 예외 발생
-            
-            data = response.json()
-            
-            # 기준 정보 및 옵션 정보 추출
-            base_list = data.get('result', {}).get('baseList', [])
-            option_list = data.get('result', {}).get('optionList', [])
-            
-            # 결과 합치기
-            all_base_list.extend(base_list)
-            all_option_list.extend(option_list)
-            
-            # 은행 정보 저장
-            for item in base_list:
-                bank_data = {
-                    'fin_co_no': item.get('fin_co_no', ''),
-                    'kor_co_nm': item.get('kor_co_nm', ''),
-                    'sector_code': sector_code,
-                    'sector_name': SECTOR_CODES.get(sector_code, '')
-                }
-                
-                # 은행 저장 또는 업데이트
-                bank, created = Bank.objects.update_or_create(
-                    fin_co_no=bank_data['fin_co_no'],
-                    defaults=bank_data
-                )
-                
-                # 상품 정보 저장
-                product_data = {
-                    'bank': bank,
-                    'fin_prdt_nm': item.get('fin_prdt_nm', ''),
-                    'join_way': item.get('join_way', ''),
-                    'mtrt_int': item.get('mtrt_int', ''),
-                    'spcl_cnd': item.get('spcl_cnd', ''),
-                    'join_member': item.get('join_member', ''),
-                    'join_deny': item.get('join_deny', ''),
-                    'etc_note': item.get('etc_note', ''),
-                    'max_limit': int(item.get('max_limit', 0)) if item.get('max_limit') else None,
-                    'dcls_strt_day': item.get('dcls_strt_day', ''),
-                    'dcls_end_day': item.get('dcls_end_day', ''),
-                    'fin_co_subm_day': item.get('fin_co_subm_day', ''),
-                    'sector_code': sector_code,
-                }
-                
-                # 해당 상품의 옵션 필터링
-                product_options = [opt for opt in option_list if opt.get('fin_prdt_cd') == item.get('fin_prdt_cd')]
-                product_data['options'] = product_options
-                
-                # 상품 저장 또는 업데이트
-                product, created = DepositProduct.objects.update_or_create(
-                    fin_prdt_cd=item.get('fin_prdt_cd', ''),
-                    defaults=product_data
-                )
-                
-                all_products_count += 1
-        
-        return Response({
-            "message": "정기예금 상품 정보를 성공적으로 저장했습니다.",
-            "count": all_products_count,
-            "refresh": True
-        })
-        
-    except requests.exceptions.RequestException as e:
-        # 네트워크/요청 관련 예외 처리
-        print(f"API 요청 오류: {str(e)}")
+    # 수집 모드 (live/record/replay, 생략하면 서버 설정)
+    mode = request.data.get('mode') or None
+    if mode and mode not in FINLIFE_MODES:
         return Response(
-            {"error": f"API 요청 오류: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            {"error": "mode는 live, record, replay 중 하나여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST
         )
-    except Exception as e:
-        # 기타 예외 처리 및 상세 로그 출력
-        print(f"예외 발생: {str(e)}")
-        traceback.print_exc()
+
+    # 외부 API 호출은 백그라운드 작업으로 넘기고 작업 정보만 바로 반환
+    job = enqueue_refresh('deposit', selected_sector, mode=mode)
+    return Response({
+        "message": "정기예금 상품 정보 갱신 작업을 등록했습니다.",
+        "job_id": job.pk,
+        "status": job.status,
+        "status_url": request.build_absolute_uri(reverse('catalog-refresh-job', args=[job.pk])),
+        "refresh": True
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+# 상품 갱신 작업 상태 조회 API
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_catalog_refresh_job(request, job_id):
+    """상품 갱신 작업의 진행 상태와 결과 조회"""
+    try:
+        job = CatalogRefreshJob.objects.get(pk=job_id)
+    except CatalogRefreshJob.DoesNotExist:
         return Response(
-            {"error": f"서버 오류: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            {"error": "작업을 찾을 수 없습니다."},
+            status=status.HTTP_404_NOT_FOUND
         )
+    return Response(CatalogRefreshJobSerializer(job).data)
 
 
 # 권역코드 목록 조회 API
@@ -169,21 +123,224 @@ class BankViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = BankSerializer
     permission_classes = [AllowAny]  # 명시적으로 모든 사용자 접근 허용
 
+# 상품 목록 공통 필터/정렬
+class ProductCatalogMixin:
+    """
+    정기예금/적금 목록의 서버 측 필터링과 정렬
+
+    쿼리 파라미터:
+    - sector_code: 권역코드
+    - bank: 금융회사 코드 (fin_co_no)
+    - term: 저축기간 (개월)
+    - rate_type: 금리유형 (S: 단리, M: 복리)
+    - min_rate: 최소 금리 (sort에서 고른 금리 기준, 기본은 우대금리)
+    - join_way: 가입방법 포함 검색 (예: 인터넷, 스마트폰)
+    - keyword: 상품명/금융회사명 포함 검색
+    - q: 상품명/우대조건/가입대상/유의사항 검색 (n-gram 색인, 관련도 순)
+    - sort: base_rate 또는 pref_rate (높은 순, term/rate_type이 있으면 해당 옵션의 최고 금리 기준)
+    - with_subscription: true면 로그인 사용자의 가입 여부(is_subscribed) 포함
+    - cursor, page_size: 커서 페이지네이션 (필터/정렬이 있으면 page_size를 생략해도 기본 크기로 나눔)
+    """
+    pagination_class = ProductCursorPagination
+    product_type = None
+    option_model = None
+    subscription_model = None
+
+    RATE_FIELDS = {
+        'base_rate': 'best_base_rate',
+        'pref_rate': 'best_pref_rate',
+    }
+    OPTION_RATE_FIELDS = {
+        'base_rate': 'intr_rate',
+        'pref_rate': 'intr_rate2',
+    }
+
+    # 이 중 하나라도 있으면 page_size가 없어도 기본 크기로 페이지를 나눔
+    PAGINATED_PARAMS = ('bank', 'term', 'rate_type', 'min_rate', 'join_way', 'keyword', 'q', 'sort')
+
+    def _get_int_param(self, name):
+        value = self.request.query_params.get(name)
+        if value in (None, ''):
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise ValidationError({name: '정수를 입력해주세요.'})
+
+    def _get_decimal_param(self, name):
+        value = self.request.query_params.get(name)
+        if value in (None, ''):
+            return None
+        try:
+            return Decimal(value)
+        except InvalidOperation:
+            raise ValidationError({name: '숫자를 입력해주세요.'})
+
+    def list(self, request, *args, **kwargs):
+        # 권역 외 조건이 없는 전체 목록은 카탈로그 버전별로 미리 직렬화·압축해 둔 캐시로 응답
+        sector_code = request.query_params.get('sector_code')
+        if set(request.query_params.keys()) <= {'sector_code'} and \
+                (sector_code is None or sector_code in SECTOR_CODES):
+            return catalog_response(request, self.product_type, sector_code)
+        return super().list(request, *args, **kwargs)
+
+    def filter_catalog(self, queryset):
+        params = self.request.query_params
+        self.paginate_by_default = any(params.get(name) for name in self.PAGINATED_PARAMS)
+
+        # 로그인 사용자의 가입 여부를 서브쿼리 하나로 함께 조회
+        if params.get('with_subscription', 'false').lower() == 'true' and self.request.user.is_authenticated:
+            subscriptions = self.subscription_model.objects.filter(
+                user=self.request.user, product=OuterRef('pk')
+            )
+            queryset = queryset.annotate(is_subscribed=Exists(subscriptions))
+
+        # 권역코드 필터링
+        sector_code = params.get('sector_code')
+        if sector_code:
+            queryset = queryset.filter(sector_code=sector_code)
+
+        bank = params.get('bank')
+        if bank:
+            queryset = queryset.filter(bank_id=bank)
+
+        join_way = params.get('join_way')
+        if join_way:
+            queryset = queryset.filter(join_way__icontains=join_way)
+
+        keyword = params.get('keyword')
+        if keyword:
+            queryset = queryset.filter(
+                Q(fin_prdt_nm__icontains=keyword) | Q(bank__kor_co_nm__icontains=keyword)
+            )
+
+        term = self._get_int_param('term')
+        rate_type = params.get('rate_type')
+        sort = params.get('sort')
+        if sort and sort not in self.RATE_FIELDS:
+            raise ValidationError({'sort': 'base_rate 또는 pref_rate만 사용할 수 있습니다.'})
+        rate_field = self.RATE_FIELDS[sort or 'pref_rate']
+
+        if rate_type:
+            # 해당 금리유형(및 기간)의 옵션이 있는 상품만, 그 옵션들의 최고 금리 기준
+            options = self.option_model.objects.filter(product=OuterRef('pk'), intr_rate_type=rate_type)
+            if term is not None:
+                options = options.filter(save_trm=term)
+            best_rate = options.values('product').annotate(
+                best=Max(self.OPTION_RATE_FIELDS[sort or 'pref_rate'])
+            ).values('best')
+            queryset = queryset.filter(Exists(options)).annotate(sort_rate=Subquery(best_rate))
+        # 기간이 있으면 기간별 최고 금리, 없으면 상품 전체 최고 금리 기준
+        elif term is not None:
+            queryset = queryset.filter(term_rates__save_trm=term).annotate(
+                sort_rate=F(f'term_rates__{rate_field}')
+            )
+        else:
+            queryset = queryset.annotate(sort_rate=F(rate_field))
+
+        min_rate = self._get_decimal_param('min_rate')
+        if min_rate is not None:
+            queryset = queryset.filter(sort_rate__gte=min_rate)
+
+        q = params.get('q', '').strip()
+        if q:
+            # 관련도(일치한 n-gram 수, 가중치 합)를 주석으로 붙여 관련도 순 정렬에 사용
+            queryset = search_products(queryset, self.product_type, q)
+            if not sort:
+                queryset = queryset.order_by('-search_matched', '-search_score', 'fin_prdt_cd')
+                self.cursor_ordering = ('-search_matched', '-search_score', 'fin_prdt_cd')
+
+        if sort:
+            queryset = queryset.filter(sort_rate__isnull=False).order_by('-sort_rate', 'fin_prdt_cd')
+            self.cursor_ordering = ('-sort_rate', 'fin_prdt_cd')
+
+        return queryset
+
+
 # 예금 상품 목록 조회 API
-class DepositProductViewSet(viewsets.ReadOnlyModelViewSet):
+class DepositProductViewSet(ProductCatalogMixin, viewsets.ReadOnlyModelViewSet):
     queryset = DepositProduct.objects.all()
     serializer_class = DepositProductSerializer
     permission_classes = [AllowAny]  # 명시적으로 모든 사용자 접근 허용
+    product_type = 'deposit'
+    option_model = DepositOption
+    subscription_model = DepositSubscription
 
     def get_queryset(self):
-        queryset = DepositProduct.objects.all()
-        
-        # 권역코드 필터링
-        sector_code = self.request.query_params.get('sector_code', None)
-        if sector_code:
-            queryset = queryset.filter(sector_code=sector_code)
-            
-        return queryset
+        # 은행은 JOIN, 옵션은 한 번의 추가 쿼리로 가져와 상품 수와 무관하게 쿼리 수 고정
+        queryset = DepositProduct.objects.select_related('bank').prefetch_related('deposit_options')
+        return self.filter_catalog(queryset)
+
+# 예금 만기 수령액 순위 API
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_deposit_maturity_ranking(request):
+    """
+    예치금과 기간을 받아 세후 만기 수령액이 큰 예금 상품 순위를 반환
+
+    쿼리 파라미터: amount(원, 기본 10,000,000), term(개월, 기본 12), rate(base|pref), limit(기본 10, 최대 100)
+    """
+    try:
+        amount = int(request.query_params.get('amount', 10000000))
+        term = int(request.query_params.get('term', 12))
+        limit = int(request.query_params.get('limit', 10))
+    except ValueError:
+        return Response(
+            {"error": "amount, term, limit은 정수로 입력해주세요."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    rate = request.query_params.get('rate', 'pref')
+    if amount <= 0 or term <= 0 or not 1 <= limit <= 100 or rate not in ('base', 'pref'):
+        return Response(
+            {"error": "amount와 term은 양수, limit은 1~100, rate는 base 또는 pref여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    return Response({
+        "amount": amount,
+        "term": term,
+        "rate": rate,
+        "tax_rate": INTEREST_TAX_RATE,
+        "results": rank_deposits(amount, term, rate=rate, limit=limit),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_deposit_allocation(request):
+    """
+    예금자보호 한도 안에서 세후 이자가 가장 많은 예금 배분안을 반환
+
+    쿼리 파라미터: amount(원), term(개월, 기본 12), rate(base|pref), preferred_bank(금융회사 코드),
+    insurance_limit(금융회사별 보호 한도, 기본 5천만원)
+    로그인한 경우 amount와 preferred_bank를 생략하면 사용자 정보(assets, preferred_bank)를 사용한다.
+    """
+    user = request.user if request.user.is_authenticated else None
+    params = request.query_params
+    try:
+        amount = int(params.get('amount') or (user.assets if user and user.assets else 0))
+        term = int(params.get('term', 12))
+        insurance_limit = int(params.get('insurance_limit', DEPOSIT_INSURANCE_LIMIT))
+    except ValueError:
+        return Response(
+            {"error": "amount, term, insurance_limit은 정수로 입력해주세요."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    rate = params.get('rate', 'pref')
+    preferred_bank = params.get('preferred_bank') or (user.preferred_bank if user else None)
+    if amount <= 0 or term <= 0 or insurance_limit <= 0 or rate not in ('base', 'pref'):
+        return Response(
+            {"error": "amount(또는 사용자 자산), term, insurance_limit은 양수, rate는 base 또는 pref여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    plan = allocate_deposits(
+        amount, term, rate=rate, preferred_bank=preferred_bank, insurance_limit=insurance_limit
+    )
+    plan['rate'] = rate
+    plan['preferred_bank'] = preferred_bank
+    return Response(plan)
+
 
 # 가입하기 API 수정
 @api_view(['POST'])
@@ -206,7 +363,8 @@ def subscribe_deposit(request, pk):
         # 가입 취소 요청이면
         if is_unsubscribe:
             if is_subscribed:
-                user.subscribed_deposits.remove(deposit)
+                # 가입 내역 삭제와 가입자 수 감소를 함께 처리
+                unsubscribe(user, 'deposit', pk)
                 print(f"사용자 {user.username}가 상품 ID {pk} 가입 취소 완료")
                 return Response({
                     "message": f"{deposit.fin_prdt_nm} 상품 가입이 취소되었습니다.",
@@ -227,8 +385,12 @@ def subscribe_deposit(request, pk):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # 가입 처리
-            user.subscribed_deposits.add(deposit)
+            # 가입 처리 (가입자 수도 함께 증가, 동시에 가입한 경우 이미 가입으로 처리)
+            if not subscribe(user, 'deposit', pk):
+                return Response(
+                    {"message": "이미 가입한 상품입니다."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
             print(f"사용자 {user.username}가 상품 ID {pk}에 성공적으로 가입함")
             
             return Response({
@@ -271,29 +433,32 @@ def check_subscription(request, pk):
     
 
 # 적금 상품 목록 조회 API
-class SavingProductViewSet(viewsets.ReadOnlyModelViewSet):
+class SavingProductViewSet(ProductCatalogMixin, viewsets.ReadOnlyModelViewSet):
     queryset = SavingProduct.objects.all()
     serializer_class = SavingProductSerializer
     permission_classes = [AllowAny]
+    product_type = 'saving'
+    option_model = SavingOption
+    subscription_model = SavingSubscription
 
     def get_queryset(self):
-        queryset = SavingProduct.objects.all()
-        
-        # 권역코드 필터링
-        sector_code = self.request.query_params.get('sector_code', None)
-        if sector_code:
-            queryset = queryset.filter(sector_code=sector_code)
-            
-        return queryset
+        # 은행은 JOIN, 옵션은 한 번의 추가 쿼리로 가져와 상품 수와 무관하게 쿼리 수 고정
+        queryset = SavingProduct.objects.select_related('bank').prefetch_related('saving_options')
+        return self.filter_catalog(queryset)
 
 # 적금 상품 정보 가져오기
-@api_view(['GET'])
-@permission_classes([AllowAny])
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
 def save_saving_products(request):
-    """금융감독원 API에서 정기적금 상품 정보를 가져와 DB에 저장"""
+    """금융감독원 API에서 정기적금 상품 정보를 가져와 DB에 저장하는 작업 등록"""
 
     # 강제 새로고침 여부 확인
-    force_refresh = request.GET.get('force_refresh', 'false').lower() == 'true'
+    force_refresh = str(request.data.get('force_refresh', 'false')).lower() == 'true'
+    if force_refresh and not request.user.is_staff:
+        return Response(
+            {"error": "강제 새로고침은 관리자만 요청할 수 있습니다."},
+            status=status.HTTP_403_FORBIDDEN
+        )
     
     # 이미 데이터가 있는지 확인
     existing_products_count = SavingProduct.objects.count()
@@ -307,110 +472,73 @@ def save_saving_products(request):
         })
     
     # 권역코드 파라미터 가져오기 (기본값: 모든 권역)
-    selected_sector = request.GET.get('sector_code', None)
-    
-    # 디버깅을 위한 출력
-    print(f"API 키: {API_KEY}")
-    print(f"선택된 권역코드: {selected_sector}")
-    
-    url = 'https://finlife.fss.or.kr/finlifeapi/savingProductsSearch.json'
-    
-    all_products_count = 0
-    all_base_list = []
-    all_option_list = []
-    
-    # 선택된 권역이 있으면 해당 권역만 조회, 없으면 모든 권역 조회
-    sectors_to_query = [selected_sector] if selected_sector else SECTOR_CODES.keys()
+    selected_sector = request.data.get('sector_code') or None
+    if selected_sector and selected_sector not in SECTOR_CODES:
+        return Response(
+            {"error": "잘못된 권역코드입니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
+    # 수집 모드 (live/record/replay, 생략하면 서버 설정)
+    mode = request.data.get('mode') or None
+    if mode and mode not in FINLIFE_MODES:
+        return Response(
+            {"error": "mode는 live, record, replay 중 하나여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # 외부 API 호출은 백그라운드 작업으로 넘기고 작업 정보만 바로 반환
+    job = enqueue_refresh('saving', selected_sector, mode=mode)
+    return Response({
+        "message": "정기적금 상품 정보 갱신 작업을 등록했습니다.",
+        "job_id": job.pk,
+        "status": job.status,
+        "status_url": request.build_absolute_uri(reverse('catalog-refresh-job', args=[job.pk])),
+        "refresh": True
+    }, status=status.HTTP_202_ACCEPTED)
+
+# 적금 만기 수령액 시뮬레이션 API
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def simulate_saving_products(request):
+    """
+    월 납입액/기간 시나리오 여러 개에 대해 적금 상품별 예상 만기 수령액을 한 번에 계산
+
+    요청 본문: {"scenarios": [{"amount": 300000, "term": 12}, ...], "rate": "pref", "limit": 10}
+    """
+    scenarios = request.data.get('scenarios')
+    rate = request.data.get('rate', 'pref')
+    limit = request.data.get('limit', 10)
+    if not isinstance(scenarios, list) or not 1 <= len(scenarios) <= MAX_SCENARIOS:
+        return Response(
+            {"error": f"scenarios는 1~{MAX_SCENARIOS}개의 목록이어야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     try:
-        # 각 권역별로 API 호출
-        for sector_code in sectors_to_query:
-            params = {
-                'auth': API_KEY,
-                'topFinGrpNo': sector_code,
-                'pageNo': 1
-            }
-            
-            # API 요청
-            response = requests.get(url, params=params)
-            response.raise_for_status()  # HTTP 오류 발생시 예외 발생
-            
-            data = response.json()
-            
-            # 기준 정보 및 옵션 정보 추출
-            base_list = data.get('result', {}).get('baseList', [])
-            option_list = data.get('result', {}).get('optionList', [])
-            
-            # 결과 합치기
-            all_base_list.extend(base_list)
-            all_option_list.extend(option_list)
-            
-            # 은행 정보 저장
-            for item in base_list:
-                bank_data = {
-                    'fin_co_no': item.get('fin_co_no', ''),
-                    'kor_co_nm': item.get('kor_co_nm', ''),
-                    'sector_code': sector_code,
-                    'sector_name': SECTOR_CODES.get(sector_code, '')
-                }
-                
-                # 은행 저장 또는 업데이트
-                bank, created = Bank.objects.update_or_create(
-                    fin_co_no=bank_data['fin_co_no'],
-                    defaults=bank_data
-                )
-                
-                # 상품 정보 저장
-                product_data = {
-                    'bank': bank,
-                    'fin_prdt_nm': item.get('fin_prdt_nm', ''),
-                    'join_way': item.get('join_way', ''),
-                    'mtrt_int': item.get('mtrt_int', ''),
-                    'spcl_cnd': item.get('spcl_cnd', ''),
-                    'join_member': item.get('join_member', ''),
-                    'join_deny': item.get('join_deny', ''),
-                    'etc_note': item.get('etc_note', ''),
-                    'max_limit': int(item.get('max_limit', 0)) if item.get('max_limit') else None,
-                    'dcls_strt_day': item.get('dcls_strt_day', ''),
-                    'dcls_end_day': item.get('dcls_end_day', ''),
-                    'fin_co_subm_day': item.get('fin_co_subm_day', ''),
-                    'sector_code': sector_code,
-                }
-                
-                # 해당 상품의 옵션 필터링
-                product_options = [opt for opt in option_list if opt.get('fin_prdt_cd') == item.get('fin_prdt_cd')]
-                product_data['options'] = product_options
-                
-                # 상품 저장 또는 업데이트 - SavingProduct 모델 사용
-                product, created = SavingProduct.objects.update_or_create(
-                    fin_prdt_cd=item.get('fin_prdt_cd', ''),
-                    defaults=product_data
-                )
-                
-                all_products_count += 1
-        
-        return Response({
-            "message": "정기적금 상품 정보를 성공적으로 저장했습니다.",
-            "count": all_products_count,
-            "refresh": True
-        })
-        
-    except requests.exceptions.RequestException as e:
-        # 네트워크/요청 관련 예외 처리
-        print(f"API 요청 오류: {str(e)}")
+        scenarios = [
+            {'amount': int(scenario['amount']), 'term': int(scenario['term'])}
+            for scenario in scenarios
+        ]
+        limit = int(limit)
+    except (KeyError, TypeError, ValueError):
         return Response(
-            {"error": f"API 요청 오류: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            {"error": "각 시나리오에 amount(원)와 term(개월)을 정수로 입력해주세요."},
+            status=status.HTTP_400_BAD_REQUEST
         )
-    except Exception as e:
-        # 기타 예외 처리 및 상세 로그 출력
-        print(f"예외 발생: {str(e)}")
-        traceback.print_exc()
+    if any(s['amount'] <= 0 or not 0 < s['term'] <= 120 for s in scenarios) \
+            or not 1 <= limit <= 100 or rate not in ('base', 'pref'):
         return Response(
-            {"error": f"서버 오류: {str(e)}"},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            {"error": "amount는 양수, term은 1~120, limit은 1~100, rate는 base 또는 pref여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST
         )
 
+    return Response({
+        "rate": rate,
+        "tax_rate": INTEREST_TAX_RATE,
+        "results": simulate_savings(scenarios, rate=rate, limit=limit),
+    })
+
+
 # 적금 상품 가입하기
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -432,7 +560,8 @@ def subscribe_saving(request, pk):
         # 가입 취소 요청이면
         if is_unsubscribe:
             if is_subscribed:
-                user.subscribed_savings.remove(saving)
+                # 가입 내역 삭제와 가입자 수 감소를 함께 처리
+                unsubscribe(user, 'saving', pk)
                 print(f"사용자 {user.username}가 상품 ID {pk} 가입 취소 완료")
                 return Response({
                     "message": f"{saving.fin_prdt_nm} 상품 가입이 취소되었습니다.",
@@ -453,8 +582,12 @@ def subscribe_saving(request, pk):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # 가입 처리
-            user.subscribed_savings.add(saving)
+            # 가입 처리 (가입자 수도 함께 증가, 동시에 가입한 경우 이미 가입으로 처리)
+            if not subscribe(user, 'saving', pk):
+                return Response(
+                    {"message": "이미 가입한 상품입니다."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
             print(f"사용자 {user.username}가 상품 ID {pk}에 성공적으로 가입함")
             
             return Response({
@@ -496,6 +629,212 @@ def check_saving_subscription(request, pk):
         )
     
 
+def _get_id_list(request, name):
+    """쿼리스트링(콤마 구분) 또는 요청 본문(배열)에서 상품 ID 목록 추출"""
+    if request.method == 'POST':
+        value = request.data.get(name)
+    else:
+        value = request.query_params.get(name)
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [item for item in value.split(',') if item]
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    raise ValidationError({name: '상품 ID 목록을 입력해주세요.'})
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def get_subscription_status(request):
+    """
+    여러 상품의 가입 여부를 한 번에 조회
+
+    deposit_ids / saving_ids 로 확인할 상품을 지정하고, 둘 다 없으면 가입한 상품 전체를 반환한다.
+    예금과 적금 가입 내역은 UNION 한 번의 쿼리로 조회한다.
+    """
+    deposit_ids = _get_id_list(request, 'deposit_ids')
+    saving_ids = _get_id_list(request, 'saving_ids')
+    check_all = deposit_ids is None and saving_ids is None
+
+    deposits = DepositSubscription.objects.filter(user=request.user)
+    savings = SavingSubscription.objects.filter(user=request.user)
+    if not check_all:
+        deposits = deposits.filter(product_id__in=deposit_ids or [])
+        savings = savings.filter(product_id__in=saving_ids or [])
+
+    subscribed = {'deposit': [], 'saving': []}
+    rows = deposits.annotate(kind=Value('deposit')).values_list('kind', 'product_id').union(
+        savings.annotate(kind=Value('saving')).values_list('kind', 'product_id'),
+        all=True,
+    )
+    for kind, product_id in rows:
+        subscribed[kind].append(product_id)
+
+    return Response({
+        "deposits": sorted(subscribed['deposit']),
+        "savings": sorted(subscribed['saving']),
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_subscribe(request):
+    """
+    예금/적금 상품 여러 개를 한 번에 가입 또는 취소
+
+    요청 본문: {"operations": [{"product_type": "deposit", "product_id": "...", "action": "subscribe"}, ...]}
+    Idempotency-Key 헤더를 보내면 같은 키로 재시도해도 한 번만 적용되고 처음 응답을 그대로 돌려준다.
+    """
+    idempotency_key = request.headers.get('Idempotency-Key')
+    try:
+        result, replayed = bulk_update_subscriptions(request.user, request.data, idempotency_key)
+    except IdempotencyKeyConflict:
+        return Response(
+            {"error": "같은 Idempotency-Key로 다른 요청을 보낼 수 없습니다."},
+            status=status.HTTP_409_CONFLICT
+        )
+
+    response = Response(result)
+    if idempotency_key:
+        response['Idempotent-Replayed'] = 'true' if replayed else 'false'
+    return response
+
+
+# 인기 상품 목록 최대 개수
+POPULAR_PRODUCTS_LIMIT = 50
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_popular_products(request, product_type):
+    """
+    가입자가 많은 판매 중 상품 목록
+
+    쿼리 파라미터: limit(1~50, 기본 10)
+    가입/취소 때 갱신하는 가입자 수(subscriber_count) 색인 순서로 읽으므로 가입 내역을 집계하지 않는다.
+    """
+    try:
+        limit = int(request.query_params.get('limit', 10))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= POPULAR_PRODUCTS_LIMIT:
+        raise ValidationError({'limit': f'1~{POPULAR_PRODUCTS_LIMIT} 사이의 정수를 입력해주세요.'})
+
+    if product_type == 'deposit':
+        model, options_relation, serializer_class = DepositProduct, 'deposit_options', PopularDepositProductSerializer
+    else:
+        model, options_relation, serializer_class = SavingProduct, 'saving_options', PopularSavingProductSerializer
+    today = timezone.localdate().strftime('%Y%m%d')
+    products = (
+        model.objects.exclude(dcls_end_day__lte=today)
+        .select_related('bank').prefetch_related(options_relation)
+        .order_by('-subscriber_count', 'fin_prdt_cd')[:limit]
+    )
+    return Response(serializer_class(products, many=True).data)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def autocomplete(request):
+    """
+    금융회사명/상품명 자동완성 (가입자가 많은 순)
+
+    쿼리 파라미터: q(입력 중인 검색어, 초성 가능), type(all|bank|deposit|saving, 기본 all), limit(1~10, 기본 10)
+    """
+    query = request.query_params.get('q', '')
+    suggestion_type = request.query_params.get('type', 'all')
+    try:
+        limit = int(request.query_params.get('limit', MAX_SUGGESTIONS))
+    except ValueError:
+        limit = 0
+    if suggestion_type != 'all' and suggestion_type not in SUGGESTION_TYPES:
+        raise ValidationError({'type': 'all, bank, deposit, saving 중 하나여야 합니다.'})
+    if not 1 <= limit <= MAX_SUGGESTIONS:
+        raise ValidationError({'limit': f'1~{MAX_SUGGESTIONS} 사이의 정수를 입력해주세요.'})
+
+    suggestion_types = SUGGESTION_TYPES if suggestion_type == 'all' else (suggestion_type,)
+    return Response({
+        "query": query,
+        "results": suggest(query, suggestion_types, limit),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def compare_products(request):
+    """
+    상품 여러 개의 기간별 금리를 나란히 비교
+
+    쿼리 파라미터: ids(콤마 구분 상품코드, 최대 20개), product_type(deposit|saving, 기본 deposit), rate(base|pref)
+    응답은 열 단위(products의 각 필드 배열, [기간][상품] 금리 배열)이며 상품 묶음별로 캐시한다.
+    """
+    product_type = request.query_params.get('product_type', 'deposit')
+    rate = request.query_params.get('rate', 'pref')
+    if product_type not in ('deposit', 'saving') or rate not in ('base', 'pref'):
+        return Response(
+            {"error": "product_type은 deposit 또는 saving, rate는 base 또는 pref여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    ids = _get_id_list(request, 'ids')
+    if not ids:
+        return Response(
+            {"error": "비교할 상품 ID 목록을 입력해주세요."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(set(ids)) > MAX_COMPARE_PRODUCTS:
+        return Response(
+            {"error": f"상품은 최대 {MAX_COMPARE_PRODUCTS}개까지 비교할 수 있습니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    response = comparison_response(request, product_type, ids, rate)
+    if response is None:
+        return Response(
+            {"error": "상품을 찾을 수 없습니다."},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_portfolio(request):
+    """
+    가입한 예금/적금별 가장 유리한 옵션과 세후 예상 이자, 금융회사/기간별 합계
+
+    쿼리 파라미터: deposit_amount(예금 예치금, 기본 10,000,000), saving_amount(적금 월 납입액, 기본 300,000),
+    rate(base|pref, 기본 pref), term(개월, 생략하면 금리가 가장 높은 옵션)
+    """
+    params = request.query_params
+    try:
+        deposit_amount = int(params.get('deposit_amount', DEFAULT_DEPOSIT_AMOUNT))
+        saving_amount = int(params.get('saving_amount', DEFAULT_SAVING_AMOUNT))
+        term = int(params['term']) if params.get('term') else None
+    except ValueError:
+        return Response(
+            {"error": "deposit_amount, saving_amount, term은 정수로 입력해주세요."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    rate = params.get('rate', 'pref')
+    if deposit_amount <= 0 or saving_amount <= 0 or (term is not None and term <= 0) or rate not in ('base', 'pref'):
+        return Response(
+            {"error": "deposit_amount, saving_amount, term은 양수, rate는 base 또는 pref여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    portfolio = build_portfolio(request.user, deposit_amount, saving_amount, rate=rate, term=term)
+    return Response({
+        "deposit_amount": deposit_amount,
+        "saving_amount": saving_amount,
+        "rate": rate,
+        "term": term,
+        "tax_rate": INTEREST_TAX_RATE,
+        **portfolio,
+    })
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_user_subscribed_deposits(request):
@@ -504,28 +843,16 @@ def get_user_subscribed_deposits(request):
     
     try:
         # DepositSubscription을 통해 가입한 상품 조회
-        subscriptions = DepositSubscription.objects.filter(user=user).select_related('product__bank')
+        subscriptions = DepositSubscription.objects.filter(user=user).select_related(
+            'product__bank'
+        ).prefetch_related('product__deposit_options')
         subscribed_deposits = []
         
         for sub in subscriptions:
             product = sub.product
             
-            # JSON 필드에서 options 데이터 가져오기
-            options_data = []
-            if product.options:
-                if isinstance(product.options, str):
-                    try:
-                        options_data = json.loads(product.options)
-                    except json.JSONDecodeError:
-                        options_data = []
-                elif isinstance(product.options, list):
-                    options_data = product.options
-            
-            # 만약 JSONField의 options가 비어있으면 deposit_options 관계에서 가져오기
-            if not options_data:
-                options_data = list(product.deposit_options.all().values(
-                    'intr_rate_type', 'intr_rate_type_nm', 'save_trm', 'intr_rate', 'intr_rate2'
-                ))
+            # 옵션 테이블에서 가져오기 (prefetch_related 결과 사용)
+            options_data = DepositOptionSerializer(product.deposit_options.all(), many=True).data
             
             product_data = {
                 'fin_prdt_cd': product.fin_prdt_cd,
@@ -547,21 +874,14 @@ def get_user_subscribed_deposits(request):
                     'sector_code': product.bank.sector_code,
                     'sector_name': product.bank.sector_name,
                 },
-                'options': options_data  # 파싱된 옵션 데이터
+                'options': options_data
             }
             subscribed_deposits.append(product_data)
         
-        print(f'예금 상품 조회 성공: {len(subscribed_deposits)}개')
-        if subscribed_deposits and subscribed_deposits[0]['options']:
-            print(f'첫 번째 상품 옵션 개수: {len(subscribed_deposits[0]["options"])}')
-            print(f'첫 번째 옵션 데이터: {subscribed_deposits[0]["options"][0]}')
-            
         return Response(subscribed_deposits, status=status.HTTP_200_OK)
         
-    except Exception as e:
-        print(f'예금 상품 조회 실패: {e}')
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception('예금 상품 조회 실패')
         return Response(
             {'error': '예금 상품 조회에 실패했습니다.'}, 
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -576,28 +896,16 @@ def get_user_subscribed_savings(request):
     
     try:
         # SavingSubscription을 통해 가입한 상품 조회
-        subscriptions = SavingSubscription.objects.filter(user=user).select_related('product__bank')
+        subscriptions = SavingSubscription.objects.filter(user=user).select_related(
+            'product__bank'
+        ).prefetch_related('product__saving_options')
         subscribed_savings = []
         
         for sub in subscriptions:
             product = sub.product
             
-            # JSON 필드에서 options 데이터 가져오기
-            options_data = []
-            if product.options:
-                if isinstance(product.options, str):
-                    try:
-                        options_data = json.loads(product.options)
-                    except json.JSONDecodeError:
-                        options_data = []
-                elif isinstance(product.options, list):
-                    options_data = product.options
-            
-            # 만약 JSONField의 options가 비어있으면 saving_options 관계에서 가져오기
-            if not options_data:
-                options_data = list(product.saving_options.all().values(
-                    'intr_rate_type', 'intr_rate_type_nm', 'save_trm', 'intr_rate', 'intr_rate2'
-                ))
+            # 옵션 테이블에서 가져오기 (prefetch_related 결과 사용)
+            options_data = SavingOptionSerializer(product.saving_options.all(), many=True).data
             
             product_data = {
                 'fin_prdt_cd': product.fin_prdt_cd,
@@ -619,22 +927,210 @@ def get_user_subscribed_savings(request):
                     'sector_code': product.bank.sector_code,
                     'sector_name': product.bank.sector_name,
                 },
-                'options': options_data  # 파싱된 옵션 데이터
+                'options': options_data
             }
             subscribed_savings.append(product_data)
         
-        print(f'적금 상품 조회 성공: {len(subscribed_savings)}개')
-        if subscribed_savings and subscribed_savings[0]['options']:
-            print(f'첫 번째 상품 옵션 개수: {len(subscribed_savings[0]["options"])}')
-            print(f'첫 번째 옵션 데이터: {subscribed_savings[0]["options"][0]}')
-            
         return Response(subscribed_savings, status=status.HTTP_200_OK)
         
-    except Exception as e:
-        print(f'적금 상품 조회 실패: {e}')
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception('적금 상품 조회 실패')
         return Response(
             {'error': '적금 상품 조회에 실패했습니다.'}, 
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+        )
+
+
+def _get_date_param(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ValidationError({name: '날짜는 YYYY-MM-DD 형식으로 입력해주세요.'})
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_product_rate_history(request, product_type, pk):
+    """
+    상품 하나의 옵션별 금리 변경 이력
+
+    쿼리 파라미터: term(개월), start/end(YYYY-MM-DD)
+    """
+    product_model = DepositProduct if product_type == 'deposit' else SavingProduct
+    if not product_model.objects.filter(pk=pk).exists():
+        return Response(
+            {"error": "상품을 찾을 수 없습니다."},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    snapshots = RateSnapshot.objects.filter(product_type=product_type, fin_prdt_cd=pk)
+    term = request.query_params.get('term')
+    if term:
+        if not term.isdigit():
+            raise ValidationError({'term': '정수를 입력해주세요.'})
+        snapshots = snapshots.filter(save_trm=int(term))
+    start = _get_date_param(request, 'start')
+    end = _get_date_param(request, 'end')
+    if start:
+        snapshots = snapshots.filter(captured_on__gte=start)
+    if end:
+        snapshots = snapshots.filter(captured_on__lte=end)
+
+    return Response({
+        "fin_prdt_cd": pk,
+        "product_type": product_type,
+        "history": RateSnapshotSerializer(snapshots, many=True).data,
+    })
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_catalog_changes(request, product_type):
+    """
+    since 버전 이후 새로 들어오거나 바뀌거나 판매 종료된 상품 목록
+
+    쿼리 파라미터: since(마지막으로 받은 카탈로그 버전)
+    응답의 version을 다음 요청의 since로 쓰고, reset이 true면 전체 목록을 다시 받는다.
+    """
+    since = request.query_params.get('since', '')
+    if not since.isdigit():
+        raise ValidationError({'since': '마지막으로 받은 카탈로그 버전(정수)을 입력해주세요.'})
+    return changes_response(request, product_type, int(since))
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_market_rate_history(request):
+    """
+    기간별 시장 평균 금리 추이 (갱신 때마다 미리 집계한 일별 값)
+
+    쿼리 파라미터: product_type(deposit|saving, 기본 deposit), term(개월), start/end(YYYY-MM-DD)
+    """
+    product_type = request.query_params.get('product_type', 'deposit')
+    if product_type not in ('deposit', 'saving'):
+        return Response(
+            {"error": "product_type은 deposit 또는 saving이어야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    rollups = DailyRateRollup.objects.filter(product_type=product_type)
+    term = request.query_params.get('term')
+    if term:
+        if not term.isdigit():
+            raise ValidationError({'term': '정수를 입력해주세요.'})
+        rollups = rollups.filter(save_trm=int(term))
+    start = _get_date_param(request, 'start')
+    end = _get_date_param(request, 'end')
+    if start:
+        rollups = rollups.filter(date__gte=start)
+    if end:
+        rollups = rollups.filter(date__lte=end)
+
+    return Response({
+        "product_type": product_type,
+        "history": DailyRateRollupSerializer(rollups.order_by('date', 'save_trm'), many=True).data,
+    })
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_rate_matrix(request):
+    """
+    금융회사 x 가입기간(6/12/24/36개월) 최고 금리표와 기간별 평균/중앙값/최고 금리
+
+    쿼리 파라미터: product_type(deposit|saving, 기본 deposit), sector_code(생략하면 전체)
+    수집할 때마다 미리 만들어 둔 문서를 그대로 돌려준다.
+    """
+    product_type = request.query_params.get('product_type', 'deposit')
+    sector_code = request.query_params.get('sector_code') or ALL_SECTORS
+    if product_type not in ('deposit', 'saving'):
+        return Response(
+            {"error": "product_type은 deposit 또는 saving이어야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if sector_code != ALL_SECTORS and sector_code not in SECTOR_CODES:
+        return Response(
+            {"error": "잘못된 권역코드입니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    response = matrix_response(request, product_type, sector_code)
+    if response is None:
+        return Response(
+            {"error": "아직 금리표가 만들어지지 않았습니다. 상품 정보를 먼저 갱신해주세요."},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    return response
+
+
+# 한 번에 돌려주는 최대 알림 수
+NOTIFICATION_LIST_LIMIT = 100
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def rate_watches(request):
+    """
+    금리 알림 조건 목록 조회(GET) / 등록(POST)
+
+    kind가 threshold면 save_trm 기간의 최고 우대금리가 min_rate 이상인 상품이 새로 들어오거나 바뀔 때,
+    subscription이면 가입한 상품의 금리가 바뀔 때 알림을 만든다. sector_code/bank로 범위를 좁힐 수 있다.
+    """
+    if request.method == 'GET':
+        watches = RateWatch.objects.filter(user=request.user).order_by('-created_at')
+        return Response(RateWatchSerializer(watches, many=True).data)
+
+    serializer = RateWatchSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    serializer.save(user=request.user)
+    return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+@api_view(['DELETE'])
+@permission_classes([IsAuthenticated])
+def delete_rate_watch(request, watch_id):
+    """금리 알림 조건 삭제 (해당 조건으로 만든 알림도 함께 삭제)"""
+    deleted, _ = RateWatch.objects.filter(pk=watch_id, user=request.user).delete()
+    if not deleted:
+        return Response(
+            {"error": "알림 조건을 찾을 수 없습니다."},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_rate_notifications(request):
+    """
+    최근 금리 알림 목록
+
+    쿼리 파라미터: unread(true면 읽지 않은 알림만)
+    """
+    notifications = RateNotification.objects.filter(user=request.user)
+    if request.query_params.get('unread', 'false').lower() == 'true':
+        notifications = notifications.filter(read_at__isnull=True)
+    return Response({
+        "unread_count": RateNotification.objects.filter(user=request.user, read_at__isnull=True).count(),
+        "notifications": RateNotificationSerializer(notifications[:NOTIFICATION_LIST_LIMIT], many=True).data,
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def mark_rate_notifications_read(request):
+    """
+    알림 읽음 처리
+
+    요청 본문: {"ids": [1, 2, ...]} (생략하면 읽지 않은 알림 전체)
+    """
+    notifications = RateNotification.objects.filter(user=request.user, read_at__isnull=True)
+    ids = request.data.get('ids')
+    if ids is not None:
+        if not isinstance(ids, list) or not all(isinstance(item, int) for item in ids):
+            raise ValidationError({'ids': '알림 ID 목록을 입력해주세요.'})
+        notifications = notifications.filter(pk__in=ids)
+    return Response({"updated": notifications.update(read_at=timezone.now())})
@@ -0,0 +1,124 @@
+from bisect import bisect_right
+from collections import defaultdict
+
+from django.utils import timezone
+
+from .models import (
+    DepositSubscription, DepositTermRate, RateNotification, RateSnapshot, RateWatch,
+    SavingSubscription, SavingTermRate,
+)
+
+WATCH_MODELS = {
+    'deposit': (DepositTermRate, DepositSubscription),
+    'saving': (SavingTermRate, SavingSubscription),
+}
+
+
+def _term_rates(product_type, codes):
+    """판매 중인 상품의 (상품코드, 기간) -> (최고 금리, 권역코드, 금융회사코드)"""
+    term_rate_model, _ = WATCH_MODELS[product_type]
+    today = timezone.localdate().strftime('%Y%m%d')
+    rows = (
+        term_rate_model.objects.filter(product_id__in=codes)
+        .exclude(product__dcls_end_day__lte=today)
+        .values_list(
+            'product_id', 'save_trm', 'best_base_rate', 'best_pref_rate',
+            'product__sector_code', 'product__bank_id',
+        )
+    )
+    return {
+        (code, term): (pref if pref is not None else base, sector_code, bank_id)
+        for code, term, base, pref, sector_code, bank_id in rows
+    }
+
+
+def _threshold_matches(product_type, term_rates):
+    """기간별로 금리 내림차순 정렬한 상품과 기준 금리 이하 조건만 대조"""
+    by_term = defaultdict(list)
+    for (code, term), (rate, sector_code, bank_id) in term_rates.items():
+        if rate is not None:
+            by_term[term].append((-rate, code, sector_code, bank_id))
+
+    for term, products in by_term.items():
+        products.sort()
+        negated = [product[0] for product in products]
+        watches = RateWatch.objects.filter(
+            product_type=product_type,
+            kind='threshold',
+            is_active=True,
+            save_trm=term,
+            min_rate__lte=-negated[0],
+        ).values_list('id', 'user_id', 'min_rate', 'sector_code', 'bank_id')
+        for watch_id, user_id, min_rate, watch_sector, watch_bank in watches.iterator(chunk_size=2000):
+            # 금리가 기준 이상인 앞부분만 확인
+            for negated_rate, code, sector_code, bank_id in products[:bisect_right(negated, -min_rate)]:
+                if watch_sector and watch_sector != sector_code:
+                    continue
+                if watch_bank and watch_bank != bank_id:
+                    continue
+                yield RateNotification(
+                    user_id=user_id, watch_id=watch_id, product_type=product_type,
+                    fin_prdt_cd=code, save_trm=term, rate=-negated_rate, reason='threshold',
+                )
+
+
+def _rate_change_matches(product_type, codes, term_rates, version):
+    """
+    이번 수집에서 금리가 바뀐 옵션이 있는 상품의 가입자 알림
+
+    오늘 이력만 있는 옵션은 처음 기록된 것이라 바뀐 금리가 아니므로 제외한다
+    (배포 후 첫 수집에서 모든 가입 상품이 알림 대상이 되지 않도록).
+    """
+    snapshots = RateSnapshot.objects.filter(product_type=product_type, fin_prdt_cd__in=codes)
+    today = timezone.localdate()
+    recorded_before = set(
+        snapshots.filter(captured_on__lt=today).values_list('fin_prdt_cd', 'save_trm').distinct()
+    )
+    changed_terms = defaultdict(set)
+    for code, term in snapshots.filter(captured_on=today).values_list('fin_prdt_cd', 'save_trm').distinct():
+        if (code, term) in recorded_before:
+            changed_terms[code].add(term)
+    if not changed_terms:
+        return
+
+    _, subscription_model = WATCH_MODELS[product_type]
+    subscribers = defaultdict(list)
+    for user_id, code in subscription_model.objects.filter(
+        product_id__in=changed_terms
+    ).values_list('user_id', 'product_id'):
+        subscribers[user_id].append(code)
+
+    watches = RateWatch.objects.filter(
+        product_type=product_type, kind='subscription', is_active=True, user_id__in=subscribers,
+    ).values_list('id', 'user_id', 'save_trm')
+    for watch_id, user_id, watch_term in watches.iterator(chunk_size=2000):
+        for code in subscribers[user_id]:
+            for term in changed_terms[code]:
+                if watch_term and watch_term != term:
+                    continue
+                rate = term_rates.get((code, term), (None,))[0]
+                yield RateNotification(
+                    user_id=user_id, watch_id=watch_id, product_type=product_type,
+                    fin_prdt_cd=code, save_trm=term, rate=rate, reason='rate_change', version=version,
+                )
+
+
+def evaluate_watches(product_type, changes, version=0):
+    """
+    이번 수집에서 신규/변경된 상품만 금리 알림 조건과 대조해 알림을 일괄 저장
+
+    기준 금리 조건은 새로 들어오거나 바뀐 상품의 기간별 최고 금리로, 가입 상품 조건은
+    금리 이력이 추가된 기존 상품으로 확인한다. 기준 금리 알림은 같은 조건/상품/기간/금리로
+    다시 만들지 않고, 금리 변경 알림은 카탈로그 버전(version)마다 한 번만 만든다
+    (금리가 예전 값으로 돌아가도 새 변경으로 알림).
+    반환값: 조건에 맞은 알림 수 (이미 보낸 알림 포함)
+    """
+    codes = list(changes['inserted']) + list(changes['updated'])
+    if not codes:
+        return 0
+
+    term_rates = _term_rates(product_type, codes)
+    notifications = list(_threshold_matches(product_type, term_rates))
+    notifications.extend(_rate_change_matches(product_type, changes['updated'], term_rates, version))
+    RateNotification.objects.bulk_create(notifications, batch_size=1000, ignore_conflicts=True)
+    return len(notifications)
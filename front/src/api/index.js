@@ -23,4 +23,22 @@ api.interceptors.request.use(
   }
 )
 
-export default api
\ No newline at end of file
+export default api
+
+// 상품 정보 갱신 작업을 등록하고 끝날 때까지 상태를 확인 (로그인 필요, 강제 새로고침은 관리자만)
+export const refreshCatalog = async (path, params = {}) => {
+  const response = await api.post(path, params)
+  let job = response.data
+
+  while (job.job_id && (job.status === 'queued' || job.status === 'running')) {
+    await new Promise(resolve => setTimeout(resolve, 2000))
+    const statusResponse = await api.get(job.status_url)
+    job = { ...job, ...statusResponse.data }
+  }
+
+  if (job.status === 'failed') {
+    throw new Error(job.error || '상품 정보 갱신에 실패했습니다.')
+  }
+  return job
+}
+